@@ -13,6 +13,15 @@ from datetime import datetime
 from core.utils.encoding import BytesEncoder
 from core.utils.version import __version__
 
+# Activity label (any spelling seen in decoded data) → summary bucket index:
+# 0 drive, 1 work, 2 available, 3 rest.
+_ACTIVITY_BUCKETS = {
+    "GUIDA": 0, "DRIVING": 0, "DRIVE": 0,
+    "LAVORO": 1, "WORK": 1,
+    "DISPONIBILITA": 2, "AVAILABILITY": 2, "AVAILABLE": 2,
+    "RIPOSO": 3, "REST": 3, "BREAK": 3,
+}
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -99,8 +108,11 @@ Examples:
     if args.json:
         json_path = resolve_path(args.json, "json")
         try:
+            # Encode in one call and write once: json.dump streams the
+            # indented output through many small writes.
+            text = json.dumps(result, indent=2, ensure_ascii=False, cls=BytesEncoder)
             with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2, ensure_ascii=False, cls=BytesEncoder)
+                f.write(text)
             generated.append(("JSON", json_path))
         except Exception as e:
             export_failed = True
@@ -210,10 +222,7 @@ def print_summary(data):
 
     # Activities summary
     if activities:
-        drive_min = 0
-        work_min = 0
-        rest_min = 0
-        avail_min = 0
+        totals = [0, 0, 0, 0]
         dates = set()
         for day_block in activities:
             if not isinstance(day_block, dict):
@@ -222,31 +231,20 @@ def print_summary(data):
             if date_val:
                 dates.add(date_val)
             events = day_block.get("changes", [])
+            # Parse each "HH:MM" once; an event ends where the next one starts
+            minutes = [_time_to_minutes(ev.get("time", "")) if isinstance(ev, dict) else None
+                       for ev in events]
+            minutes.append(24 * 60)
             for i, ev in enumerate(events):
                 if not isinstance(ev, dict):
                     continue
                 tipo = ev.get("activity", ev.get("type", ""))
-                start_time = ev.get("time", "")
-                if i < len(events) - 1:
-                    next_ev = events[i + 1]
-                    end_time = next_ev.get("time", "")
-                else:
-                    end_time = "24:00"
-                try:
-                    h1, m1 = map(int, str(start_time).split(':')[:2])
-                    h2, m2 = map(int, str(end_time).split(':')[:2])
-                    dur = max(0, (h2 * 60 + m2) - (h1 * 60 + m1))
-                except (ValueError, TypeError):
-                    dur = 0
-                tipo_upper = str(tipo).upper()
-                if tipo_upper in ("GUIDA", "DRIVING", "DRIVE"):
-                    drive_min += dur
-                elif tipo_upper in ("LAVORO", "WORK"):
-                    work_min += dur
-                elif tipo_upper in ("DISPONIBILITA", "AVAILABILITY", "AVAILABLE"):
-                    avail_min += dur
-                elif tipo_upper in ("RIPOSO", "REST", "BREAK"):
-                    rest_min += dur
+                start, end = minutes[i], minutes[i + 1]
+                dur = max(0, end - start) if start is not None and end is not None else 0
+                bucket = _ACTIVITY_BUCKETS.get(str(tipo).upper())
+                if bucket is not None:
+                    totals[bucket] += dur
+        drive_min, work_min, avail_min, rest_min = totals
         days = len(dates)
 
         print(f"\n📊 Activity ({len(activities)} daily blocks, {days} days):")
@@ -268,6 +266,15 @@ def print_summary(data):
     print("\n" + "=" * 60)
 
 
+def _time_to_minutes(value):
+    """Minutes since midnight for an "HH:MM" string, or None if malformed."""
+    try:
+        h, m = map(int, str(value).split(':')[:2])
+    except (ValueError, TypeError):
+        return None
+    return h * 60 + m
+
+
 def format_size(bytes_val):
     for unit in ['B', 'KB', 'MB']:
         if bytes_val < 1024:
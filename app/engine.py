@@ -4,7 +4,8 @@ import json
 import mmap
 import warnings
 import logging
-from datetime import datetime
+from calendar import monthrange
+from collections import Counter
 
 from core.crypto.signature import SignatureValidator
 from core.registry.registry import DecoderRegistry
@@ -19,15 +20,22 @@ class TachoParser:
     """Analysis engine for tachograph files (.DDD): driver cards and VU
     downloads, generations G1 (Annex 1B), G2 and G2.2 (Annex 1C)."""
 
-    def __init__(self, file_path, use_deterministic=True):
+    def __init__(self, file_path, use_deterministic=True, record_raw=True):
         if not use_deterministic:
             warnings.warn(
                 "The legacy (non-deterministic) parsing path has been removed; "
                 "the deterministic parser is always used.",
                 DeprecationWarning, stacklevel=2)
         self.file_path = file_path
-        self.file_size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
+        # False drops the per-tag raw_tags occurrences from the structural
+        # pass, for callers that only need the decoded sections.
+        self.record_raw = record_raw
+        try:
+            self.file_size = os.stat(file_path).st_size
+        except (OSError, ValueError):
+            self.file_size = 0
         self.raw_data = None
+        self._map = None
         self._fd = None
         self.validator = SignatureValidator()
         self.card_public_key = None
@@ -217,20 +225,28 @@ class TachoParser:
         self.validation_status = "Pending"
 
     def _open_file(self):
-        """Memory-map the file and detect VU vs card (first byte 0x76 = VU)."""
+        """Memory-map the file and detect VU vs card (first byte 0x76 = VU).
+
+        VU downloads are copied out of the map once: every VU walker and
+        signature check works on ``bytes``, and handing them the map made each
+        of them take its own full-file copy.
+        """
         self._fd = open(self.file_path, 'rb')
         try:
-            self.raw_data = mmap.mmap(self._fd.fileno(), 0, access=mmap.ACCESS_READ)
+            self._map = mmap.mmap(self._fd.fileno(), 0, access=mmap.ACCESS_READ)
         except Exception:
             self._fd.close()
             self._fd = None
             raise
+        self.raw_data = self._map
         self.is_vu = (self._safe_read(0, 1) == b'\x76')
+        if self.is_vu:
+            self.raw_data = bytes(self._map)
 
     def _close_file(self):
         try:
-            if self.raw_data:
-                self.raw_data.close()
+            if self._map:
+                self._map.close()
         except Exception:
             pass
         try:
@@ -242,7 +258,7 @@ class TachoParser:
     def _run_structural_parse(self):
         """Structural pass: deterministic STAP/BER-TLV parse with byte coverage."""
         from core.parser.deterministic import DeterministicParser
-        dp = DeterministicParser(parser=self)
+        dp = DeterministicParser(parser=self, record_raw=self.record_raw)
         self.results = dp.parse(self.raw_data, is_vu=self.is_vu)
         # dp.parse() returns a fresh results dict — restore file metadata.
         self.results["metadata"]["filename"] = os.path.basename(self.file_path)
@@ -252,18 +268,12 @@ class TachoParser:
         """Debug aid: report registered tags that never appeared in the file."""
         if not logger.isEnabledFor(logging.DEBUG):
             return
+        from core.parser.origin_detector import _observed_tags
         from core.registry.registry import DecoderRegistry
         reg = DecoderRegistry.instance()
         registered = {t for t in reg.get_all_tags()
-                      if reg.get_decoder(t) and reg.get_decoder(t).decoder_fn}
-        seen = set()
-        for occs in self.results.get("raw_tags", {}).values():
-            for occ in occs:
-                try:
-                    seen.add(int(occ.get("tag_id", "0x0"), 16))
-                except (ValueError, KeyError):
-                    continue
-        unhandled = registered - seen
+                      if getattr(reg.get_decoder(t), "decoder_fn", None)}
+        unhandled = registered - _observed_tags(self.results)
         if unhandled:
             logger.debug("Registered tags not encountered in file: %s",
                          [f"0x{t:04X}" for t in sorted(unhandled)])
@@ -391,11 +401,17 @@ class TachoParser:
         the EF walk and a container re-scan. Only complete, structurally
         identical records are duplicates.
         """
-        def _safe_parse_date(val):
+        def _date_key(val):
+            """Integer yyyymmdd sort key for a dd/mm/yyyy date (-1 if invalid)."""
             try:
-                return datetime.strptime(val, '%d/%m/%Y')
-            except (ValueError, TypeError):
-                return datetime.min
+                day, month, year = val.split("/")
+                d, m, y = int(day), int(month), int(year)
+            except (ValueError, AttributeError):
+                return -1
+            # Impossible days (31/02, 31/04, ...) are invalid, as for strptime.
+            if not (1 <= m <= 12 and 1 <= y <= 9999 and 1 <= d <= monthrange(y, m)[1]):
+                return -1
+            return y * 10000 + m * 100 + d
 
         def _canonical(value):
             """Build a deterministic, hashable representation of decoded data."""
@@ -412,14 +428,26 @@ class TachoParser:
                 return ("bytes", value.hex())
             return (type(value).__module__, type(value).__qualname__, repr(value))
 
+        activities = self.results["activities"]
+        # Only days sharing a date can be duplicates; skip canonicalising the rest.
+        date_counts = Counter(act.get("date") if isinstance(act.get("date"), str) else None
+                              for act in activities)
         seen = set()
         unique = []
-        for act in self.results["activities"]:
+        for act in activities:
+            date = act.get("date")
+            if isinstance(date, str) and date_counts[date] == 1:
+                unique.append(act)
+                continue
             key = _canonical(act)
             if key not in seen:
                 seen.add(key)
                 unique.append(act)
-        unique.sort(key=lambda x: _safe_parse_date(x.get("date")) or datetime.min, reverse=True)
+        keys = [_date_key(act.get("date")) for act in unique]
+        # Cyclic-buffer walks already emit days newest-first: sort only if needed.
+        if any(a < b for a, b in zip(keys, keys[1:], strict=False)):
+            order = sorted(range(len(unique)), key=keys.__getitem__, reverse=True)
+            unique = [unique[i] for i in order]
         self.results["activities"] = unique
 
     def _validate_certificate_chain(self):
@@ -559,6 +587,9 @@ class TachoParser:
 
         all_valid = True
         signed_messages = 0
+        # Signed payloads are whole TREP bodies: hash them in place rather
+        # than copying each one out of the download.
+        view = memoryview(self.raw_data)
         for message in messages:
             entry = {
                 "trep": f"0x{message['trep']:02X}",
@@ -584,7 +615,7 @@ class TachoParser:
                     # They authenticate the key but are excluded from the
                     # download-data signature (Annex 1B Appendix 11).
                     payload_start += 194 + 194
-                payload = bytes(self.raw_data[payload_start:message["body_end"]])
+                payload = view[payload_start:message["body_end"]]
                 valid = self.validator.verify_g1_data_signature(
                     self.card_public_key, signature, payload)
                 entry["signature_valid"] = valid
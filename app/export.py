@@ -14,6 +14,8 @@ _log = logging.getLogger("export")
 
 _EXCEL_MAX_ROWS = 50000
 _PDF_MAX_ROWS = 1500
+# Activity label → index into the PDF stats bar totals (drive, work, rest).
+_STATS_KIND = {"DRIVE": 0, "WORK": 1, "REST": 2}
 
 _SHEET_NAME_RE = re.compile(r"[\[\]*?:/\\]")
 _NUMBER_TEXT_RE = re.compile(
@@ -359,9 +361,7 @@ class ExportManager:
             story.append(Spacer(1, 6 * mm))
 
         # Compact stats bar (hours totals)
-        total_drive = 0
-        total_work = 0
-        total_rest = 0
+        totals = [0, 0, 0]  # drive, work, rest
         for day in activities:
             if not isinstance(day, dict):
                 continue
@@ -371,19 +371,16 @@ class ExportManager:
             for i, ch in enumerate(changes):
                 if not isinstance(ch, dict):
                     continue
-                act = str(ch.get("activity", "")).upper()
+                kind = _STATS_KIND.get(str(ch.get("activity", "")).upper())
                 t1 = _t2m(str(ch.get("time", "00:00")))
                 t2 = _t2m(str(changes[i + 1].get("time", "00:00"))) if i + 1 < len(changes) else 1440
                 if t1 is None or t2 is None:
                     continue
                 if t2 < t1:
                     t2 += 1440
-                if act == "DRIVE":
-                    total_drive += t2 - t1
-                elif act == "WORK":
-                    total_work += t2 - t1
-                elif act == "REST":
-                    total_rest += t2 - t1
+                if kind is not None:
+                    totals[kind] += t2 - t1
+        total_drive, total_work, total_rest = totals
 
         drive_h = f"{total_drive // 60}h {total_drive % 60}m"
         work_h = f"{total_work // 60}h {total_work % 60}m"
@@ -19,8 +19,11 @@ import queue
 import threading
 import traceback
 import logging
-from bisect import bisect_left
-from datetime import datetime, timedelta, timezone
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from operator import itemgetter
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -230,13 +233,37 @@ def _utc_speed_block(block):
             else start.astimezone(timezone.utc)), samples
 
 
-def _activity_to_iso(date_str):
-    """Convert dd/mm/yyyy to yyyy-mm-dd for matching card_iw records."""
+@lru_cache(maxsize=4096)
+def _activity_date_parts(date_str):
+    """(year, month, day) of a dd/mm/yyyy activity date, or None.
+
+    Memoised: each day's date is parsed for sorting, tree rows and summaries."""
     try:
         day, month, year = date_str.split("/")
-        return f"{int(year):04d}-{int(month):02d}-{int(day):02d}"
-    except (ValueError, AttributeError):
+        return int(year), int(month), int(day)
+    except ValueError:
+        return None
+
+
+def _activity_to_iso(date_str):
+    """Convert dd/mm/yyyy to yyyy-mm-dd for matching card_iw records."""
+    parts = _activity_date_parts(date_str) if isinstance(date_str, str) else None
+    if parts is None:
         return date_str
+    return f"{parts[0]:04d}-{parts[1]:02d}-{parts[2]:02d}"
+
+
+@lru_cache(maxsize=1024)
+def _parse_naive_timestamp(value):
+    """Parse 'YYYY-MM-DD[T ]HH:MM:SS' to a naive datetime, or None.
+
+    Memoised: card insertion/withdrawal times repeat across redraws."""
+    for fmt in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
 
 
 def _parse_iso(value):
@@ -252,6 +279,31 @@ def _parse_iso(value):
     return dt.astimezone(timezone.utc)
 
 
+@lru_cache(maxsize=4096)
+def _hhmm_to_seconds(time_str):
+    """Seconds since midnight for "HH:MM", or None; memoised per distinct string."""
+    parts = time_str.split(":")
+    if len(parts) != 2:
+        return None
+    try:
+        return int(parts[0]) * 3600 + int(parts[1]) * 60
+    except ValueError:
+        return None
+
+
+# Activities whose per-slot durations add up across crew drivers.
+_ACCUM_BY_SUM = frozenset(("DRIVE", "WORK"))
+
+
+def _sort_by_time(parsed):
+    """Stable-sort (second, activity) pairs by time, in place.
+
+    Activity changes are stored chronologically, so the common case is an
+    already-ordered list; one linear check skips the sort for it."""
+    if any(a[0] > b[0] for a, b in zip(parsed, parsed[1:], strict=False)):
+        parsed.sort(key=itemgetter(0))
+
+
 def _compute_activity_totals(changes):
     """Return dict {ACTIVITY: total_minutes} from a list of activity changes.
 
@@ -263,12 +315,12 @@ def _compute_activity_totals(changes):
     independently).  Rest/Available durations are kept at the **maximum**
     across slots because they share the same 24h day and cannot exceed it.
     """
-    ACCUM_BY_SUM = {"DRIVE", "WORK"}
-    per_slot: dict[str, dict[str, int]] = {}
+    parse_time = ActivityTimelineChart._parse_time
+    per_slot: dict[str, list[tuple[int, str]]] = {}
     for ch in changes:
         if not isinstance(ch, dict):
             continue
-        t = ActivityTimelineChart._parse_time(ch.get("time", ""))
+        t = parse_time(ch.get("time", ""))
         act = str(ch.get("activity", "")).upper()
         if t is not None and act in ACTIVITY_COLORS:
             slot = str(ch.get("slot") or "First")
@@ -276,13 +328,13 @@ def _compute_activity_totals(changes):
 
     totals = {a: 0 for a in ACTIVITY_COLORS}
     for parsed in per_slot.values():
-        parsed.sort(key=lambda item: item[0])
+        _sort_by_time(parsed)
         slot_tot: dict[str, int] = {}
         for i, (start, act) in enumerate(parsed):
             end = parsed[i + 1][0] if i + 1 < len(parsed) else 86400
             slot_tot[act] = slot_tot.get(act, 0) + (end - start) // 60
         for act, mins in slot_tot.items():
-            if act in ACCUM_BY_SUM:
+            if act in _ACCUM_BY_SUM:
                 totals[act] += mins
             else:
                 if mins > totals[act]:
@@ -295,6 +347,44 @@ def _fmt_duration_minutes(mins):
     return f"{mins // 60}h {mins % 60:02d}m"
 
 
+def _nearest_insertion(insertions, minutes, target):
+    """Card insertion closest to minute *target*, or None if there is none.
+
+    *insertions* holds ``(minute, position, slot_label)`` tuples sorted by
+    minute then position, *minutes* their minute values. Only the two
+    neighbours of the bisect point can be nearest; an equidistant tie goes to
+    the change listed first, as a ``min()`` over the changes would.
+    """
+    idx = bisect_left(minutes, target)
+    best = insertions[idx] if idx < len(insertions) else None
+    if idx > 0:
+        # First change at the earlier neighbour's minute
+        earlier = insertions[bisect_left(minutes, minutes[idx - 1])]
+        if best is None or (target - earlier[0], earlier[1]) < (best[0] - target, best[1]):
+            best = earlier
+    return best
+
+
+def _day_ordinal_and_second(moment):
+    """Split a datetime into (date ordinal, whole second of day)."""
+    return moment.toordinal(), moment.hour * 3600 + moment.minute * 60 + moment.second
+
+
+@lru_cache(maxsize=4096)
+def _iso_day(ordinal):
+    """ISO date string of a date ordinal (memoised: samples share few days)."""
+    return date.fromordinal(ordinal).isoformat()
+
+
+def _iso_to_ordinal(iso_date):
+    """Date ordinal of a ``YYYY-MM-DD`` string, or None if it is not one."""
+    try:
+        day = date.fromisoformat(iso_date)
+    except (TypeError, ValueError):
+        return None
+    return day.toordinal() if day.isoformat() == iso_date else None
+
+
 def detailed_speed_by_day(data):
     """Return UTC detailed-speed samples grouped by ISO date."""
     grouped = {}
@@ -304,12 +394,13 @@ def detailed_speed_by_day(data):
         if decoded is None:
             continue
         start, samples = decoded
+        first_day, first_sec = _day_ordinal_and_second(start)
         for offset, speed in enumerate(samples):
             if not isinstance(speed, int) or speed == 0xFF:
                 continue
-            moment = start + timedelta(seconds=offset)
-            day = moment.date().isoformat()
-            grouped.setdefault(day, {})[moment.hour * 3600 + moment.minute * 60 + moment.second] = speed
+            day_offset, second = divmod(first_sec + offset, 86400)
+            day = _iso_day(first_day + day_offset)
+            grouped.setdefault(day, {})[second] = speed
     return {day: sorted(samples.items()) for day, samples in grouped.items()}
 
 
@@ -321,11 +412,12 @@ def detailed_speed_blocks_by_day(blocks):
         if decoded is None:
             continue
         start, samples = decoded
-        days = set()
+        first_day, first_sec = _day_ordinal_and_second(start)
+        day_offsets = set()
         for offset, speed in enumerate(samples):
             if isinstance(speed, int) and speed != 0xFF:
-                days.add((start + timedelta(seconds=offset)).date().isoformat())
-        for day in days:
+                day_offsets.add((first_sec + offset) // 86400)
+        for day in {_iso_day(first_day + day_offset) for day_offset in day_offsets}:
             grouped.setdefault(day, []).append(block)
     return grouped
 
@@ -544,7 +636,8 @@ class DetailedSpeedChart(ttk.Frame):
         self.summary_lbl.pack(fill=tk.X, padx=8, pady=(2, 8))
         self._day = ""
         self._samples = []
-        self._sample_seconds = []
+        self._sample_seconds = array("i")
+        self._sample_speeds = array("H")
         self._plot = None
         self._view_start = 0
         self._view_end = 86400
@@ -560,12 +653,14 @@ class DetailedSpeedChart(ttk.Frame):
         self._day = day
         self._speed_limit = speed_limit or SPEED_LIMIT_KMH
         self._samples = samples
-        self._sample_seconds = [second for second, _ in samples]
+        # Typed columns of the (second, speed) pairs for bisect and reductions
+        self._sample_seconds = array("i", [second for second, _ in samples])
+        self._sample_speeds = array("H", [speed for _, speed in samples])
         self._view_start, self._view_end = 0, 86400
         self._selection_start = None
         self._selection_moved = False
         self._overspeeding_events = overspeeding_events or []
-        speeds = [speed for _, speed in samples]
+        speeds = self._sample_speeds
         recorded = len(speeds)
         moving = sum(speed > 0 for speed in speeds)
         above_limit = sum(speed > self._speed_limit for speed in speeds)
@@ -611,7 +706,7 @@ class DetailedSpeedChart(ttk.Frame):
         first = bisect_left(self._sample_seconds, self._view_start)
         last = bisect_left(self._sample_seconds, self._view_end)
         visible_samples = self._samples[first:last]
-        speeds = [speed for _, speed in visible_samples]
+        speeds = self._sample_speeds[first:last]
         max_speed = max(speeds, default=self._speed_limit)
         ceiling = max(100, ((max_speed + 19) // 20) * 20)
 
@@ -878,6 +973,7 @@ class ActivityTimelineChart(ttk.Frame):
         self.summary_lbl.pack(fill=tk.X, padx=8, pady=(2, 8))
         self._day = ""
         self._slots = {}      # slot_label -> [(start_s, end_s, activity), ...]
+        self._slot_rows = {}  # slot_label -> activity -> ([(start_s, end_s)], [start_s])
         self._slot_schedule = {}
         self._markers = []
         self._oos_events = []
@@ -896,6 +992,8 @@ class ActivityTimelineChart(ttk.Frame):
              vehicle_info=None, oos_events=None, data=None):
         self._day = day
         self._slots = self._build_blocks(activities, is_vu)
+        self._slot_rows = {slot: self._rows_by_activity(blocks)
+                           for slot, blocks in self._slots.items()}
         self._slot_schedule = slot_schedule or {}
         self._markers = markers or []
         self._oos_events = oos_events or []
@@ -952,13 +1050,7 @@ class ActivityTimelineChart(ttk.Frame):
 
     @staticmethod
     def _parse_time(time_str):
-        parts = str(time_str).split(":")
-        if len(parts) != 2:
-            return None
-        try:
-            return int(parts[0]) * 3600 + int(parts[1]) * 60
-        except ValueError:
-            return None
+        return _hhmm_to_seconds(str(time_str))
 
     @staticmethod
     def _build_blocks(changes, is_vu):
@@ -985,7 +1077,7 @@ class ActivityTimelineChart(ttk.Frame):
                 act = str(entry.get("activity", "")).upper()
                 if t is not None and act in ACTIVITY_COLORS:
                     parsed.append((t, act))
-            parsed.sort(key=lambda item: item[0])
+            _sort_by_time(parsed)
             if not parsed:
                 continue
             # First block starts at its time; the next block's time closes it.
@@ -994,6 +1086,18 @@ class ActivityTimelineChart(ttk.Frame):
                 blocks[slot_label].append((start, end, act))
         return blocks
 
+    @staticmethod
+    def _rows_by_activity(slot_blocks):
+        """Split one slot's time-ordered blocks into per-activity columns:
+        activity -> ([(start_s, end_s), ...], [start_s, ...]).  Built once per
+        day so redraws and hover lookups do not re-filter the slot."""
+        rows = {}
+        for start_s, end_s, act in slot_blocks:
+            blocks, starts = rows.setdefault(act, ([], []))
+            blocks.append((start_s, end_s))
+            starts.append(start_s)
+        return rows
+
     def _schedule_draw(self):
         if self._draw_after_id is not None:
             self.after_cancel(self._draw_after_id)
@@ -1080,7 +1184,7 @@ class ActivityTimelineChart(ttk.Frame):
                 canvas.create_line(left - 8, dy, left + usable_width + 8, dy,
                                    fill="#90a4ae", width=1)
 
-            slot_blocks = self._slots.get(slot_name, [])
+            slot_rows = self._slot_rows.get(slot_name, {})
 
             # Slot label
             if slot_name == "Cardholder" and self._driver_name:
@@ -1092,9 +1196,8 @@ class ActivityTimelineChart(ttk.Frame):
                                fill="#263238", font=("TkDefaultFont", 11, "bold"))
 
             # Per-slot totals
-            totals = {}
-            for start_s, end_s, act in slot_blocks:
-                totals[act] = totals.get(act, 0) + (end_s - start_s)
+            totals = {act: sum(e - s for s, e in blocks)
+                      for act, (blocks, _starts) in slot_rows.items()}
             parts = []
             for act in rows:
                 seconds = totals.get(act, 0)
@@ -1116,12 +1219,11 @@ class ActivityTimelineChart(ttk.Frame):
                                    anchor=tk.E, fill="#37474f",
                                    font=("", 8, "bold"))
 
-                blocks = sorted(
-                    [(s, e) for s, e, a in slot_blocks if a == act],
-                    key=lambda b: b[0])
+                blocks, starts = slot_rows.get(act, ((), ()))
 
                 slot_tag = slot_name if has_multi else ""
-                self._layout["act_rows"].append((act, y0, y1, blocks, slot_tag))
+                self._layout["act_rows"].append(
+                    (act, y0, y1, blocks, starts, slot_tag))
 
                 for start_s, end_s in blocks:
                     x0 = left + start_s * usable_width / 86400
@@ -1130,7 +1232,7 @@ class ActivityTimelineChart(ttk.Frame):
                                             fill=color, outline=color)
 
                 # Per-row total on the right
-                act_total = sum(e - s for s, e in blocks)
+                act_total = totals.get(act, 0)
                 th, tm = divmod(act_total // 60, 60)
                 total_text = f"{th}h {tm:02d}m"
                 total_x = left + usable_width + 16
@@ -1205,16 +1307,19 @@ class ActivityTimelineChart(ttk.Frame):
                 return
 
         has_multi = self._layout.get("has_multi", False)
-        for act, y0, y1, blocks, slot_tag in self._layout.get("act_rows", []):
+        for act, y0, y1, blocks, starts, slot_tag in self._layout.get("act_rows", []):
             if not y0 <= event.y <= y1:
                 continue
             if not left <= event.x <= left + plot_width:
                 continue
             target_sec = (event.x - left) * 86400 / plot_width
-            matches = [(s, e) for s, e in blocks if s <= target_sec <= e]
-            if not matches:
+            # Last block starting at or before the cursor that still covers it
+            idx = bisect_right(starts, target_sec) - 1
+            while idx >= 0 and blocks[idx][1] < target_sec:
+                idx -= 1
+            if idx < 0:
                 continue
-            start_s, end_s = matches[-1]
+            start_s, end_s = blocks[idx]
             sh, sm = divmod(start_s // 60, 60)
             eh, em = divmod(end_s // 60, 60)
             dur = (end_s - start_s) // 60
@@ -1290,6 +1395,7 @@ class DayDetailWindow(tk.Toplevel):
         self._driver_info = driver_info
         self._vehicle_info = vehicle_info or []
         self._iso_date = _activity_to_iso(day)
+        self._day_ordinal = _iso_to_ordinal(self._iso_date)
         self._is_vu = is_vu
         self._data = data
         self._slot_schedule = slot_schedule or {}
@@ -1447,10 +1553,10 @@ class DayDetailWindow(tk.Toplevel):
                 continue
             ins_ts = rec.get("insertion_time", "")
             ins_dt = _parse_iso(ins_ts)
-            if not ins_dt or ins_dt.date().isoformat() != self._iso_date:
+            if not ins_dt or ins_dt.toordinal() != self._day_ordinal:
                 continue
-            hhmm = ins_dt.strftime("%H:%M")
-            im = _hhmm_to_min(hhmm)
+            minute = ins_dt.hour * 60 + ins_dt.minute
+            hhmm = f"{ins_dt.hour:02d}:{ins_dt.minute:02d}"
             if rec.get("manual_input"):
                 label = "Manual entry"
                 slot = rec.get("card_slot")
@@ -1458,7 +1564,7 @@ class DayDetailWindow(tk.Toplevel):
                 detail = _fmt_empty_prefix() + slot_str
                 odo = rec.get("odometer_insertion_km")
                 odo_str = str(odo) if odo else ""
-                entries.append((im, 520, "MANUAL", hhmm, label,
+                entries.append((minute, 520, "MANUAL", hhmm, label,
                                 detail, 0, odo_str))
             else:
                 name = f"{rec.get('holder_surname','')} {rec.get('holder_first_names','')}".strip()
@@ -1470,14 +1576,14 @@ class DayDetailWindow(tk.Toplevel):
                 detail = _fmt_empty_prefix() + f"{name} {slot_str}" if slot_str else _fmt_empty_prefix() + name
                 odo = rec.get("odometer_insertion_km")
                 odo_str = str(odo) if odo else ""
-                entries.append((im, 490, "CARD_IN", hhmm, label,
+                entries.append((minute, 490, "CARD_IN", hhmm, label,
                                 detail, 0, odo_str))
             wit_ts = rec.get("withdrawal_time", "")
             if wit_ts:
                 wit_dt = _parse_iso(wit_ts)
-                if wit_dt and wit_dt.date().isoformat() == self._iso_date:
-                    whhmm = wit_dt.strftime("%H:%M")
-                    wm = _hhmm_to_min(whhmm)
+                if wit_dt and wit_dt.toordinal() == self._day_ordinal:
+                    whhmm = f"{wit_dt.hour:02d}:{wit_dt.minute:02d}"
+                    wm = wit_dt.hour * 60 + wit_dt.minute
                     odo = rec.get("odometer_withdrawal_km")
                     odo_str = str(odo) if odo else ""
                     entries.append((wm, 510, "CARD_OUT", whhmm,
@@ -1489,16 +1595,17 @@ class DayDetailWindow(tk.Toplevel):
                 continue
             begin_ts = ev.get("begin") or ev.get("begin_time") or ""
             dt = _parse_iso(begin_ts)
-            if not dt or dt.date().isoformat() != self._iso_date:
+            if not dt or dt.toordinal() != self._day_ordinal:
                 continue
-            hhmm = dt.strftime("%H:%M")
+            minute = dt.hour * 60 + dt.minute
+            hhmm = f"{dt.hour:02d}:{dt.minute:02d}"
             desc = ev.get("description", "Unknown event")
             plate_str = ""
             plate = ev.get("vehicle_plate", "")
             if plate:
                 plate_str = f"  Plate: {plate}"
             detail = _fmt_empty_prefix() + desc + plate_str
-            entries.append((_hhmm_to_min(hhmm), 800, "EVENT", hhmm,
+            entries.append((minute, 800, "EVENT", hhmm,
                             "Event", detail, 0, ""))
 
         # Faults
@@ -1507,12 +1614,13 @@ class DayDetailWindow(tk.Toplevel):
                 continue
             begin_ts = flt.get("begin") or flt.get("begin_time") or ""
             dt = _parse_iso(begin_ts)
-            if not dt or dt.date().isoformat() != self._iso_date:
+            if not dt or dt.toordinal() != self._day_ordinal:
                 continue
-            hhmm = dt.strftime("%H:%M")
+            minute = dt.hour * 60 + dt.minute
+            hhmm = f"{dt.hour:02d}:{dt.minute:02d}"
             desc = flt.get("description", "Unknown fault")
             detail = _fmt_empty_prefix() + desc
-            entries.append((_hhmm_to_min(hhmm), 810, "FAULT", hhmm,
+            entries.append((minute, 810, "FAULT", hhmm,
                             "Fault", detail, 0, ""))
 
         # Specific conditions
@@ -1530,9 +1638,10 @@ class DayDetailWindow(tk.Toplevel):
                 continue
             ts = pl.get("timestamp", "")
             dt = _parse_iso(ts)
-            if not dt or dt.date().isoformat() != self._iso_date:
+            if not dt or dt.toordinal() != self._day_ordinal:
                 continue
-            hhmm = dt.strftime("%H:%M")
+            minute = dt.hour * 60 + dt.minute
+            hhmm = f"{dt.hour:02d}:{dt.minute:02d}"
             entry_type = pl.get("entry_type", "")
             nation_code = pl.get("nation", "")
             if isinstance(nation_code, int):
@@ -1549,7 +1658,7 @@ class DayDetailWindow(tk.Toplevel):
             detail = country
             odo = pl.get("odometer_km")
             odo_str = str(odo) if odo else ""
-            entries.append((_hhmm_to_min(hhmm), 850, "PLACES", hhmm,
+            entries.append((minute, 850, "PLACES", hhmm,
                             label, detail, 0, odo_str))
         # VU-specific: overspeeding events
         for oe in (data.get("overspeeding_events") or []):
@@ -1557,9 +1666,10 @@ class DayDetailWindow(tk.Toplevel):
                 continue
             begin_ts = oe.get("begin") or oe.get("begin_time") or ""
             dt = _parse_iso(begin_ts)
-            if not dt or dt.date().isoformat() != self._iso_date:
+            if not dt or dt.toordinal() != self._day_ordinal:
                 continue
-            hhmm = dt.strftime("%H:%M")
+            minute = dt.hour * 60 + dt.minute
+            hhmm = f"{dt.hour:02d}:{dt.minute:02d}"
             max_s = oe.get("max_speed_kmh")
             avg_s = oe.get("average_speed_kmh")
             speed_parts = []
@@ -1569,7 +1679,7 @@ class DayDetailWindow(tk.Toplevel):
                 speed_parts.append(f"Avg {avg_s} km/h")
             speed_str = "  |  ".join(speed_parts) if speed_parts else ""
             detail = _fmt_empty_prefix() + speed_str
-            entries.append((_hhmm_to_min(hhmm), 820, "OVERSPEED", hhmm,
+            entries.append((minute, 820, "OVERSPEED", hhmm,
                             "Overspeeding", detail, 0, ""))
 
         # VU-specific: power interruptions
@@ -1578,10 +1688,11 @@ class DayDetailWindow(tk.Toplevel):
                 continue
             begin_ts = pi.get("begin") or pi.get("begin_time") or ""
             dt = _parse_iso(begin_ts)
-            if not dt or dt.date().isoformat() != self._iso_date:
+            if not dt or dt.toordinal() != self._day_ordinal:
                 continue
-            hhmm = dt.strftime("%H:%M")
-            entries.append((_hhmm_to_min(hhmm), 830, "POWER", hhmm,
+            minute = dt.hour * 60 + dt.minute
+            hhmm = f"{dt.hour:02d}:{dt.minute:02d}"
+            entries.append((minute, 830, "POWER", hhmm,
                             "Power interruption", "", 0, ""))
 
         # VU-specific (G2.2): border crossings
@@ -1590,9 +1701,10 @@ class DayDetailWindow(tk.Toplevel):
                 continue
             ts = bc.get("timestamp", bc.get("begin_time", ""))
             dt = _parse_iso(ts)
-            if not dt or dt.date().isoformat() != self._iso_date:
+            if not dt or dt.toordinal() != self._day_ordinal:
                 continue
-            hhmm = dt.strftime("%H:%M")
+            minute = dt.hour * 60 + dt.minute
+            hhmm = f"{dt.hour:02d}:{dt.minute:02d}"
             left = bc.get("country_left", "")
             entered = bc.get("country_entered", "")
             if left and entered:
@@ -1605,7 +1717,7 @@ class DayDetailWindow(tk.Toplevel):
                 desc = ""
             odo = bc.get("odometer_km")
             odo_str = str(odo) if odo else ""
-            entries.append((_hhmm_to_min(hhmm), 840, "BORDER", hhmm,
+            entries.append((minute, 840, "BORDER", hhmm,
                             "Border crossing",
                             _fmt_empty_prefix() + desc, 0, odo_str))
 
@@ -1615,13 +1727,14 @@ class DayDetailWindow(tk.Toplevel):
                 continue
             ts = lu.get("timestamp", "")
             dt = _parse_iso(ts)
-            if not dt or dt.date().isoformat() != self._iso_date:
+            if not dt or dt.toordinal() != self._day_ordinal:
                 continue
-            hhmm = dt.strftime("%H:%M")
+            minute = dt.hour * 60 + dt.minute
+            hhmm = f"{dt.hour:02d}:{dt.minute:02d}"
             op = (lu.get("operation_type") or "").capitalize()
             odo = lu.get("odometer_km")
             odo_str = str(odo) if odo else ""
-            entries.append((_hhmm_to_min(hhmm), 845, "LOADUNLD", hhmm,
+            entries.append((minute, 845, "LOADUNLD", hhmm,
                             f"Load/Unload: {op}" if op else "Load/Unload",
                             "", 0, odo_str))
 
@@ -1631,9 +1744,15 @@ class DayDetailWindow(tk.Toplevel):
         """Build timeline entries from activity changes only."""
         # Build driver presence map for VU files
         driver_by_slot = self._driver_presence() if self._is_vu else {}
+        slot_key = 0 if self._current_slot == 1 else 1
+        drivers = self._drivers_by_minute(driver_by_slot.get(slot_key, []))
 
         entries = []
+        # Each change ends where the next one starts: the end minute parsed
+        # for one entry is carried over as the start of the next.
+        next_min = None
         for i, ch in enumerate(activities):
+            carried, next_min = next_min, None
             if not isinstance(ch, dict):
                 continue
             act = (ch.get("activity") or "").upper()
@@ -1642,13 +1761,13 @@ class DayDetailWindow(tk.Toplevel):
             start_time = ch.get("time", "")
             if not isinstance(start_time, str) or ":" not in start_time:
                 continue
-            start_min = _hhmm_to_min(start_time)
-            next_time = "24:00"
+            start_min = _hhmm_to_min(start_time) if carried is None else carried
+            next_time, end_min = "24:00", 1440
             if i + 1 < len(activities):
                 nt = activities[i + 1].get("time", "")
                 if isinstance(nt, str) and ":" in nt:
                     next_time = nt
-            end_min = _hhmm_to_min(next_time)
+                    end_min = next_min = _hhmm_to_min(nt)
             dur_min = max(0, end_min - start_min)
             if dur_min <= 0:
                 continue
@@ -1662,8 +1781,7 @@ class DayDetailWindow(tk.Toplevel):
 
             # Driver / slot info
             if self._is_vu:
-                slot_key = 0 if self._current_slot == 1 else 1
-                active_name = self._find_driver(start_min, driver_by_slot.get(slot_key, []))
+                active_name = drivers[start_min] if 0 <= start_min < 1440 else None
                 if active_name:
                     detail += active_name
                 elif not card_in:
@@ -1697,14 +1815,14 @@ class DayDetailWindow(tk.Toplevel):
             if not isinstance(rec, dict):
                 continue
             ins_dt = _parse_iso(rec.get("insertion_time", ""))
-            if not ins_dt or ins_dt.date().isoformat() != self._iso_date:
+            if not ins_dt or ins_dt.toordinal() != self._day_ordinal:
                 continue
             name = f"{rec.get('holder_surname','')} {rec.get('holder_first_names','')}".strip()
             if not name or name == "N/A N/A":
                 name = rec.get("card_number", "") or "Unknown"
             start_min = ins_dt.hour * 60 + ins_dt.minute
             wit_dt = _parse_iso(rec.get("withdrawal_time", "") or "")
-            if wit_dt and wit_dt.date().isoformat() == self._iso_date:
+            if wit_dt and wit_dt.toordinal() == self._day_ordinal:
                 end_min = wit_dt.hour * 60 + wit_dt.minute
             else:
                 end_min = 1440
@@ -1713,11 +1831,15 @@ class DayDetailWindow(tk.Toplevel):
         return result
 
     @staticmethod
-    def _find_driver(minute, ranges):
-        for start_min, end_min, name in ranges:
-            if start_min <= minute < end_min:
-                return name
-        return None
+    def _drivers_by_minute(ranges):
+        """Minute-of-day -> driver name table for one slot's presence ranges,
+        filled in a single pass so each activity is a direct lookup.  Earlier
+        ranges win where they overlap, as a first-match scan would."""
+        table = [None] * 1440
+        for start_min, end_min, name in reversed(ranges):
+            if start_min < end_min:
+                table[start_min:end_min] = [name] * (end_min - start_min)
+        return table
 
     # ── Write to Text widget ───────────────────────────────────────────
 
@@ -1759,13 +1881,16 @@ class DayDetailWindow(tk.Toplevel):
                          "\u2500" * 52 + "\n", "t_sub")
         self.text.insert(tk.END, "Summary\n", "t_hdr")
 
+        # One pass over the timeline: activity durations and per-kind counts.
         totals = {"DRIVE": 0, "WORK": 0, "REST": 0, "AVAILABLE": 0, "UNKNOWN": 0}
+        kind_counts = {}
         for entry in timeline:
+            kind = entry[2]
+            kind_counts[kind] = kind_counts.get(kind, 0) + 1
             if len(entry) < 8:
                 continue
-            _sk, _rk, kind, _t, _l, _d, dur, _odo = entry
             if kind in totals:
-                totals[kind] += dur
+                totals[kind] += entry[6]
 
         for act, label in [("DRIVE", "Drive"), ("WORK", "Work"),
                            ("AVAILABLE", "Available"), ("REST", "Rest")]:
@@ -1782,7 +1907,7 @@ class DayDetailWindow(tk.Toplevel):
         ]
         self.text.insert(tk.END, "\n")
         for label, kind in counts:
-            n = sum(1 for _s, _r, k, *_ in timeline if k == kind)
+            n = kind_counts.get(kind, 0)
             if n > 0 or kind in ("EVENT", "FAULT", "CONDITION", "PLACES", "MANUAL"):
                 self.text.insert(tk.END,
                                  f"  {label:20s} {n}\n",
@@ -2254,9 +2379,10 @@ class TachoExplorer(tk.Tk):
 
         def _worker():
             try:
+                text = json.dumps(self.current_data, indent=2, ensure_ascii=False,
+                                  cls=BytesEncoder)
                 with open(path, 'w', encoding='utf-8') as f:
-                    json.dump(self.current_data, f, indent=2, ensure_ascii=False,
-                              cls=BytesEncoder)
+                    f.write(text)
                 self._export_queue.put(("JSON", "", None, path))
             except Exception as exc:
                 self._export_queue.put(("JSON", "", exc, path))
@@ -2732,34 +2858,28 @@ class TachoExplorer(tk.Tk):
             # Clamp to day boundaries
             if wit_dt is None:
                 wit_dt = ins_dt.replace(hour=23, minute=59, second=59)
-            current = ins_dt
-            while current.date() <= wit_dt.date():
-                day_iso = current.date().isoformat()
-                start_sec = ins_dt.hour * 3600 + ins_dt.minute * 60 + ins_dt.second if current.date() == ins_dt.date() else 0
-                end_sec = wit_dt.hour * 3600 + wit_dt.minute * 60 + wit_dt.second if current.date() == wit_dt.date() else 86399
+            ins_day = ins_dt.toordinal()
+            wit_day = wit_dt.toordinal()
+            for day_ord in range(ins_day, wit_day + 1):
+                day_iso = date.fromordinal(day_ord).isoformat()
+                start_sec = ins_dt.hour * 3600 + ins_dt.minute * 60 + ins_dt.second if day_ord == ins_day else 0
+                end_sec = wit_dt.hour * 3600 + wit_dt.minute * 60 + wit_dt.second if day_ord == wit_day else 86399
                 sh, sm = divmod(start_sec // 60, 60)
                 eh, em = divmod(end_sec // 60, 60)
                 start_hhmm = f"{sh:02d}:{sm:02d}"
                 end_hhmm = f"{eh:02d}:{em:02d}"
                 # Markers — only on the actual insertion/withdrawal day
-                if current.date() == ins_dt.date():
+                if day_ord == ins_day:
                     iw_events_by_date.setdefault(day_iso, []).append((start_sec, name, True))
-                if current.date() == wit_dt.date():
+                if day_ord == wit_day:
                     iw_events_by_date.setdefault(day_iso, []).append((end_sec, name, False))
                 # Schedule
                 iw_schedule_by_date.setdefault(day_iso, []).append((start_hhmm, end_hhmm, name,
                                                                      ins_dt, wit_dt))
-                current = datetime(current.year, current.month, current.day,
-                                   tzinfo=timezone.utc) + timedelta(days=1)
 
         # Compute daily km for VU (chronological order).
         def _date_sort_key(day_data):
-            date_str = str(day_data.get("date", ""))
-            try:
-                day, month, year = date_str.split("/")
-                return (int(year), int(month), int(day))
-            except (ValueError, AttributeError):
-                return (0, 0, 0)
+            return _activity_date_parts(str(day_data.get("date", ""))) or (0, 0, 0)
         chronological = sorted(
             [d for d in activity_list if isinstance(d, dict)], key=_date_sort_key)
         for i, day_data in enumerate(chronological):
@@ -2770,6 +2890,22 @@ class TachoExplorer(tk.Tk):
                 if prev_odo and cur_odo and cur_odo > prev_odo:
                     day_data["_day_km"] = cur_odo - prev_odo
 
+        # ── Specific conditions (out of scope, ferry...) per ISO date ──
+        oos_by_date = {}
+        for sc in (data.get("specific_conditions") or []):
+            if not isinstance(sc, dict):
+                continue
+            ts = sc.get("timestamp", "")
+            try:
+                sc_dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+                sc_day_iso = sc_dt.astimezone(timezone.utc).date().isoformat()
+            except (ValueError, AttributeError):
+                continue
+            sec_of_day = sc_dt.hour * 3600 + sc_dt.minute * 60 + sc_dt.second
+            cond = sc.get("condition", "")
+            oos_by_date.setdefault(sc_day_iso, []).append(
+                (sec_of_day, cond, sc_dt.astimezone(timezone.utc)))
+
         node = self.tree.insert(parent, tk.END, text="Daily Activities")
         self._payloads[node] = ("__daily_summary__", activity_list, data)
         for day_data in reversed(activity_list):
@@ -2787,7 +2923,7 @@ class TachoExplorer(tk.Tk):
             day_schedule = {}
             day_markers = []
             if is_vu and iso_date in iw_schedule_by_date:
-                # Build activity card_inserted events: (minute, slot_label)
+                # Build activity card_inserted events: (minute, position, slot_label)
                 act_insertions = []
                 for ch in changes:
                     if isinstance(ch, dict) and ch.get("card_inserted"):
@@ -2798,21 +2934,22 @@ class TachoExplorer(tk.Tk):
                                 h, m = t.split(":")[:2]
                                 minute = int(h) * 60 + int(m)
                                 slot_label = "Slot 1" if slot == "First" else "Slot 2"
-                                act_insertions.append((minute, slot_label))
+                                act_insertions.append((minute, len(act_insertions), slot_label))
                             except ValueError:
                                 pass
 
+                act_insertions.sort()
+                ins_minutes = [ai[0] for ai in act_insertions]
+
                 # For each schedule entry, match to a slot
                 for start_hhmm, end_hhmm, name, ins_dt, _wit_dt in iw_schedule_by_date[iso_date]:
                     slot = ""
                     if act_insertions:
                         ins_min = ins_dt.hour * 60 + ins_dt.minute
-                        best = min(act_insertions,
-                                   key=lambda ai: abs(ai[0] - ins_min),
-                                   default=None)
+                        best = _nearest_insertion(act_insertions, ins_minutes, ins_min)
                         if best and abs(best[0] - ins_min) <= 2:
-                            slot = best[1]
-                            day_slots[best[1]] = name
+                            slot = best[2]
+                            day_slots[best[2]] = name
                     if not slot:
                         # Fallback: use slot from global assignment if name matches
                         for sk, sn in global_slots.items():
@@ -2844,22 +2981,7 @@ class TachoExplorer(tk.Tk):
                 day_di = driver_info if not is_vu else ""
 
             # Out-of-scope events for this day
-            oos_events = []
-            sc_conds = data.get("specific_conditions") or []
-            for sc in sc_conds:
-                if not isinstance(sc, dict):
-                    continue
-                ts = sc.get("timestamp", "")
-                try:
-                    sc_dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-                    sc_day_iso = sc_dt.astimezone(timezone.utc).date().isoformat()
-                except (ValueError, AttributeError):
-                    continue
-                if sc_day_iso != iso_date:
-                    continue
-                sec_of_day = sc_dt.hour * 3600 + sc_dt.minute * 60 + sc_dt.second
-                cond = sc.get("condition", "")
-                oos_events.append((sec_of_day, cond, sc_dt.astimezone(timezone.utc)))
+            oos_events = oos_by_date.get(iso_date, [])
 
             # ── Vehicles driven this day (driver cards only) ──
             day_vehicles = []
@@ -3402,6 +3524,10 @@ class TachoExplorer(tk.Tk):
                 all_changes = day_data.get("changes", [])
                 filtered_changes = [c for c in all_changes
                                     if isinstance(c, dict) and str(c.get("slot") or "") == slot_name]
+                if len(filtered_changes) == len(all_changes):
+                    # Nothing filtered out: the view below only reads, so share the day
+                    filtered.append(day_data)
+                    continue
                 copy = dict(day_data)
                 copy["changes"] = filtered_changes
                 filtered.append(copy)
@@ -3413,6 +3539,8 @@ class TachoExplorer(tk.Tk):
             # Build a lookup: (date_iso, minute_of_day) -> slot
             # from the original unfiltered activity changes
             slot_by_minute: dict[tuple[str, int], str] = {}
+            # First minute key seen per date, for the whole-day fallback below
+            first_key_by_date: dict[str, tuple[str, int]] = {}
             for day_data in activity_list:
                 if not isinstance(day_data, dict):
                     continue
@@ -3430,6 +3558,7 @@ class TachoExplorer(tk.Tk):
                             minute = int(h) * 60 + int(m)
                             slot = str(ch.get("slot") or "")
                             if slot:
+                                first_key_by_date.setdefault(date_iso, (date_iso, minute))
                                 slot_by_minute[(date_iso, minute)] = slot
                         except ValueError:
                             pass
@@ -3442,32 +3571,23 @@ class TachoExplorer(tk.Tk):
                 if not name or name == "N/A N/A":
                     continue
                 ins_str = iw.get("insertion_time", "")
-                ins_dt = None
-                for fmt in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S"):
-                    try:
-                        ins_dt = datetime.strptime(ins_str[:19], fmt)
-                    except (ValueError, IndexError):
-                        pass
+                ins_dt = _parse_naive_timestamp(ins_str[:19]) if isinstance(ins_str, str) else None
                 if ins_dt is None:
                     continue
                 wit_str = iw.get("withdrawal_time", "")
                 wit_dt = None
                 if isinstance(wit_str, str) and wit_str:
-                    for fmt in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S"):
-                        try:
-                            wit_dt = datetime.strptime(wit_str[:19], fmt)
-                        except (ValueError, IndexError):
-                            pass
+                    wit_dt = _parse_naive_timestamp(wit_str[:19])
                 if wit_dt is None:
                     wit_dt = ins_dt.replace(hour=23, minute=59, second=59)
-                current = ins_dt
-                while current.date() <= wit_dt.date():
-                    day_iso = current.date().isoformat()
+                ins_day = ins_dt.toordinal()
+                for day_ord in range(ins_day, wit_dt.toordinal() + 1):
+                    day_iso = date.fromordinal(day_ord).isoformat()
                     # Determine which slot this driver is in on this day
-                    ins_minute = ins_dt.hour * 60 + ins_dt.minute if current.date() == ins_dt.date() else 0
+                    ins_minute = ins_dt.hour * 60 + ins_dt.minute if day_ord == ins_day else 0
                     iw_slot = ""
                     # Look for a card_inserted event within 2 minutes on the insertion day
-                    if current.date() == ins_dt.date():
+                    if day_ord == ins_day:
                         for offset in range(-2, 3):
                             check_min = ins_minute + offset
                             if 0 <= check_min < 1440:
@@ -3476,15 +3596,12 @@ class TachoExplorer(tk.Tk):
                                     break
                     if not iw_slot:
                         # Fallback: use card_inserted from any time on this day
-                        for (d, _m), s in slot_by_minute.items():
-                            if d == day_iso:
-                                iw_slot = s
-                                break
+                        first_key = first_key_by_date.get(day_iso)
+                        if first_key is not None:
+                            iw_slot = slot_by_minute[first_key]
                     iw_slot_name = "First" if iw_slot == "First" else ("Second" if iw_slot == "Second" else "")
                     if iw_slot_name and iw_slot_name == slot_name:
                         iw_by_date.setdefault(day_iso, set()).add(name)
-                    current = datetime(current.year, current.month, current.day,
-                                        tzinfo=timezone.utc) + timedelta(days=1)
 
         # Global driver names for KPI count
         driver_names = set()
@@ -3567,27 +3684,18 @@ class TachoExplorer(tk.Tk):
                     veh_by_date.setdefault(start_dt.date().isoformat(), set()).add(plate)
                 if end_dt:
                     veh_by_date.setdefault(end_dt.date().isoformat(), set()).add(plate)
-            # Fill gaps: a session spans from start date to end date
-            for sess in (data.get("vehicle_sessions") or []):
-                if not isinstance(sess, dict):
-                    continue
-                plate = (sess.get("vehicle_plate") or "").strip()
-                if not plate:
-                    continue
-                start_dt = _parse_iso(sess.get("start"))
-                end_dt = _parse_iso(sess.get("end"))
-                if start_dt and end_dt and start_dt.date() != end_dt.date():
-                    current = start_dt.date() + timedelta(days=1)
-                    while current <= end_dt.date():
-                        veh_by_date.setdefault(current.isoformat(), set()).add(plate)
-                        current += timedelta(days=1)
+                # Fill gaps: a session spans from start date to end date
+                if start_dt and end_dt:
+                    for day_ord in range(start_dt.toordinal() + 1, end_dt.toordinal() + 1):
+                        veh_by_date.setdefault(date.fromordinal(day_ord).isoformat(), set()).add(plate)
 
         # Monthly grouping
         MONTH_NAMES = {1: "Jan", 2: "Feb", 3: "Mar", 4: "Apr", 5: "May", 6: "Jun",
                        7: "Jul", 8: "Aug", 9: "Sep", 10: "Oct", 11: "Nov", 12: "Dec"}
 
-        sort_key = lambda d: _activity_to_iso(str(d.get("date", "")))
-        sorted_asc = sorted(valid, key=sort_key)
+        # ISO date per day, computed once and shared by sort, rows and totals
+        iso_by_day = {id(d): _activity_to_iso(str(d.get("date", ""))) for d in valid}
+        sorted_asc = sorted(valid, key=lambda d: iso_by_day[id(d)])
 
         # Daily km from odometer deltas (chronological). VU days already carry
         # a precomputed "_day_km"; for card files derive the distance from the
@@ -3650,7 +3758,7 @@ class TachoExplorer(tk.Tk):
                 m_tot["KM"] += day_km
                 if day_tots["DRIVE"] > max_drive:
                     max_drive = day_tots["DRIVE"]
-                iso_date = _activity_to_iso(date_str)
+                iso_date = iso_by_day[id(day_data)]
                 drivers = iw_by_date.get(iso_date, set())
                 if not drivers and not is_vu:
                     drivers = driver_names
@@ -3703,8 +3811,7 @@ class TachoExplorer(tk.Tk):
                 ])
             else:
                 m_veh = len({p for day in m_days
-                              for p in veh_by_date.get(
-                                  _activity_to_iso(str(day.get("date", ""))), set())})
+                              for p in veh_by_date.get(iso_by_day[id(day)], set())})
                 m_n_veh = m_veh or n_veh
                 table_rows.append([
                     m_label, str(m_n_veh) if m_n_veh else "", "", km_month,
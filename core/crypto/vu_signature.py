@@ -83,7 +83,15 @@ def _parse_tlvs(data):
             length_size = first_length_byte & 0x7F
             if length_size == 0 or offset + length_size > length:
                 return None
-            value_length = int.from_bytes(data[offset:offset + length_size], "big")
+            # Unrolled for the usual one to three length octets.
+            if length_size == 1:
+                value_length = data[offset]
+            elif length_size == 2:
+                value_length = (data[offset] << 8) | data[offset + 1]
+            elif length_size == 3:
+                value_length = (data[offset] << 16) | (data[offset + 1] << 8) | data[offset + 2]
+            else:
+                value_length = int.from_bytes(data[offset:offset + length_size], "big")
             offset += length_size
         else:
             value_length = first_length_byte
@@ -21,6 +21,7 @@ from core.decoders.common import (
     decode_date,
     decode_datef,
     decode_activity_val,
+    decode_activity_words,
     get_cyclic_data,
     parse_cyclic_buffer_activities,
 )
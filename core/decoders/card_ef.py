@@ -1,11 +1,10 @@
 """Card EF decoders: identification, licence, vehicles used, events/faults, places, calibration, control activities and company/workshop card data (G1 Annex 1B + G2 card EFs)."""
 
 import struct
-from datetime import datetime, timezone
 
 from core.utils.logger import get_logger
 from core.utils.constants import MAX_ODO_DISTANCE_KM
-from core.decoders.common import _decode_gnss_coord, decode_date, decode_string, get_nation, mark_heuristic
+from core.decoders.common import _decode_gnss_coord, _iso_utc, _u24, _U16, _U32, decode_date, decode_string, get_nation, mark_heuristic
 from core.utils.event_codes import describe_calibration_purpose, describe_control_type, describe_event, describe_fault
 
 _log = get_logger(__name__)
@@ -62,37 +61,47 @@ def _vehicles_used_layouts(rec_data):
     return [(size, kind) for size, kind in ((31, "g1"), (48, "g2"), (35, "legacy"))
             if len(rec_data) >= size and len(rec_data) % size == 0]
 
-def _decode_vehicle_record(chunk, kind):
-    """Decode one CardVehicleRecord chunk. Returns the raw field tuple
+# CardVehicleRecord layouts (see _vehicles_used_layouts); G1 and G2 share
+# the 31-byte prefix (Annex 1B/1C §2.37), odometers are UInt24 and are
+# unpacked as high byte + low word so the whole record decodes in one call.
+_VEHICLE_RECORD_STRUCTS = {
+    "g1": struct.Struct(">BHBHIIB14s2x"),
+    "g2": struct.Struct(">BHBHIIB14s2x17s"),
+    "legacy": struct.Struct(">IIIIB14s4x"),
+}
+
+def _decode_vehicle_records(rec_data, kind):
+    """Decode every CardVehicleRecord in *rec_data* (a whole number of
+    records). Returns raw field tuples
     (odo_begin, odo_end, first_use_ts, last_use_ts, nation_code, plate, vin)."""
-    vin = None
+    records = []
+    rows = _VEHICLE_RECORD_STRUCTS[kind].iter_unpack(rec_data)
     if kind == "legacy":
-        odo_begin = struct.unpack(">I", chunk[0:4])[0]
-        odo_end = struct.unpack(">I", chunk[4:8])[0]
-        first_use_ts = struct.unpack(">I", chunk[8:12])[0]
-        last_use_ts = struct.unpack(">I", chunk[12:16])[0]
-        nation_code = chunk[16]
-        plate = decode_string(chunk[17:31], is_id=True)
-    else:
-        # G1 and G2 share the 31-byte prefix (Annex 1B/1C §2.37).
-        odo_begin = int.from_bytes(chunk[0:3], byteorder='big')
-        odo_end = int.from_bytes(chunk[3:6], byteorder='big')
-        first_use_ts = struct.unpack(">I", chunk[6:10])[0]
-        last_use_ts = struct.unpack(">I", chunk[10:14])[0]
-        nation_code = chunk[14]
-        plate = decode_string(chunk[15:29], is_id=True)
-        if kind == "g2":
-            vin = decode_string(chunk[31:48], is_id=True) or None
-    return odo_begin, odo_end, first_use_ts, last_use_ts, nation_code, plate, vin
+        for odo_begin, odo_end, first_use_ts, last_use_ts, nation_code, plate_raw in rows:
+            records.append((odo_begin, odo_end, first_use_ts, last_use_ts, nation_code,
+                            decode_string(plate_raw, is_id=True), None))
+        return records
+    g2 = kind == "g2"
+    for fields in rows:
+        ob_hi, ob_lo, oe_hi, oe_lo, first_use_ts, last_use_ts, nation_code, plate_raw = fields[:8]
+        vin = (decode_string(fields[8], is_id=True) or None) if g2 else None
+        records.append(((ob_hi << 16) | ob_lo, (oe_hi << 16) | oe_lo, first_use_ts, last_use_ts,
+                        nation_code, decode_string(plate_raw, is_id=True), vin))
+    return records
+
+# Deletion set for bytes.translate: what is left are the non-alphanumerics.
+_ASCII_ALNUM = b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
 
 def _vehicle_record_valid(odo_begin, odo_end, first_use_ts, nation_code, plate):
     """Garbage filter for a decoded vehicle record."""
     stripped = plate.strip().rstrip('\x00')
     if not stripped or len(stripped) < 2 or len(stripped) >= 14:
         return False
-    if not all(0x20 <= ord(c) < 0x7F for c in stripped):
+    # Printable ASCII only (0x20-0x7E); both checks run in C.
+    if not (stripped.isascii() and stripped.isprintable()):
         return False
-    alpha_ratio = sum(1 for c in stripped if c.isalnum()) / len(stripped)
+    raw = stripped.encode('ascii')
+    alpha_ratio = (len(raw) - len(raw.translate(None, _ASCII_ALNUM))) / len(raw)
     if alpha_ratio < 0.5:
         return False
     # NationNumeric: known codes top out below 0x60; 0xFD-0xFF are the
@@ -125,20 +134,14 @@ def parse_g1_vehicles_used(val, results):
         return
 
     # Score each layout by the number of records passing validation and keep
-    # the best one (a misaligned stride yields almost no valid records).
-    best_kind, best_size, best_count = None, 0, -1
-    for size, kind in candidates:
-        count = 0
-        for i in range(len(rec_data) // size):
-            chunk = rec_data[i * size:(i + 1) * size]
-            try:
-                ob, oe, fu, lu, nc, plate, _ = _decode_vehicle_record(chunk, kind)
-            except (struct.error, IndexError):
-                continue
-            if _vehicle_record_valid(ob, oe, fu, nc, plate):
-                count += 1
-        if count > best_count:
-            best_kind, best_size, best_count = kind, size, count
+    # the best one (a misaligned stride yields almost no valid records). Only
+    # the valid records are kept, so sessions are built from survivors alone.
+    best_records, best_count = None, -1
+    for _size, kind in candidates:
+        valid = [rec for rec in _decode_vehicle_records(rec_data, kind)
+                 if _vehicle_record_valid(rec[0], rec[1], rec[2], rec[4], rec[5])]
+        if len(valid) > best_count:
+            best_records, best_count = valid, len(valid)
     if best_count <= 0:
         return
 
@@ -146,25 +149,18 @@ def parse_g1_vehicles_used(val, results):
     seen = {(s.get("vehicle_plate"), s.get("start"), s.get("odometer_begin"))
             for s in sessions if isinstance(s, dict)}
 
-    for i in range(len(rec_data) // best_size):
-        chunk = rec_data[i * best_size:(i + 1) * best_size]
+    for odo_begin, odo_end, first_use_ts, last_use_ts, nation_code, plate, vin in best_records:
         try:
-            odo_begin, odo_end, first_use_ts, last_use_ts, nation_code, plate, vin = \
-                _decode_vehicle_record(chunk, best_kind)
-
-            if not _vehicle_record_valid(odo_begin, odo_end, first_use_ts, nation_code, plate):
-                continue
-
             if odo_begin in (0xFFFFFF, 0xFFFFFFFF):
                 odo_begin = None
             if odo_end in (0xFFFFFF, 0xFFFFFFFF):
                 odo_end = None
 
-            start_date = datetime.fromtimestamp(first_use_ts, tz=timezone.utc).isoformat()
+            start_date = _iso_utc(first_use_ts)
             end_date = "Open Session"
             if last_use_ts != 0xFFFFFFFF and last_use_ts > 946684800:
                 try:
-                    end_date = datetime.fromtimestamp(last_use_ts, tz=timezone.utc).isoformat()
+                    end_date = _iso_utc(last_use_ts)
                 except (OSError, ValueError, OverflowError):
                     pass
 
@@ -204,7 +200,7 @@ def parse_g1_current_usage(val, results):
     if len(val) < 19:
         return
     try:
-        ts = struct.unpack(">I", val[0:4])[0]
+        ts = _U32.unpack_from(val)[0]
         if ts == 0 or ts == 0xFFFFFFFF or ts > 4102444800:
             return
         results["vehicle"]["plate"] = decode_string(val[5:19], is_id=True)
@@ -302,9 +298,7 @@ def parse_calibration_data(val, results):
             vin_off = 95 if rec_size >= 167 else 1
             nation_off = 112 if rec_size >= 167 else 18
             plate_off = 113 if rec_size >= 167 else 19
-            w_off = 127 if rec_size >= 167 else 33
-            k_off = 129 if rec_size >= 167 else 35
-            l_off = 131 if rec_size >= 167 else 37
+            w_off = 127 if rec_size >= 167 else 33  # W, K, L: consecutive UInt16
             tyre_off = 133 if rec_size >= 167 else 39
             speed_off = 148 if rec_size >= 167 else 54
             odo_off = 149 if rec_size >= 167 else 55
@@ -313,15 +307,13 @@ def parse_calibration_data(val, results):
             nation = get_nation(chunk[nation_off])
             # VehicleRegistrationNumber = codePage(1) + 13 chars
             plate = decode_string(chunk[plate_off + 1:plate_off + 14], is_id=True)
-            w_const = struct.unpack(">H", chunk[w_off:w_off + 2])[0]
-            k_const = struct.unpack(">H", chunk[k_off:k_off + 2])[0]
-            l_const = struct.unpack(">H", chunk[l_off:l_off + 2])[0]
+            w_const, k_const, l_const = struct.unpack_from(">HHH", chunk, w_off)
             tyre = decode_string(chunk[tyre_off:tyre_off + 15])
             speed = chunk[speed_off]
-            old_odo = int.from_bytes(chunk[odo_off:odo_off + 3], 'big')
+            old_odo = _u24(chunk, odo_off)
             if old_odo == 0xFFFFFF:
                 old_odo = None
-            new_odo = int.from_bytes(chunk[odo_off + 3:odo_off + 6], 'big') if rec_size >= 167 else None
+            new_odo = _u24(chunk, odo_off + 3) if rec_size >= 167 else None
             if new_odo == 0xFFFFFF:
                 new_odo = None
             old_time = decode_date(chunk[odo_off + 6:odo_off + 10]) if rec_size >= 167 else "N/A"
@@ -366,11 +358,11 @@ def parse_g1_app_identification(val, results):
         return
     try:
         app_type = val[0]
-        version = struct.unpack(">H", val[1:3])[0]
+        version = _U16.unpack_from(val, 1)[0]
         no_events = val[3]
         no_faults = val[4]
-        activity_len = struct.unpack(">H", val[5:7])[0]
-        no_vehicles = struct.unpack(">H", val[7:9])[0]
+        activity_len = _U16.unpack_from(val, 5)[0]
+        no_vehicles = _U16.unpack_from(val, 7)[0]
         info = {
             "type": app_type,
             "version": version,
@@ -380,10 +372,10 @@ def parse_g1_app_identification(val, results):
             "no_vehicle_records": no_vehicles,
         }
         if len(val) >= 17:
-            info["no_place_records"] = struct.unpack(">H", val[9:11])[0]
-            info["no_gnss_ad_records"] = struct.unpack(">H", val[11:13])[0]
-            info["no_specific_condition_records"] = struct.unpack(">H", val[13:15])[0]
-            info["no_card_vehicle_unit_records"] = struct.unpack(">H", val[15:17])[0]
+            info["no_place_records"] = _U16.unpack_from(val, 9)[0]
+            info["no_gnss_ad_records"] = _U16.unpack_from(val, 11)[0]
+            info["no_specific_condition_records"] = _U16.unpack_from(val, 13)[0]
+            info["no_card_vehicle_unit_records"] = _U16.unpack_from(val, 15)[0]
         else:
             info["no_place_records"] = val[9]
         results.setdefault("card_application", {}).update(info)
@@ -408,15 +400,15 @@ def parse_g1_events_data(val, results):
             if ev_type == 0xFF:
                 off += rec_size
                 continue
-            begin_ts = struct.unpack(">I", val[off+1:off+5])[0]
-            end_ts = struct.unpack(">I", val[off+5:off+9])[0]
+            begin_ts = _U32.unpack_from(val, off + 1)[0]
+            end_ts = _U32.unpack_from(val, off + 5)[0]
             if begin_ts == 0 or begin_ts == 0xFFFFFFFF:
                 off += rec_size
                 continue
             nation = get_nation(val[off+9])
             plate = decode_string(val[off+10:off+24], is_id=True)
-            begin = datetime.fromtimestamp(begin_ts, tz=timezone.utc).isoformat()
-            end = datetime.fromtimestamp(end_ts, tz=timezone.utc).isoformat() if end_ts != 0xFFFFFFFF else "N/A"
+            begin = _iso_utc(begin_ts)
+            end = _iso_utc(end_ts) if end_ts != 0xFFFFFFFF else "N/A"
             if (ev_type, begin, end) in seen:
                 off += rec_size
                 continue
@@ -451,15 +443,15 @@ def parse_g1_faults_data(val, results):
             if fault_type == 0xFF:
                 off += rec_size
                 continue
-            begin_ts = struct.unpack(">I", val[off+1:off+5])[0]
-            end_ts = struct.unpack(">I", val[off+5:off+9])[0]
+            begin_ts = _U32.unpack_from(val, off + 1)[0]
+            end_ts = _U32.unpack_from(val, off + 5)[0]
             if begin_ts == 0 or begin_ts == 0xFFFFFFFF:
                 off += rec_size
                 continue
             nation = get_nation(val[off+9])
             plate = decode_string(val[off+10:off+24], is_id=True)
-            begin = datetime.fromtimestamp(begin_ts, tz=timezone.utc).isoformat()
-            end = datetime.fromtimestamp(end_ts, tz=timezone.utc).isoformat() if end_ts != 0xFFFFFFFF else "N/A"
+            begin = _iso_utc(begin_ts)
+            end = _iso_utc(end_ts) if end_ts != 0xFFFFFFFF else "N/A"
             if (fault_type, begin, end) in seen:
                 off += rec_size
                 continue
@@ -489,7 +481,7 @@ def _decode_place_records(val, off, stride):
     try:
         for i in range(off, len(val) - stride + 1, stride):
             chunk = val[i:i + stride]
-            ts = struct.unpack(">I", chunk[0:4])[0]
+            ts = _U32.unpack_from(chunk)[0]
             if ts < MIN_TS or ts > MAX_TS:
                 continue
             entry_type = chunk[4]
@@ -501,7 +493,7 @@ def _decode_place_records(val, off, stride):
             if nation_code > 0xFF:
                 continue
 
-            dt = datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+            dt = _iso_utc(ts)
             record = {
                 "timestamp": dt,
                 "entry_type": entry_names[entry_type],
@@ -509,7 +501,7 @@ def _decode_place_records(val, off, stride):
                 "nation": get_nation(nation_code),
                 "region": chunk[6],
             }
-            odo_val = int.from_bytes(chunk[7:10], 'big')
+            odo_val = _u24(chunk, 7)
             if odo_val != 0xFFFFFF and odo_val < 10000000:
                 record["odometer_km"] = odo_val
             if stride >= 21:
@@ -564,16 +556,16 @@ def parse_g1_places(val, results):
         ordered = layouts_by_gen[gen_key] + [
             lyt for lyt in ((1, 10), (2, 21), (2, 22))
             if lyt not in layouts_by_gen[gen_key]]
-        candidates = [(off, stride) for off, stride in ordered
-                      if (len(val) - off) % stride == 0]
-        if not candidates:
-            return
-
-        best = []
-        for off, stride in candidates:
+        # Keep only the running best layout: no candidate list is built.
+        best, best_count = None, 0
+        for off, stride in ordered:
+            if (len(val) - off) % stride:
+                continue
             records = _decode_place_records(val, off, stride)
-            if len(records) > len(best):
-                best = records
+            if len(records) > best_count:
+                best, best_count = records, len(records)
+        if best is None:
+            return
 
         existing = {(p.get("timestamp"), p.get("type_code")): p
                     for p in results["places"] if isinstance(p, dict)}
@@ -611,10 +603,10 @@ def parse_card_vehicle_units(val, results):
                 for u in units if isinstance(u, dict)}
         for i in range(0, len(data), rec_size):
             chunk = data[i:i + rec_size]
-            ts = struct.unpack(">I", chunk[0:4])[0]
+            ts = _U32.unpack_from(chunk)[0]
             if ts < 946684800 or ts > 4102444800:
                 continue
-            dt = datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+            dt = _iso_utc(ts)
             mfr = chunk[4]
             if (dt, mfr) in seen:
                 continue
@@ -653,14 +645,14 @@ def parse_card_gnss_places(val, results):
                 for r in records if isinstance(r, dict)}
         for i in range(0, len(data), rec_size):
             chunk = data[i:i + rec_size]
-            ts = struct.unpack(">I", chunk[0:4])[0]
+            ts = _U32.unpack_from(chunk)[0]
             if ts < 946684800 or ts > 4102444800:
                 continue
             lat = _decode_gnss_coord(chunk, 9)
             lon = _decode_gnss_coord(chunk, 12)
             if lat is None or lon is None:
                 continue
-            dt = datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+            dt = _iso_utc(ts)
             if (dt, lat, lon) in seen:
                 continue
             seen.add((dt, lat, lon))
@@ -673,7 +665,7 @@ def parse_card_gnss_places(val, results):
             odo_off = 15 if rec_size == 18 else 16
             if rec_size == 19:
                 rec["gnss_authenticated"] = chunk[15] == 1
-            odo = int.from_bytes(chunk[odo_off:odo_off + 3], 'big')
+            odo = _u24(chunk, odo_off)
             if odo != 0xFFFFFF and odo < 10000000:
                 rec["odometer_km"] = odo
             records.append(rec)
@@ -708,7 +700,7 @@ def parse_g2_card_icc_identification(val, results):
         if len(val) >= 22:
             chip_info["embedder_ic_assembler_id"] = val[18:22].hex().upper()
         if len(val) >= 24:
-            chip_info["ic_identifier"] = f"0x{struct.unpack('>H', val[22:24])[0]:04X}"
+            chip_info["ic_identifier"] = f"0x{_U16.unpack_from(val, 22)[0]:04X}"
         if len(val) > 24:
             historical = val[24:]
             text = decode_string(historical)
@@ -750,7 +742,7 @@ def parse_ef_icc(val, results):
         if len(val) >= 22:
             chip_info["embedder_ic_assembler_id"] = val[18:22].hex().upper()
         if len(val) >= 24:
-            chip_info["ic_identifier"] = f"0x{struct.unpack('>H', val[22:24])[0]:04X}"
+            chip_info["ic_identifier"] = f"0x{_U16.unpack_from(val, 22)[0]:04X}"
         if len(val) > 24:
             historical = val[24:]
             text = decode_string(historical)
@@ -773,8 +765,8 @@ def parse_ef_ic(val, results):
     if len(val) < 8:
         return
     try:
-        ic_serial = struct.unpack(">I", val[0:4])[0]
-        ic_mfr = struct.unpack(">I", val[4:8])[0]
+        ic_serial = _U32.unpack_from(val)[0]
+        ic_mfr = _U32.unpack_from(val, 4)[0]
         decoded_pct = round(8 / max(len(val), 1) * 100, 1)
         results.setdefault("card_chip", {}).update({
             "ic_serial_number": f"0x{ic_serial:08X}",
@@ -814,7 +806,7 @@ def parse_control_activity_data(val, results):
         while off + rec_size <= len(val):
             chunk = val[off:off + rec_size]
             control_type = chunk[0]
-            ts = struct.unpack(">I", chunk[1:5])[0]
+            ts = _U32.unpack_from(chunk, 1)[0]
             if ts == 0 or ts == 0xFFFFFFFF or ts < 946684800:
                 off += rec_size
                 continue
@@ -826,16 +818,16 @@ def parse_control_activity_data(val, results):
             vehicle_nation = get_nation(chunk[23])
             vehicle_plate = decode_string(chunk[24:38])
 
-            download_begin = struct.unpack(">I", chunk[38:42])[0]
-            download_end = struct.unpack(">I", chunk[42:46])[0]
+            download_begin = _U32.unpack_from(chunk, 38)[0]
+            download_end = _U32.unpack_from(chunk, 42)[0]
 
-            dt = datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+            dt = _iso_utc(ts)
             if (dt, control_type) in seen:
                 off += rec_size
                 continue
             seen.add((dt, control_type))
-            begin_dt = datetime.fromtimestamp(download_begin, tz=timezone.utc).isoformat() if 946684800 <= download_begin <= 4102444800 else "N/A"
-            end_dt = datetime.fromtimestamp(download_end, tz=timezone.utc).isoformat() if 946684800 <= download_end <= 4102444800 else "N/A"
+            begin_dt = _iso_utc(download_begin) if 946684800 <= download_begin <= 4102444800 else "N/A"
+            end_dt = _iso_utc(download_end) if 946684800 <= download_end <= 4102444800 else "N/A"
 
             nation_char = get_nation(card_nation)
             existing.append({
@@ -870,11 +862,11 @@ def parse_card_download(val, results):
         downloads = results.setdefault("card_downloads", [])
         seen = {d.get("download_time") for d in downloads if isinstance(d, dict)}
         while off + rec_size <= len(val):
-            ts = struct.unpack(">I", val[off:off+4])[0]
+            ts = _U32.unpack_from(val, off)[0]
             off += rec_size
             if ts == 0 or ts == 0xFFFFFFFF or ts < 946684800 or ts > 4102444800:
                 continue
-            dt = datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+            dt = _iso_utc(ts)
             if dt in seen:
                 continue
             seen.add(dt)
@@ -901,7 +893,7 @@ def parse_specific_conditions(val, results):
                 for c in conditions if isinstance(c, dict)}
         while off + rec_size <= len(val):
             chunk = val[off:off+rec_size]
-            ts = struct.unpack(">I", chunk[0:4])[0]
+            ts = _U32.unpack_from(chunk)[0]
             if ts < 946684800 or ts > 4102444800:
                 off += rec_size
                 continue
@@ -910,7 +902,7 @@ def parse_specific_conditions(val, results):
             if cond_type not in (0x01, 0x02, 0x03, 0x04):
                 off += rec_size
                 continue
-            dt = datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+            dt = _iso_utc(ts)
             if (dt, cond_type) not in seen:
                 seen.add((dt, cond_type))
                 conditions.append({
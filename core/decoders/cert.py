@@ -4,7 +4,7 @@ import struct
 from datetime import datetime, timezone
 
 from core.utils.logger import get_logger
-from core.decoders.common import decode_date, decode_string, get_nation
+from core.decoders.common import _U16, decode_date, decode_string, get_nation
 from core.utils.constants import (
     CVC_EFFECTIVE_DATE_TAG,
     CVC_EXPIRATION_DATE_TAG,
@@ -125,7 +125,16 @@ def _tlv(data):
             nb = length & 0x7F
             if nb == 0 or i + tag_len + 1 + nb > n:
                 return out
-            length = int.from_bytes(data[i + tag_len + 1:i + tag_len + 1 + nb], "big")
+            k = i + tag_len + 1
+            # Unrolled for the usual one to three length octets.
+            if nb == 1:
+                length = data[k]
+            elif nb == 2:
+                length = (data[k] << 8) | data[k + 1]
+            elif nb == 3:
+                length = (data[k] << 16) | (data[k + 1] << 8) | data[k + 2]
+            else:
+                length = int.from_bytes(data[k:k + nb], 'big')
             len_len = 1 + nb
         start = i + tag_len + len_len
         if start + length > n:
@@ -232,7 +241,7 @@ def _parse_g1_certificate_internal(val, results):
         nation = get_nation(val[186])
         nation_code = val[187:190].decode('latin-1', errors='replace').strip()
         serial = val[190]
-        add_info = struct.unpack(">H", val[191:193])[0]
+        add_info = _U16.unpack_from(val, 191)[0]
         ca_id = val[193]
 
         results.setdefault("certificates", []).append({
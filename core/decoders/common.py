@@ -1,12 +1,28 @@
 """Low-level decoding helpers shared by all field decoders: nations, code-page strings, dates, activity values and cyclic activity buffers (Annex 1B/1C primitives)."""
 
 import struct
+import time
 from datetime import datetime, timezone
+from functools import lru_cache
 
 from core.utils.logger import get_logger
 
 _log = get_logger(__name__)
 
+# Precompiled big-endian formats shared by the decoders.
+_U16 = struct.Struct(">H")
+_U32 = struct.Struct(">I")
+# CardActivityDailyRecord: prev/record length + date, then presence counter + distance.
+_CYC_HDR = struct.Struct(">HHI")
+_CYC_CNT = struct.Struct(">HH")
+
+
+def _u24(data, offset=0):
+    """Unsigned 24-bit big-endian value at *offset* (odometer fields)."""
+    if offset + 3 <= len(data):
+        return (data[offset] << 16) | (data[offset + 1] << 8) | data[offset + 2]
+    return int.from_bytes(data[offset:offset + 3], "big")
+
 
 def mark_heuristic(results, section, fields):
     """Record that *fields* in *section* were recovered by an emergency
@@ -33,20 +49,42 @@ _CODEPAGE_ENCODINGS = {
     0x0E: 'iso-8859-14', 0x0F: 'iso-8859-15', 0x10: 'iso-8859-16',
 }
 
+def _byte_drop_tables(enc):
+    """Bytes of code page *enc* that decode_string discards, as
+    ``(printable_drop, id_drop)`` deletion sets for ``bytes.translate``.
+
+    Undecodable bytes are dropped too, as ``errors='ignore'`` would."""
+    chars = [bytes([b]).decode(enc, errors='ignore') for b in range(256)]
+    printable_drop = bytes(b for b, ch in enumerate(chars)
+                           if not ch or not ch.isprintable())
+    id_drop = bytes(b for b, ch in enumerate(chars)
+                    if not ((ch.isalnum() or ch == ' ') and ch.isascii()))
+    return printable_drop, id_drop
+
+# Filtering the raw bytes before decoding keeps the per-character work in C.
+_BYTE_DROP = {enc: _byte_drop_tables(enc)
+              for enc in {'latin-1', *_CODEPAGE_ENCODINGS.values()}}
+
+# NationNumeric (Annex 1B §2.101) → ISO/Common code.
+_NATIONS = {
+    0x00: "No information available",
+    0x01: "A", 0x02: "AL", 0x03: "AND", 0x04: "ARM", 0x05: "AZ", 0x06: "B", 0x07: "BG",
+    0x08: "BIH", 0x09: "BY", 0x0A: "CH", 0x0B: "CY", 0x0C: "CZ", 0x0D: "D", 0x0E: "DK",
+    0x0F: "E", 0x10: "EST", 0x11: "F", 0x12: "FIN", 0x13: "FL", 0x14: "FR", 0x15: "UK",
+    0x16: "GE", 0x17: "GR", 0x18: "H", 0x19: "HR", 0x1A: "I", 0x1B: "IRL", 0x1C: "IS",
+    0x1D: "KZ", 0x1E: "L", 0x1F: "LT", 0x20: "LV", 0x21: "M", 0x22: "MC", 0x23: "MD",
+    0x24: "MK", 0x25: "N", 0x26: "NL", 0x27: "P", 0x28: "PL", 0x29: "RO", 0x2A: "RSM",
+    0x2B: "RUS", 0x2C: "S", 0x2D: "SK", 0x2E: "SLO", 0x2F: "TM", 0x30: "TR", 0x31: "UA",
+    0x32: "V", 0x33: "YU", 0x34: "MNE", 0x35: "SRB", 0xFD: "EC", 0xFE: "EUR", 0xFF: "WLD"
+}
+# NationNumeric is one byte: resolve every value (unknown ones included) once.
+_NATION_CODES = tuple(_NATIONS.get(c, f"Unknown({c:02X})") for c in range(0x100))
+
 def get_nation(code):
     """Map numeric nation code to ISO/Common code (Annex 1B)."""
-    nations = {
-        0x00: "No information available",
-        0x01: "A", 0x02: "AL", 0x03: "AND", 0x04: "ARM", 0x05: "AZ", 0x06: "B", 0x07: "BG",
-        0x08: "BIH", 0x09: "BY", 0x0A: "CH", 0x0B: "CY", 0x0C: "CZ", 0x0D: "D", 0x0E: "DK",
-        0x0F: "E", 0x10: "EST", 0x11: "F", 0x12: "FIN", 0x13: "FL", 0x14: "FR", 0x15: "UK",
-        0x16: "GE", 0x17: "GR", 0x18: "H", 0x19: "HR", 0x1A: "I", 0x1B: "IRL", 0x1C: "IS",
-        0x1D: "KZ", 0x1E: "L", 0x1F: "LT", 0x20: "LV", 0x21: "M", 0x22: "MC", 0x23: "MD",
-        0x24: "MK", 0x25: "N", 0x26: "NL", 0x27: "P", 0x28: "PL", 0x29: "RO", 0x2A: "RSM",
-        0x2B: "RUS", 0x2C: "S", 0x2D: "SK", 0x2E: "SLO", 0x2F: "TM", 0x30: "TR", 0x31: "UA",
-        0x32: "V", 0x33: "YU", 0x34: "MNE", 0x35: "SRB", 0xFD: "EC", 0xFE: "EUR", 0xFF: "WLD"
-    }
-    return nations.get(code, f"Unknown({code:02X})")
+    if isinstance(code, int) and 0 <= code <= 0xFF:
+        return _NATION_CODES[code]
+    return _NATIONS.get(code, f"Unknown({code:02X})")
 
 
 # Short ISO/Common nation code → full English country name (Annex 1B).
@@ -100,15 +138,31 @@ def decode_string(data, is_id=False):
         else:
             enc = 'latin-1'
             payload = data
-        
-        decoded = payload.decode(enc, errors='ignore').strip()
+
+        printable_drop, id_drop = _BYTE_DROP[enc]
         if is_id:
-            return "".join(c for c in decoded if (c.isalnum() or c == ' ') and ord(c) < 128).strip().upper()
-        return "".join(c for c in decoded if c.isprintable()).strip()
+            return payload.translate(None, id_drop).decode(enc, errors='ignore').strip().upper()
+        return payload.translate(None, printable_drop).decode(enc, errors='ignore').strip()
     except (UnicodeDecodeError, IndexError, LookupError) as exc:
         _log.debug("String decode failed (len=%d): %s", len(data), exc)
         return ""
 
+def _fmt_date(dt):
+    """Render a date/datetime as ``dd/mm/yyyy`` without a strftime call."""
+    return f"{dt.day:02d}/{dt.month:02d}/{dt.year}"
+
+@lru_cache(maxsize=4096)
+def _utc_date(ts):
+    """``dd/mm/yyyy`` for a TimeReal; memoised as day records repeat dates."""
+    return _fmt_date(datetime.fromtimestamp(ts, tz=timezone.utc))
+
+@lru_cache(maxsize=65536)
+def _iso_utc(ts):
+    """Render a TimeReal as ISO-8601 UTC, as ``datetime.isoformat()`` would.
+
+    Memoised per second: records of one download share many timestamps."""
+    return "%04d-%02d-%02dT%02d:%02d:%02d+00:00" % time.gmtime(ts)[:6]
+
 def decode_date(data, prefer_datef=False):
     """Decode TimeReal (4 bytes) or Datef (4 bytes).
 
@@ -122,20 +176,14 @@ def decode_date(data, prefer_datef=False):
     datef_result = decode_datef(data[:4])
     datef_valid = datef_result != "N/A"
 
-    ts = None
-    ts_valid = False
-    try:
-        ts = struct.unpack(">I", data[:4])[0]
-        if ts != 0 and ts != 0xFFFFFFFF and 0 < ts <= 4102444800:
-            ts_valid = True
-    except (struct.error, ValueError, OverflowError):
-        pass
+    ts = _U32.unpack_from(data)[0]
+    ts_valid = 0 < ts <= 4102444800
 
     if prefer_datef and datef_valid:
         return datef_result
 
     if ts_valid:
-        return datetime.fromtimestamp(ts, tz=timezone.utc).strftime('%d/%m/%Y')
+        return _utc_date(ts)
 
     if datef_valid:
         return datef_result
@@ -146,37 +194,54 @@ def decode_datef(data):
     """Decode Datef (4-byte BCD: YY YY MM DD per Annex 1B §2.26)."""
     if len(data) < 4:
         return "N/A"
-    try:
-        yh = (data[0] >> 4) * 10 + (data[0] & 0x0F)
-        yl = (data[1] >> 4) * 10 + (data[1] & 0x0F)
-        m  = (data[2] >> 4) * 10 + (data[2] & 0x0F)
-        d  = (data[3] >> 4) * 10 + (data[3] & 0x0F)
-        year = yh * 100 + yl
-        if 1900 <= year <= 2100 and 1 <= m <= 12 and 1 <= d <= 31:
-            return f"{d:02d}/{m:02d}/{year}"
-    except (IndexError, ValueError) as exc:
-        _log.debug("Datef BCD decode failed (len=%d): %s", len(data), exc)
+    yh = (data[0] >> 4) * 10 + (data[0] & 0x0F)
+    yl = (data[1] >> 4) * 10 + (data[1] & 0x0F)
+    m  = (data[2] >> 4) * 10 + (data[2] & 0x0F)
+    d  = (data[3] >> 4) * 10 + (data[3] & 0x0F)
+    year = yh * 100 + yl
+    if 1900 <= year <= 2100 and 1 <= m <= 12 and 1 <= d <= 31:
+        return f"{d:02d}/{m:02d}/{year}"
     return "N/A"
 
+# ActivityChangeInfo lookups: 'aa' activity code and minute of day → "HH:MM".
+_ACTIVITY_NAMES = ("REST", "AVAILABLE", "WORK", "DRIVE")
+_HHMM = tuple(f"{m // 60:02d}:{m % 60:02d}" for m in range(1440))
+# One ready-made change record per 'scpaa' flag combination (val >> 11); a
+# decoded change is a copy of its template with the time filled in.
+_CHANGE_TEMPLATES = tuple(
+    {
+        "activity": _ACTIVITY_NAMES[flags & 3],
+        "time": None,
+        "slot": "Second" if flags & 0x10 else "First",
+        "crew": bool(flags & 0x08),
+        "card_inserted": not flags & 0x04,
+    }
+    for flags in range(32)
+)
+
 def decode_activity_val(val):
     """Decode 2-byte ActivityChangeInfo (Annex 1B §2.1): 'scpaattttttttttt' —
     s=slot, c=crew status, p=card status (1 = card not inserted), aa=activity,
     t=minutes since midnight. Returns None for an invalid minute value."""
-    slot = (val >> 15) & 1
-    driving_status = (val >> 14) & 1 # 0=Single, 1=Crew
-    card_not_inserted = (val >> 13) & 1
-    act_code = (val >> 11) & 3
     mins = val & 0x07FF
     if mins > 1439:
         return None
-    acts = {0: "REST", 1: "AVAILABLE", 2: "WORK", 3: "DRIVE"}
-    return {
-        "activity": acts.get(act_code, "UNKNOWN"),
-        "time": f"{mins // 60:02d}:{mins % 60:02d}",
-        "slot": "Second" if slot else "First",
-        "crew": bool(driving_status),
-        "card_inserted": not card_not_inserted,
-    }
+    change = _CHANGE_TEMPLATES[(val >> 11) & 0x1F].copy()
+    change["time"] = _HHMM[mins]
+    return change
+
+def decode_activity_words(words):
+    """Decode a run of ActivityChangeInfo words in one pass, skipping invalid
+    minute values (including the 0xFFFF filler) as decode_activity_val does."""
+    templates, hhmm = _CHANGE_TEMPLATES, _HHMM
+    changes = []
+    for w in words:
+        mins = w & 0x07FF
+        if mins < 1440:
+            change = templates[w >> 11].copy()
+            change["time"] = hhmm[mins]
+            changes.append(change)
+    return changes
 
 def get_cyclic_data(data, start, length, base_offset=4):
     """Read data from a cyclic buffer handling wrap-around."""
@@ -199,16 +264,22 @@ def parse_cyclic_buffer_activities(val, results):
         return
     try:
         buf_size = len(val) - 4
-        newest_ptr = struct.unpack(">H", val[2:4])[0]
+        newest_ptr = _U16.unpack_from(val, 2)[0]
         ptr = 4 + newest_ptr
         seen_dates = set()
+        # The buffer laid out twice: a record that wraps around the end reads
+        # as one contiguous span, so fields are unpacked in place (same bytes
+        # as get_cyclic_data) without per-record slicing and concatenation.
+        ring = val[4:] * 2
         
-        for _ in range(366):
-            header_data = get_cyclic_data(val, ptr, 8)
-            if len(header_data) < 8:
-                break
-            
-            prev_len, rec_len, ts = struct.unpack(">HHI", header_data)
+        # A corrupt prev_len chain can loop back onto a record already read;
+        # everything after that point would only repeat, so stop there.  The
+        # 366-record cap (one year of days) still bounds a non-repeating walk.
+        visited_ptrs = set()
+        while len(visited_ptrs) < 366 and ptr not in visited_ptrs:
+            visited_ptrs.add(ptr)
+            rel = (ptr - 4) % buf_size
+            prev_len, rec_len, ts = _CYC_HDR.unpack_from(ring, rel)
 
             # An invalid header skips this record's body, but the walk continues
             # via prev_len (a bare `continue` here would re-read the same header
@@ -217,29 +288,23 @@ def parse_cyclic_buffer_activities(val, results):
 
             if record_valid:
                 try:
-                    dt = datetime.fromtimestamp(ts, tz=timezone.utc)
-                    date_str = dt.strftime('%d/%m/%Y')
+                    date_str = _utc_date(ts)
                 except (OSError, ValueError, OverflowError):
                     date_str = "Invalid"
 
                 if date_str not in seen_dates:
                     seen_dates.add(date_str)
-                    counters_data = get_cyclic_data(val, ptr+8, 4)
-                    pres, dist = struct.unpack(">HH", counters_data)
+                    pres, dist = _CYC_CNT.unpack_from(ring, (rel + 8) % buf_size)
 
                     daily = {"date": date_str, "odometer_km": int(dist), "changes": []}
 
                     act_len = rec_len - 12
                     if act_len > 0:
-                        act_data = get_cyclic_data(val, ptr+12, act_len)
-                        for i in range(0, len(act_data), 2):
-                            if i + 2 > len(act_data):
-                                break
-                            ev_val = struct.unpack(">H", act_data[i:i+2])[0]
-                            if ev_val != 0xFFFF: # Fix Midnight Bug (allow 0)
-                                activity = decode_activity_val(ev_val)
-                                if activity is not None:
-                                    daily["changes"].append(activity)
+                        act_rel = (rel + 12) % buf_size
+                        # Unpack every ActivityChangeInfo word of the day in one call
+                        n_words = min(act_len, 2 * buf_size - act_rel) // 2
+                        words = struct.unpack_from(f">{n_words}H", ring, act_rel)
+                        daily["changes"] = decode_activity_words(words)
 
                     if daily["changes"]:
                         results["activities"].append(daily)
@@ -4,8 +4,9 @@ import struct
 import typing
 from datetime import datetime, timezone
 
+from core.utils.coverage import fill_run_end
 from core.utils.logger import get_logger
-from core.decoders.common import decode_activity_val, decode_date, decode_string, get_nation
+from core.decoders.common import _fmt_date, _iso_utc, _u24, _utc_date, _U16, _U32, decode_activity_words, decode_date, decode_string, get_nation
 from core.decoders.cert import parse_g1_certificate
 from core.utils.event_codes import describe_calibration_purpose, describe_control_type, describe_event, describe_fault, describe_record_purpose
 
@@ -53,7 +54,7 @@ def _parse_g1_overview_tail(body, off, results):
     try:
         if off + 58 + 2 > len(body):
             return False
-        dl_ts = struct.unpack(">I", body[off:off + 4])[0]
+        dl_ts = _U32.unpack_from(body, off)[0]
         dl_card = _parse_full_card_number(body, off + 4)
         dl_company = decode_string(body[off + 22:off + 58])
         off += 58
@@ -65,12 +66,12 @@ def _parse_g1_overview_tail(body, off, results):
         locks = []
         for _ in range(n_locks):
             rec = body[off:off + 98]
-            lock_in = struct.unpack(">I", rec[0:4])[0]
-            lock_out = struct.unpack(">I", rec[4:8])[0]
+            lock_in = _U32.unpack_from(rec)[0]
+            lock_out = _U32.unpack_from(rec, 4)[0]
             if 946684800 <= lock_in <= 4102444800:
                 locks.append({
-                    "lock_in_time": datetime.fromtimestamp(lock_in, tz=timezone.utc).isoformat(),
-                    "lock_out_time": datetime.fromtimestamp(lock_out, tz=timezone.utc).isoformat()
+                    "lock_in_time": _iso_utc(lock_in),
+                    "lock_out_time": _iso_utc(lock_out)
                     if 946684800 <= lock_out <= 4102444800 else None,
                     "company_name": decode_string(rec[8:44]),
                     "company_address": decode_string(rec[44:80]),
@@ -85,18 +86,18 @@ def _parse_g1_overview_tail(body, off, results):
         controls = []
         for _ in range(n_ctrl):
             rec = body[off:off + 31]
-            ctrl_ts = struct.unpack(">I", rec[1:5])[0]
+            ctrl_ts = _U32.unpack_from(rec, 1)[0]
             if 946684800 <= ctrl_ts <= 4102444800:
-                begin_ts = struct.unpack(">I", rec[23:27])[0]
-                end_ts = struct.unpack(">I", rec[27:31])[0]
+                begin_ts = _U32.unpack_from(rec, 23)[0]
+                end_ts = _U32.unpack_from(rec, 27)[0]
                 controls.append({
                     "control_type": rec[0],
                     "control_type_label": describe_control_type(rec[0]),
-                    "control_time": datetime.fromtimestamp(ctrl_ts, tz=timezone.utc).isoformat(),
+                    "control_time": _iso_utc(ctrl_ts),
                     "control_card": _parse_full_card_number(rec, 5),
-                    "download_period_begin": datetime.fromtimestamp(begin_ts, tz=timezone.utc).isoformat()
+                    "download_period_begin": _iso_utc(begin_ts)
                     if 946684800 <= begin_ts <= 4102444800 else None,
-                    "download_period_end": datetime.fromtimestamp(end_ts, tz=timezone.utc).isoformat()
+                    "download_period_end": _iso_utc(end_ts)
                     if 946684800 <= end_ts <= 4102444800 else None,
                 })
             off += 31
@@ -108,7 +109,7 @@ def _parse_g1_overview_tail(body, off, results):
 
         if 946684800 <= dl_ts <= 4102444800:
             results.setdefault("vu_overview", {}).setdefault("last_download", {
-                "time": datetime.fromtimestamp(dl_ts, tz=timezone.utc).isoformat(),
+                "time": _iso_utc(dl_ts),
                 "card": dl_card,
                 "company": dl_company,
             })
@@ -206,16 +207,16 @@ def parse_g1_vu_overview(val, results):
                     results["vehicle"]["plate"] = plate
                 fixed_fields_parsed.add("vehicle_registration")
 
-                ts = struct.unpack(">I", body[420:424])[0]
+                ts = _U32.unpack_from(body, 420)[0]
                 if 946684800 <= ts <= 4102444800:
-                    results["metadata"]["current_datetime"] = datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+                    results["metadata"]["current_datetime"] = _iso_utc(ts)
                     fixed_fields_parsed.add("current_datetime")
 
-                min_dl = struct.unpack(">I", body[424:428])[0]
-                max_dl = struct.unpack(">I", body[428:432])[0]
+                min_dl = _U32.unpack_from(body, 424)[0]
+                max_dl = _U32.unpack_from(body, 428)[0]
                 results.setdefault("vu_overview", {})["downloadable_period"] = {
-                    "min": datetime.fromtimestamp(min_dl, tz=timezone.utc).isoformat() if 946684800 <= min_dl <= 4102444800 else "N/A",
-                    "max": datetime.fromtimestamp(max_dl, tz=timezone.utc).isoformat() if 946684800 <= max_dl <= 4102444800 else "N/A",
+                    "min": _iso_utc(min_dl) if 946684800 <= min_dl <= 4102444800 else "N/A",
+                    "max": _iso_utc(max_dl) if 946684800 <= max_dl <= 4102444800 else "N/A",
                 }
                 fixed_fields_parsed.add("downloadable_period")
 
@@ -296,29 +297,16 @@ def parse_vu_download_messages(raw_data, results):
       0x06 = Card download
     """
     try:
-        pos = 0
         found_messages = []
-        while pos < len(raw_data) - 1:
-            if raw_data[pos] == 0x76:
-                trep = raw_data[pos + 1] if pos + 1 < len(raw_data) else 0
-                if trep in (0x01, 0x02, 0x03, 0x04, 0x05, 0x06):
-                    found_messages.append((pos, trep))
-            pos += 1
+        pos = raw_data.find(b"\x76")
+        while 0 <= pos < len(raw_data) - 1:
+            trep = raw_data[pos + 1]
+            if trep in _TREP_PARSERS:
+                found_messages.append((pos, trep))
+            pos = raw_data.find(b"\x76", pos + 1)
 
         for msg_offset, trep in found_messages:
-            data = raw_data[msg_offset + 2:]  # Skip SID+TREP
-            if trep == 0x01:
-                parse_g1_vu_overview(data, results)
-            elif trep == 0x02:
-                _parse_trep_02_activities(data, results)
-            elif trep == 0x03:
-                _parse_trep_03_events_faults(data, results)
-            elif trep == 0x04:
-                _parse_trep_04_speed(data, results)
-            elif trep == 0x05:
-                _parse_trep_05_technical(data, results)
-            elif trep == 0x06:
-                _parse_trep_06_card_download(data, results)
+            _TREP_PARSERS[trep](raw_data[msg_offset + 2:], results)  # Skip SID+TREP
     except (struct.error, IndexError, ValueError) as exc:
         _log.debug("VU download messages parse failed: %s", exc)
 
@@ -337,8 +325,8 @@ def _parse_trep_02_activities(data, results):
         # followed by structured driver records and 0x7622/0x7632 daily records
         is_g2 = False
         if len(data) >= 4:
-            lead = struct.unpack(">H", data[:2])[0]
-            lead2 = struct.unpack(">H", data[1:3])[0]
+            lead = _U16.unpack_from(data)[0]
+            lead2 = _U16.unpack_from(data, 1)[0]
             if lead == 0x6864 or lead2 == 0x6864:
                 is_g2 = True
         if not is_g2:
@@ -371,7 +359,7 @@ def _parse_trep_02_activities(data, results):
                         len(results.get("inserted_drivers") or []))
 
         # Validate binary header timestamp
-        header_ts = struct.unpack(">I", data[0:4])[0]
+        header_ts = _U32.unpack_from(data)[0]
         if not (946684800 <= header_ts <= 4102444800):
             _log.debug("TREP 02: invalid header timestamp 0x%08X, aborting", header_ts)
             return
@@ -427,7 +415,9 @@ def _parse_trep_02_activities(data, results):
         # Find daily activity change records within the TREP 02 payload.
         # Prioritize boundary-aligned records; fall back to timestamp-scan heuristic.
         activity_list = results.setdefault("activities", [])
-        activity_map = {0: "rest", 1: "available", 2: "work", 3: "drive", 4: "break_rest"}
+        # Activity code → output label (break/rest folds into REST, unknown
+        # codes into WORK).
+        activity_map = {0: "REST", 1: "AVAILABLE", 2: "WORK", 3: "DRIVE", 4: "REST"}
         header_dt = datetime.fromtimestamp(header_ts, tz=timezone.utc)
         scan = card_start
 
@@ -438,14 +428,14 @@ def _parse_trep_02_activities(data, results):
 
         daily_count = 0
         while scan + 10 <= len(data):
-            ts = struct.unpack(">I", data[scan:scan+4])[0]
+            ts = _U32.unpack_from(data, scan)[0]
             if not (946684800 <= ts <= 4102444800):
                 scan += 1
                 continue
 
-            odo = int.from_bytes(data[scan+4:scan+7], 'big')
+            odo = _u24(data, scan + 4)
             card_inserted = data[scan+7]
-            no_changes = struct.unpack(">H", data[scan+8:scan+10])[0]
+            no_changes = _U16.unpack_from(data, scan + 8)[0]
 
             if no_changes == 0 or no_changes > 1440:
                 scan += 1
@@ -457,11 +447,11 @@ def _parse_trep_02_activities(data, results):
             for _ in range(max_changes):
                 if pair_pos + 4 > len(data):
                     break
-                slot = struct.unpack(">H", data[pair_pos:pair_pos+2])[0]
-                act = struct.unpack(">H", data[pair_pos+2:pair_pos+4])[0]
+                slot = _U16.unpack_from(data, pair_pos)[0]
+                act = _U16.unpack_from(data, pair_pos + 2)[0]
                 pair_pos += 4
                 if slot <= 1440 and 0 <= act <= 10:
-                    changes_list.append({"minute": slot, "activity": activity_map.get(act, f"type_{act}")})
+                    changes_list.append((slot, act))
                 elif slot == 0 and act == 0:
                     break
                 else:
@@ -469,16 +459,14 @@ def _parse_trep_02_activities(data, results):
                     break
 
             if changes_list:
-                type_map = {"drive": "DRIVE", "rest": "REST", "work": "WORK",
-                            "available": "AVAILABLE", "break_rest": "REST"}
                 changes = [
-                    {"activity": type_map.get(c.get("activity", "work"), "WORK"),
-                     "time": f"{c['minute'] // 60:02d}:{c['minute'] % 60:02d}"}
-                    for c in changes_list[:50]
+                    {"activity": activity_map.get(act, "WORK"),
+                     "time": f"{minute // 60:02d}:{minute % 60:02d}"}
+                    for minute, act in changes_list[:50]
                 ]
                 activity_list.append({
                     "timestamp": header_dt.isoformat(),
-                    "date": header_dt.strftime("%d/%m/%Y"),
+                    "date": _fmt_date(header_dt),
                     "odometer_midnight": odo,
                     "card_inserted": bool(card_inserted),
                     "changes_count": no_changes,
@@ -535,47 +523,43 @@ def _parse_trep_02_g1_structured(data, results):
     try:
         if len(data) < 11:
             return False
-        date_ts = struct.unpack(">I", data[0:4])[0]
+        date_ts = _U32.unpack_from(data)[0]
         if not (946684800 <= date_ts <= 4102444800):
             return False
-        odo_midnight = int.from_bytes(data[4:7], 'big')
+        odo_midnight = _u24(data, 4)
         pos = 7
 
-        n_iw = struct.unpack(">H", data[pos:pos + 2])[0]
+        n_iw = _U16.unpack_from(data, pos)[0]
         pos += 2
         if n_iw > 100 or pos + n_iw * 129 + 2 > len(data):
             return False
         iw_records = []
         for _ in range(n_iw):
             rec = data[pos:pos + 129]
-            ins_ts = struct.unpack(">I", rec[94:98])[0]
-            wdr_ts = struct.unpack(">I", rec[102:106])[0]
+            ins_ts = _U32.unpack_from(rec, 94)[0]
+            wdr_ts = _U32.unpack_from(rec, 102)[0]
             iw_records.append({
                 "holder_surname": decode_string(rec[0:36]),
                 "holder_first_names": decode_string(rec[36:72]),
                 "card": _parse_full_card_number(rec, 72),
                 "card_expiry": decode_date(rec[90:94]),
-                "insertion_time": datetime.fromtimestamp(ins_ts, tz=timezone.utc).isoformat()
+                "insertion_time": _iso_utc(ins_ts)
                 if 946684800 <= ins_ts <= 4102444800 else None,
-                "odometer_insertion_km": int.from_bytes(rec[98:101], 'big'),
+                "odometer_insertion_km": _u24(rec, 98),
                 "card_slot": rec[101],
-                "withdrawal_time": datetime.fromtimestamp(wdr_ts, tz=timezone.utc).isoformat()
+                "withdrawal_time": _iso_utc(wdr_ts)
                 if 946684800 <= wdr_ts <= 4102444800 else None,
-                "odometer_withdrawal_km": int.from_bytes(rec[106:109], 'big'),
+                "odometer_withdrawal_km": _u24(rec, 106),
                 "manual_input": bool(rec[128]),
             })
             pos += 129
 
-        n_ch = struct.unpack(">H", data[pos:pos + 2])[0]
+        n_ch = _U16.unpack_from(data, pos)[0]
         pos += 2
         if n_ch > 5000 or pos + n_ch * 2 + 1 > len(data):
             return False
-        changes = []
-        for i in range(n_ch):
-            v = struct.unpack(">H", data[pos + i * 2:pos + i * 2 + 2])[0]
-            activity = decode_activity_val(v)
-            if activity is not None:
-                changes.append(activity)
+        # Unpack every ActivityChangeInfo word of the day in one call
+        changes = decode_activity_words(struct.unpack_from(f">{n_ch}H", data, pos))
         pos += n_ch * 2
 
         n_pl = data[pos]
@@ -586,20 +570,20 @@ def _parse_trep_02_g1_structured(data, results):
         places = []
         for _ in range(n_pl):
             rec = data[pos:pos + 28]
-            ts = struct.unpack(">I", rec[18:22])[0]
+            ts = _U32.unpack_from(rec, 18)[0]
             if 946684800 <= ts <= 4102444800 and rec[22] in entry_names:
                 places.append({
-                    "timestamp": datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(),
+                    "timestamp": _iso_utc(ts),
                     "entry_type": entry_names[rec[22]],
                     "type_code": rec[22],
                     "nation": get_nation(rec[23]),
                     "region": rec[24],
-                    "odometer_km": int.from_bytes(rec[25:28], 'big'),
+                    "odometer_km": _u24(rec, 25),
                     "card_driver": _parse_full_card_number(rec, 0),
                 })
             pos += 28
 
-        n_sc = struct.unpack(">H", data[pos:pos + 2])[0]
+        n_sc = _U16.unpack_from(data, pos)[0]
         pos += 2
         if n_sc > 1000 or pos + n_sc * 5 > len(data):
             return False
@@ -607,11 +591,11 @@ def _parse_trep_02_g1_structured(data, results):
         conditions = []
         for _ in range(n_sc):
             rec = data[pos:pos + 5]
-            ts = struct.unpack(">I", rec[0:4])[0]
+            ts = _U32.unpack_from(rec)[0]
             # Valid SpecificConditionType codes are 0x01-0x04 (Annex 1C §2.154).
             if 946684800 <= ts <= 4102444800 and rec[4] in (0x01, 0x02, 0x03, 0x04):
                 conditions.append({
-                    "timestamp": datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(),
+                    "timestamp": _iso_utc(ts),
                     "condition": specific_condition_label(rec[4]),
                     "type_code": rec[4],
                 })
@@ -637,7 +621,7 @@ def _parse_trep_02_g1_structured(data, results):
                 seen.add(key)
                 existing_iw.append(iw)
 
-        date_str = datetime.fromtimestamp(date_ts, tz=timezone.utc).strftime('%d/%m/%Y')
+        date_str = _utc_date(date_ts)
         if changes:
             activities = results.setdefault("activities", [])
             if not any(a.get("date") == date_str and a.get("source") == "vu_trep02"
@@ -692,16 +676,16 @@ def _parse_vu_fault_record(data, offset):
     rec = data[offset:offset + 82]
     fault_type = rec[0]
     fault_purpose = rec[1]
-    begin_ts = struct.unpack(">I", rec[2:6])[0]
-    end_ts = struct.unpack(">I", rec[6:10])[0]
+    begin_ts = _U32.unpack_from(rec, 2)[0]
+    end_ts = _U32.unpack_from(rec, 6)[0]
     if begin_ts < 946684800 or begin_ts > 4102444800:
         return None
     return {
         "description": describe_fault(fault_type),
         "fault_type": fault_type,
         "fault_purpose": fault_purpose,
-        "begin_time": datetime.fromtimestamp(begin_ts, tz=timezone.utc).isoformat(),
-        "end_time": datetime.fromtimestamp(end_ts, tz=timezone.utc).isoformat() if 946684800 <= end_ts <= 4102444800 else "N/A",
+        "begin_time": _iso_utc(begin_ts),
+        "end_time": _iso_utc(end_ts) if 946684800 <= end_ts <= 4102444800 else "N/A",
         "card_driver_begin": _parse_full_card_number(rec, 10),
         "card_codriver_begin": _parse_full_card_number(rec, 28),
         "card_driver_end": _parse_full_card_number(rec, 46),
@@ -715,16 +699,16 @@ def _parse_vu_event_record(data, offset):
     rec = data[offset:offset + 83]
     evt_type = rec[0]
     evt_purpose = rec[1]
-    begin_ts = struct.unpack(">I", rec[2:6])[0]
-    end_ts = struct.unpack(">I", rec[6:10])[0]
+    begin_ts = _U32.unpack_from(rec, 2)[0]
+    end_ts = _U32.unpack_from(rec, 6)[0]
     if begin_ts < 946684800 or begin_ts > 4102444800:
         return None
     return {
         "description": describe_event(evt_type),
         "event_type": evt_type,
         "event_purpose": evt_purpose,
-        "begin_time": datetime.fromtimestamp(begin_ts, tz=timezone.utc).isoformat(),
-        "end_time": datetime.fromtimestamp(end_ts, tz=timezone.utc).isoformat() if 946684800 <= end_ts <= 4102444800 else "N/A",
+        "begin_time": _iso_utc(begin_ts),
+        "end_time": _iso_utc(end_ts) if 946684800 <= end_ts <= 4102444800 else "N/A",
         "card_driver_begin": _parse_full_card_number(rec, 10),
         "card_codriver_begin": _parse_full_card_number(rec, 28),
         "card_driver_end": _parse_full_card_number(rec, 46),
@@ -790,8 +774,8 @@ def _parse_trep_03_structured(data, results):
 
         if pos + 9 > len(data):
             return False
-        osc_last = struct.unpack(">I", data[pos:pos + 4])[0]
-        osc_first = struct.unpack(">I", data[pos + 4:pos + 8])[0]
+        osc_last = _U32.unpack_from(data, pos)[0]
+        osc_first = _U32.unpack_from(data, pos + 4)[0]
         osc_count = data[pos + 8]
         pos += 9
 
@@ -802,8 +786,8 @@ def _parse_trep_03_structured(data, results):
         overspeed = []
         for _ in range(n_overs):
             rec = data[pos:pos + 31]
-            begin_ts = struct.unpack(">I", rec[2:6])[0]
-            end_ts = struct.unpack(">I", rec[6:10])[0]
+            begin_ts = _U32.unpack_from(rec, 2)[0]
+            end_ts = _U32.unpack_from(rec, 6)[0]
             if 946684800 <= begin_ts <= 4102444800:
                 overspeed.append({
                     "description": describe_event(rec[0]),
@@ -811,8 +795,8 @@ def _parse_trep_03_structured(data, results):
                     "event_type_label": describe_event(rec[0]),
                     "record_purpose": rec[1],
                     "record_purpose_label": describe_record_purpose(rec[1]),
-                    "begin": datetime.fromtimestamp(begin_ts, tz=timezone.utc).isoformat(),
-                    "end": datetime.fromtimestamp(end_ts, tz=timezone.utc).isoformat()
+                    "begin": _iso_utc(begin_ts),
+                    "end": _iso_utc(end_ts)
                     if 946684800 <= end_ts <= 4102444800 else "N/A",
                     "max_speed_kmh": rec[10],
                     "average_speed_kmh": rec[11],
@@ -828,13 +812,13 @@ def _parse_trep_03_structured(data, results):
         adjustments = []
         for _ in range(n_adj):
             rec = data[pos:pos + 98]
-            old_ts = struct.unpack(">I", rec[0:4])[0]
-            new_ts = struct.unpack(">I", rec[4:8])[0]
+            old_ts = _U32.unpack_from(rec)[0]
+            new_ts = _U32.unpack_from(rec, 4)[0]
             if 946684800 <= new_ts <= 4102444800:
                 adjustments.append({
-                    "old_time": datetime.fromtimestamp(old_ts, tz=timezone.utc).isoformat()
+                    "old_time": _iso_utc(old_ts)
                     if 946684800 <= old_ts <= 4102444800 else "N/A",
-                    "new_time": datetime.fromtimestamp(new_ts, tz=timezone.utc).isoformat(),
+                    "new_time": _iso_utc(new_ts),
                     "workshop_name": decode_string(rec[8:44]),
                     "workshop_address": decode_string(rec[44:80]),
                     "workshop_card": _parse_full_card_number(rec, 80),
@@ -873,9 +857,9 @@ def _parse_trep_03_structured(data, results):
 
         if 946684800 <= osc_last <= 4102444800 or 946684800 <= osc_first <= 4102444800:
             ctrl = {
-                "last_control_time": datetime.fromtimestamp(osc_last, tz=timezone.utc).isoformat()
+                "last_control_time": _iso_utc(osc_last)
                 if 946684800 <= osc_last <= 4102444800 else "N/A",
-                "first_overspeed_since": datetime.fromtimestamp(osc_first, tz=timezone.utc).isoformat()
+                "first_overspeed_since": _iso_utc(osc_first)
                 if 946684800 <= osc_first <= 4102444800 else "N/A",
                 "number_of_overspeed": osc_count,
             }
@@ -923,7 +907,7 @@ def _parse_trep_03_events_faults_heuristic(data, results):
                 name_match = re.search(rb'[\x01]([A-Z][A-Z ]{10,35})\s{2,}([\x01][A-Z][A-Z ]{10,35})', name_region)
                 if name_match:
                     surname = name_match.group(1).decode('latin-1').strip()
-                    firstname = name_match.group(2).decode('latin-1').replace('\x01', '').strip()
+                    firstname = name_match.group(2).translate(None, b'\x01').decode('latin-1').strip()
 
         if surname or firstname or card_num:
             drivers = results.setdefault("inserted_drivers", [])
@@ -969,14 +953,14 @@ def _parse_trep_03_events_faults_heuristic(data, results):
         while pos + 9 < len(data) and len(results.get("events", [])) < 200:
             ev_type = data[pos]
             if 0x01 <= ev_type <= 0x0C:
-                ts1 = struct.unpack(">I", data[pos + 1:pos + 5])[0]
-                ts2 = struct.unpack(">I", data[pos + 5:pos + 9])[0]
+                ts1 = _U32.unpack_from(data, pos + 1)[0]
+                ts2 = _U32.unpack_from(data, pos + 5)[0]
                 if 946684800 <= ts1 <= 4102444800 and 946684800 <= ts2 <= 4102444800:
                     tskey = (ts1, ev_type)
                     if tskey not in seen_timestamps:
                         seen_timestamps.add(tskey)
-                        dt1 = datetime.fromtimestamp(ts1, tz=timezone.utc).isoformat()
-                        dt2 = datetime.fromtimestamp(ts2, tz=timezone.utc).isoformat()
+                        dt1 = _iso_utc(ts1)
+                        dt2 = _iso_utc(ts2)
                         results.setdefault("events", []).append({
                             "description": describe_event(ev_type),
                             "type_code": ev_type,
@@ -990,6 +974,9 @@ def _parse_trep_03_events_faults_heuristic(data, results):
     except (struct.error, IndexError, ValueError) as exc:
         _log.debug("TREP 03 heuristic parse failed: %s", exc)
 
+# Detailed speed sample byte → km/h, with 0xFF (not available) as None.
+_SPEED_OR_NONE = tuple(None if b == 0xFF else b for b in range(256))
+
 def _parse_trep_04_speed(data, results):
     """Parse TREP 04 (VuDetailedSpeedData) — Annex 1B §2.2.6.4:
     noOfSpeedBlocks(2) + N × VuDetailedSpeedBlock(64), each block =
@@ -1001,26 +988,28 @@ def _parse_trep_04_speed(data, results):
     try:
         if len(data) < 2 + 64:
             return
-        n_blocks = struct.unpack(">H", data[0:2])[0]
+        n_blocks = _U16.unpack_from(data)[0]
         if n_blocks == 0 or 2 + n_blocks * 64 > len(data):
             return
-        first_ts = struct.unpack(">I", data[2:6])[0]
+        first_ts = _U32.unpack_from(data, 2)[0]
         if not (946684800 <= first_ts <= 4102444800):
             return  # false-positive message marker
 
         speed_blocks = results.setdefault("speed_blocks", [])
         seen = {b.get("timestamp") for b in speed_blocks if isinstance(b, dict)}
 
+        # Run state is plain ints plus byte buffers: valid speeds are kept as
+        # raw bytes (0xFF removed in C) and only listed when a run is flushed.
         run_start_ts = None
         run_minutes = 0
-        run_speeds = []
+        run_speeds = bytearray()
         run_chart_speeds = []
         prev_ts = None
 
         def _flush():
             if run_start_ts is None or not run_speeds:
                 return
-            dt = datetime.fromtimestamp(run_start_ts, tz=timezone.utc).isoformat()
+            dt = _iso_utc(run_start_ts)
             if dt in seen:
                 return
             seen.add(dt)
@@ -1029,28 +1018,26 @@ def _parse_trep_04_speed(data, results):
                 "minutes": run_minutes,
                 "average_speed_kmh": round(sum(run_speeds) / len(run_speeds), 1),
                 "max_speed_kmh": max(run_speeds),
-                "speeds_sample": run_speeds[:60],
+                "speeds_sample": list(run_speeds[:60]),
                 # Retain every second, including unavailable values, for the
                 # GUI's day chart without expanding the regular data table.
                 "_chart_speeds_kmh": run_chart_speeds,
             })
 
-        for i in range(n_blocks):
-            blk = data[2 + i * 64:2 + (i + 1) * 64]
-            ts = struct.unpack(">I", blk[0:4])[0]
+        for off in range(2, 2 + n_blocks * 64, 64):
+            ts = _U32.unpack_from(data, off)[0]
             if not (946684800 <= ts <= 4102444800):
                 continue
-            raw_speeds = [None if s == 0xFF else s for s in blk[4:64]]
-            speeds = [s for s in raw_speeds if s is not None]
+            samples = data[off + 4:off + 64]
             if prev_ts is None or ts - prev_ts != 60:
                 _flush()
                 run_start_ts = ts
                 run_minutes = 0
-                run_speeds = []
+                run_speeds = bytearray()
                 run_chart_speeds = []
             run_minutes += 1
-            run_speeds.extend(speeds)
-            run_chart_speeds.extend(raw_speeds)
+            run_speeds += samples.replace(b"\xff", b"")
+            run_chart_speeds.extend(map(_SPEED_OR_NONE.__getitem__, samples))
             prev_ts = ts
         _flush()
     except (struct.error, IndexError, ValueError) as exc:
@@ -1093,15 +1080,15 @@ def _parse_trep_05_technical(data, results):
             nation = get_nation(chunk[112])
             # VehicleRegistrationNumber = codePage(1) + 13 chars
             plate = decode_string(chunk[114:127], is_id=True)
-            w_const = struct.unpack(">H", chunk[127:129])[0]
-            k_const = struct.unpack(">H", chunk[129:131])[0]
-            l_const = struct.unpack(">H", chunk[131:133])[0]
+            w_const = _U16.unpack_from(chunk, 127)[0]
+            k_const = _U16.unpack_from(chunk, 129)[0]
+            l_const = _U16.unpack_from(chunk, 131)[0]
             tyre = decode_string(chunk[133:148])
             speed = chunk[148]
-            old_odo = int.from_bytes(chunk[149:152], 'big')
+            old_odo = _u24(chunk, 149)
             if old_odo == 0xFFFFFF:
                 old_odo = None
-            new_odo = int.from_bytes(chunk[152:155], 'big')
+            new_odo = _u24(chunk, 152)
             if new_odo == 0xFFFFFF:
                 new_odo = None
             old_time = decode_date(chunk[155:159])
@@ -1219,12 +1206,12 @@ def _parse_trep_05_technical(data, results):
             if plate and len(plate) < 2:
                 continue
 
-            w = struct.unpack(">H", fixed[15:17])[0]
-            k = struct.unpack(">H", fixed[17:19])[0]
-            l_val = struct.unpack(">H", fixed[19:21])[0]
+            w = _U16.unpack_from(fixed, 15)[0]
+            k = _U16.unpack_from(fixed, 17)[0]
+            l_val = _U16.unpack_from(fixed, 19)[0]
             tyre = decode_string(fixed[21:36])
             speed_limit = fixed[36]
-            odo = int.from_bytes(fixed[37:40], 'big')
+            odo = _u24(fixed, 37)
             if odo == 0xFFFFFF:
                 odo = None
 
@@ -1234,9 +1221,9 @@ def _parse_trep_05_technical(data, results):
             for shift in [4, 6, 7, 8]:
                 if vin_pos >= shift + 4:
                     ts_raw = data[vin_pos-shift-4:vin_pos-shift]
-                    ts = struct.unpack(">I", ts_raw)[0]
+                    ts = _U32.unpack(ts_raw)[0]
                     if 946684800 <= ts <= 4102444800:
-                        dt_str = datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+                        dt_str = _iso_utc(ts)
                         break
 
             # Find workshop name backwards from VIN
@@ -1328,9 +1315,9 @@ def _parse_trep_06_card_download(data, results):
         timestamps = []
         pos = 0
         while pos + 4 <= len(data):
-            ts = struct.unpack(">I", data[pos:pos+4])[0]
+            ts = _U32.unpack_from(data, pos)[0]
             if 946684800 <= ts <= 4102444800:
-                timestamps.append(datetime.fromtimestamp(ts, tz=timezone.utc).isoformat())
+                timestamps.append(_iso_utc(ts))
             pos += 1
 
         if timestamps or card_nums:
@@ -1343,7 +1330,7 @@ def _parse_trep_06_card_download(data, results):
         card_match = re.search(rb'([A-Z][A-Z ]{8,35})\s{2,}([\x01][A-Z][A-Z ]{8,35})', data)
         if card_match:
             s = card_match.group(1).decode('latin-1').strip()
-            f = card_match.group(2).decode('latin-1').replace('\x01','').strip()
+            f = card_match.group(2).translate(None, b'\x01').decode('latin-1').strip()
             if s and f:
                 drivers = results.setdefault("inserted_drivers", [])
                 dk = f"{s}|{f}|card_dl"
@@ -1361,6 +1348,17 @@ def _parse_trep_06_card_download(data, results):
         _log.debug("TREP 06 card download parse failed: %s", exc)
 
 
+# TREP → message parser, looked up once per SID 0x76 occurrence.
+_TREP_PARSERS = {
+    0x01: parse_g1_vu_overview,
+    0x02: _parse_trep_02_activities,
+    0x03: _parse_trep_03_events_faults,
+    0x04: _parse_trep_04_speed,
+    0x05: _parse_trep_05_technical,
+    0x06: _parse_trep_06_card_download,
+}
+
+
 def _decode_embedded_card_image(data, results):
     """Structurally decode a card-EF image embedded in a G1 VU CardDownload.
 
@@ -1533,17 +1531,15 @@ def _parse_sensor_download(body, results):
 def _decode_sensor_block(body, results, offset=0):
     """Decode one copy of the sensor data starting at *offset*."""
     n = len(body)
-    pos = offset + 17  # skip TOC header
-    while pos < n and body[pos] == 0xFF:
-        pos += 1
+    pos = fill_run_end(body, offset + 17, n)  # skip TOC header and FF fill
 
     if pos + _SENSOR_ID_SIZE > n:
         return
 
     block = body[pos:pos + _SENSOR_ID_SIZE]
 
-    ts_first = struct.unpack(">I", block[0:4])[0]
-    ts_last = struct.unpack(">I", block[4:8])[0]
+    ts_first = _U32.unpack_from(block)[0]
+    ts_last = _U32.unpack_from(block, 4)[0]
 
     serial_bytes = block[98:116]
     approval_prefix = serial_bytes[0]
@@ -1564,9 +1560,9 @@ def _decode_sensor_block(body, results, offset=0):
         "approval_prefix": f"0x{approval_prefix:02X}",
         "first_date": datetime.fromtimestamp(ts_first, tz=timezone.utc).strftime("%Y-%m-%d") if 946684800 <= ts_first <= 4102444800 else "N/A",
         "last_date": datetime.fromtimestamp(ts_last, tz=timezone.utc).strftime("%Y-%m-%d") if 946684800 <= ts_last <= 4102444800 else "N/A",
-        "param_speed_max_kmh": struct.unpack(">H", block[10:12])[0],
-        "param_speed_avg_kmh": struct.unpack(">H", block[12:14])[0],
-        "param_distance_km": struct.unpack(">H", block[14:16])[0],
+        "param_speed_max_kmh": _U16.unpack_from(block, 10)[0],
+        "param_speed_avg_kmh": _U16.unpack_from(block, 12)[0],
+        "param_distance_km": _U16.unpack_from(block, 14)[0],
     }
     # Gate on plausibility: a false 0x76 0x11 marker inside another section's
     # payload would otherwise publish garbage (e.g. 25284 km/h, non-printable
@@ -1606,19 +1602,18 @@ def _extract_sensor_daily_records(body, start, copy_start, copy_end):
     pos = start
     end = min(copy_end, len(body))
     while pos + 10 <= end:
-        while pos + 10 <= end and body[pos] == 0xFF:
-            pos += 1
+        pos = fill_run_end(body, pos, end)
         if pos + 10 > end:
             break
-        ts_midnight = struct.unpack(">I", body[pos:pos + 4])[0]
-        ts_event = struct.unpack(">I", body[pos + 4:pos + 8])[0]
+        ts_midnight = _U32.unpack_from(body, pos)[0]
+        ts_event = _U32.unpack_from(body, pos + 4)[0]
         if not (946684800 <= ts_midnight <= 4102444800):
             pos += 1
             continue
         if ts_midnight % 86400 != 0:
             pos += 4
             continue
-        count = struct.unpack(">H", body[pos + 8:pos + 10])[0]
+        count = _U16.unpack_from(body, pos + 8)[0]
         if count > 1500:  # max 25 hours at 1/min
             pos += 8
             continue
@@ -1632,7 +1627,7 @@ def _extract_sensor_daily_records(body, start, copy_start, copy_end):
             seen.add(date_str)
             records.append({
                 "date": date_str,
-                "first_event": datetime.fromtimestamp(ts_event, tz=timezone.utc).isoformat(),
+                "first_event": _iso_utc(ts_event),
                 "speed_samples": count,
                 "speed_min": min(valid) if valid else None,
                 "speed_max": max(valid) if valid else None,
@@ -7,12 +7,14 @@ Strategy:
 4. Any remaining bytes: classify as Padding (all 0x00/0xFF/0x55) or mark as Unknown
 """
 
+import re
 import struct
 import inspect
 import heapq
 from typing import Dict, Any, List, Optional, Tuple
 from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
 
 from core.utils.constants import MAX_TLV_LENGTH, MAX_RECURSION_DEPTH
 from core.registry.registry import DecoderRegistry
@@ -21,6 +23,56 @@ from core.utils.logger import get_logger
 
 _log = get_logger(__name__)
 
+# Offsets where the walk could make progress in STAP mode: a header whose
+# data-type byte is <= 0x0F (see _try_read_stap), or a padding pair that
+# _skip_padding would consume.  Bytes before the next match are unparseable.
+_STAP_CANDIDATE = re.compile(rb'..[\x00-\x0f]|\x00\x00|\xff\xff|\x55\x55', re.S)
+# Same for BER mode: any byte but 0x00/0xFF can open a BER header (see
+# read_ber_tlv_header); a 0x00/0xFF pair can open a padding run.
+_BER_CANDIDATE = re.compile(rb'[^\x00\xff]|\x00\x00|\xff\xff')
+
+# STAP T2L2 record header: tag (2), data type (1), length (2).
+_STAP_HDR = struct.Struct(">HBH")
+
+
+@lru_cache(maxsize=4096)
+def _tag_labels(tag: int, name: Optional[str]) -> Tuple[str, str, str]:
+    """``(tag_name, raw_tags key, tag_id)`` for a tag, shared by every occurrence.
+
+    *name* is the registered decoder name, or None for an unregistered tag.
+    """
+    tag_name = name if name is not None else f"BER_{tag:04X}"
+    return tag_name, f"{tag:04X}_{tag_name}", f"0x{tag:04X}"
+
+
+@lru_cache(maxsize=None)
+def _required_arity(decoder_fn) -> int:
+    """Required positional parameters of a decoder (2, or 3 when it takes the tag)."""
+    sig = inspect.signature(decoder_fn)
+    return len([p for p in sig.parameters.values()
+                if p.default is inspect.Parameter.empty
+                and p.kind not in (p.VAR_POSITIONAL, p.VAR_KEYWORD)])
+
+
+# Gen2v2-only card EFs: seen with a Gen2 dtype, they mark a G2.2 card.
+_G22_CARD_TAGS = frozenset({0x0525, 0x0526, 0x0527, 0x0528, 0x0529, 0x052A})
+
+# STAP data-type byte → "0xNN" label.
+_DTYPE_LABELS = tuple(f"0x{d:02X}" for d in range(256))
+
+
+def _hex_preview(buf, start: int = 0, end: Optional[int] = None) -> str:
+    """Hex of ``buf[start:end]`` capped at 128 bytes, with ``...`` when cut.
+
+    Reads through a memoryview so neither the full range nor the capped
+    prefix is copied before hexing.
+    """
+    if end is None:
+        end = len(buf)
+    if end - start <= 128:
+        return memoryview(buf)[start:end].hex()
+    return f"{memoryview(buf)[start:start + 128].hex()}..."
+
 
 class CoverageTracker:
     """Tracks which byte ranges have been covered during parsing."""
@@ -184,9 +236,14 @@ class DeterministicParser:
     """
 
 
-    def __init__(self, parser=None, registry: Optional[DecoderRegistry] = None):
+    def __init__(self, parser=None, registry: Optional[DecoderRegistry] = None,
+                 record_raw: bool = True):
         self.parser = parser
         self.registry = registry or DecoderRegistry.instance()
+        # False skips the per-tag raw_tags occurrences (coverage, padding and
+        # Unparsed Data bookkeeping are still recorded) for callers that only
+        # read the decoded sections.
+        self.record_raw = record_raw
         # Re-created with the real size at the start of parse().
         self.coverage: CoverageTracker = CoverageTracker(0)
         self.results: Dict[str, Any] = {}
@@ -194,6 +251,11 @@ class DeterministicParser:
         self.generation: str = "Unknown"
         self._ef_data: List[Tuple[int, int, bytes]] = []
         self._ef_signatures: List[Tuple[int, int, bytes]] = []
+        # Tags seen with a Gen2 appendix dtype (0x02/0x03), for card generation refinement.
+        self._g2_tags: set = set()
+        # (parent_path, raw_key) → its raw_tags occurrence list, so repeat
+        # occurrences skip building the full key and the two setdefault calls.
+        self._raw_lists: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
 
     def parse(self, raw_data: bytes, is_vu: bool) -> Dict[str, Any]:
         """Structural pass: walk the whole file and account for every byte.
@@ -205,6 +267,8 @@ class DeterministicParser:
         self.coverage = CoverageTracker(len(raw_data))
         self._ef_data = []
         self._ef_signatures = []
+        self._g2_tags = set()
+        self._raw_lists = {}
 
         from core.registry.models import TachoResult
         self.results = TachoResult().to_dict()
@@ -230,8 +294,10 @@ class DeterministicParser:
             # (e.g. synthetic/truncated files).
             pass
         else:
-            # Top-level mode is 'stap' for G1, 'ber' for G2/G2.2
+            # Top-level mode is 'stap' for G1, 'ber' for G2/G2.2; the record
+            # reader is fixed for the whole walk, so pick it once.
             mode = 'stap' if self.generation == 'G1' else 'ber'
+            read_record = self._try_read_stap if mode == 'stap' else self._try_read_ber_tlv
 
             while pos < file_size:
                 pos = self._skip_padding(raw_data, pos, file_size)
@@ -239,14 +305,12 @@ class DeterministicParser:
                 if pos >= file_size:
                     break
 
-                if mode == 'stap':
-                    result = self._try_read_stap(raw_data, pos, file_size)
-                else:
-                    result = self._try_read_ber_tlv(raw_data, pos, file_size)
+                result = read_record(raw_data, pos, file_size)
 
                 if result is None:
-                    self.coverage.mark_unknown(pos, pos + 1, raw_data[pos:pos + 1])
-                    pos += 1
+                    nxt = self._next_candidate(raw_data, pos, file_size, mode)
+                    self.coverage.mark_unknown(pos, nxt, raw_data[pos:min(nxt, pos + 128)])
+                    pos = nxt
                     continue
 
                 tag, length, hdr_size, payload, dtype = result
@@ -277,7 +341,7 @@ class DeterministicParser:
             self.results.setdefault("raw_tags", {}).setdefault("Unparsed Data", []).append({
                 "offset": f"0x{s:08X}", "tag_id": "0x0000", "tag_name": "Unparsed Data",
                 "data_type": "RAW", "length": length, "depth": 0,
-                "data_hex": data.hex() if length <= 128 else f"{data[:128].hex()}..."
+                "data_hex": data.hex() + ("..." if length > 128 else "")  # sample is capped at 128
             })
 
         classifications = self.coverage.get_non_overlapping_classifications()
@@ -330,19 +394,11 @@ class DeterministicParser:
         """
         if self.generation not in ("G1", "Unknown"):
             return self.generation
-        G22_CARD_TAGS = {0x0525, 0x0526, 0x0527, 0x0528, 0x0529, 0x052A}
-        has_g2 = False
-        for occs in self.results.get("raw_tags", {}).values():
-            for occ in occs:
-                if occ.get("data_type") in ("0x02", "0x03"):
-                    has_g2 = True
-                    try:
-                        tid = int(occ.get("tag_id", "0x0"), 16)
-                    except (ValueError, TypeError):
-                        continue
-                    if tid in G22_CARD_TAGS:
-                        return "G2.2"
-        return "G2" if has_g2 else self.generation
+        if not self._g2_tags:
+            return self.generation
+        if self._g2_tags & _G22_CARD_TAGS:
+            return "G2.2"
+        return "G2"
 
     def _parse_vu_stream(self, raw_data: bytes):
         """Structural pass for Gen2/2.2 VU downloads.
@@ -371,7 +427,6 @@ class DeterministicParser:
             for (pos, rt, rs, nr, end) in sec["records"]:
                 name, confidence = RECORD_TYPES.get(rt, (f"Unknown_0x{rt:02X}", "low"))
                 self.coverage.mark_classified(pos, end, f"Tag_76{trep:02X} > RecordType_{rt:02X}")
-                payload = data[pos + 5:end]
                 key = f"{sec_key} > {rt:02X}_{name}"
                 self.results["raw_tags"].setdefault(key, []).append({
                     "offset": f"0x{pos:08X}", "tag_id": f"0x{rt:04X}",
@@ -380,7 +435,7 @@ class DeterministicParser:
                     "record_size": rs, "no_of_records": nr,
                     "is_spec_verified": confidence in ("high", "medium"),
                     "annex_ref": "Annex 1C Appendix 7", "generation": self.generation,
-                    "data_hex": payload.hex() if len(payload) <= 128 else f"{payload[:128].hex()}..."
+                    "data_hex": _hex_preview(data, pos + 5, end)
                 })
 
         self._classify_gaps(data)
@@ -413,7 +468,7 @@ class DeterministicParser:
                 self.results.setdefault("raw_tags", {}).setdefault("Padding", []).append({
                     "offset": f"0x{s:08X}", "tag_id": "0xPAD", "tag_name": "Padding",
                     "data_type": "RAW", "length": e - s, "depth": 0,
-                    "data_hex": chunk[:128].hex() + ("..." if e - s > 128 else "")
+                    "data_hex": _hex_preview(data, s, e)
                 })
             else:
                 self.coverage.mark_unknown(s, e, chunk)
@@ -433,14 +488,13 @@ class DeterministicParser:
             trep = msg["trep"]
             name = f"G1_VU_{TREP_NAMES[trep]}"
             key = f"76{trep:02X}_{name}"
-            body = data[msg["body_start"]:msg["body_end"]]
             self.coverage.mark_classified(msg["pos"], msg["body_end"], f"Tag_76{trep:02X}")
             self.results.setdefault("raw_tags", {}).setdefault(key, []).append({
                 "offset": f"0x{msg['pos']:08X}", "tag_id": f"0x76{trep:02X}",
                 "tag_name": name, "data_type": "SID/TREP",
-                "length": len(body), "depth": 0, "is_spec_verified": True,
+                "length": msg["body_end"] - msg["body_start"], "depth": 0, "is_spec_verified": True,
                 "annex_ref": "Annex 1B §2.2.6", "generation": "G1",
-                "data_hex": body.hex() if len(body) <= 128 else f"{body[:128].hex()}..."
+                "data_hex": _hex_preview(data, msg["body_start"], msg["body_end"])
             })
             if msg["sig_len"]:
                 sig = data[msg["body_end"]:msg["end"]]
@@ -467,14 +521,9 @@ class DeterministicParser:
 
     def _skip_padding(self, raw_data: bytes, pos: int, end: int) -> int:
         """Advance over a top-level padding run, classifying and recording it."""
-        from core.utils.coverage import is_padding_block, KNOWN_PADDING_BYTES
+        from core.utils.coverage import padding_run_end
         start = pos
-        while pos + 1 < end and is_padding_block(bytes([raw_data[pos], raw_data[pos+1]])) is not None:
-            pos += 1
-        if pos > start:
-            pos += 1  # include the last byte of the padding run
-        elif pos + 1 == end and raw_data[pos] in KNOWN_PADDING_BYTES:
-            pos += 1  # lone trailing padding byte at buffer end
+        pos = padding_run_end(raw_data, pos, end)
         if pos > start:
             fill_byte = raw_data[start]
             self.coverage.mark_padding(start, pos, fill_byte)
@@ -483,20 +532,15 @@ class DeterministicParser:
             self.results.setdefault("raw_tags", {}).setdefault("Padding", []).append({
                 "offset": f"0x{start:08X}", "tag_id": "0xPAD", "tag_name": "Padding",
                 "data_type": "RAW", "length": length, "depth": 0,
-                "data_hex": raw_data[start:pos][:128].hex() + ("..." if length > 128 else "")
+                "data_hex": _hex_preview(raw_data, start, pos)
             })
         return pos
 
     def _skip_padding_inner(self, data: bytes, pos: int, end: int, base_offset: int, depth: int, parent_path: str) -> int:
         """Same as :meth:`_skip_padding` but inside a container (relative offsets)."""
-        from core.utils.coverage import is_padding_block, KNOWN_PADDING_BYTES
+        from core.utils.coverage import padding_run_end
         start = pos
-        while pos + 1 < end and is_padding_block(bytes([data[pos], data[pos+1]])) is not None:
-            pos += 1
-        if pos > start:
-            pos += 1  # include the last byte of the padding run
-        elif pos + 1 == end and data[pos] in KNOWN_PADDING_BYTES:
-            pos += 1  # lone trailing padding byte at buffer end
+        pos = padding_run_end(data, pos, end)
         if pos > start:
             self.coverage.mark_padding(base_offset + start, base_offset + pos, data[start])
 
@@ -505,10 +549,24 @@ class DeterministicParser:
             self.results.setdefault("raw_tags", {}).setdefault(key, []).append({
                 "offset": f"0x{(base_offset + start):08X}", "tag_id": "0xPAD", "tag_name": "Padding",
                 "data_type": "RAW", "length": length, "depth": depth,
-                "data_hex": data[start:pos][:128].hex() + ("..." if length > 128 else "")
+                "data_hex": _hex_preview(data, start, pos)
             })
         return pos
 
+    @staticmethod
+    def _next_candidate(data: bytes, pos: int, end: int, mode: str) -> int:
+        """First offset after a failed read at *pos* worth probing again.
+
+        The unparseable run is skipped in one regex search over the offsets
+        where the mode's header or a padding run could start; the last byte is
+        always revisited for the lone-padding check.
+        """
+        candidates = _STAP_CANDIDATE if mode == 'stap' else _BER_CANDIDATE
+        match = candidates.search(data, pos + 1, end)
+        if match is not None:
+            return match.start()
+        return max(pos + 1, end - 1)
+
     def _try_read_stap(self, raw_data: bytes, pos: int, end: int) -> Optional[Tuple[int, int, int, bytes, Optional[int]]]:
         """Try a STAP record at *pos*: 5-byte T2L2 header with sanity checks.
 
@@ -518,11 +576,7 @@ class DeterministicParser:
         """
         if pos + 5 > end:
             return None
-        hdr = raw_data[pos:pos + 5]
-        try:
-            tag, dtype, length = struct.unpack(">HBH", hdr)
-        except struct.error:
-            return None
+        tag, dtype, length = _STAP_HDR.unpack_from(raw_data, pos)
 
         if tag in (0x0000, 0xFFFF, 0x5555):
             return None
@@ -564,17 +618,36 @@ class DeterministicParser:
 
     def _record_tag(self, tag: int, length: int, payload: bytes, pos: int, hdr_size: int, depth: int = 0, parent_path: str = "", dtype: Optional[int] = None, parent_tag: Optional[int] = None):
         """Append the tag occurrence to raw_tags and capture certificate payloads."""
+        if dtype in (0x02, 0x03):
+            self._g2_tags.add(tag)
+        if self.record_raw:
+            self._append_raw_tag(tag, length, payload, pos, depth, parent_path, dtype, parent_tag)
+
+        if self.parser:
+            if tag in (0xC108, 0x0104):
+                self.parser.msca_cert_raw = payload
+                if length == 194:  # keep the G1 copy for the G1 RSA chain
+                    self.parser.msca_cert_g1 = payload
+            elif tag in (0xC100, 0x0103, 0xC101, 0x7F21):
+                self.parser.card_cert_raw = payload
+                if length == 194:
+                    self.parser.card_cert_g1 = payload
+
+    def _append_raw_tag(self, tag: int, length: int, payload: bytes, pos: int, depth: int,
+                        parent_path: str, dtype: Optional[int], parent_tag: Optional[int]):
+        """Build the raw_tags occurrence entry for one tag."""
         dec = self.registry.get_decoder(tag, generation=self.generation, is_vu=self.is_vu,
                                        dtype=dtype, parent_tag=parent_tag)
-        tag_name = dec.name if dec else f"BER_{tag:04X}"
-        raw_key = f"{tag:04X}_{tag_name}"
-        full_key = f"{parent_path} > {raw_key}" if parent_path else raw_key
+        tag_name, raw_key, tag_id = _tag_labels(tag, dec.name if dec else None)
 
-        dtype_str = f"0x{dtype:02X}" if dtype is not None else ("BER" if (dec and dec.generation in ('G2', 'G2.2')) else "T2L2")
+        if dtype is not None:
+            dtype_str = _DTYPE_LABELS[dtype] if 0 <= dtype < 256 else f"0x{dtype:02X}"
+        else:
+            dtype_str = "BER" if (dec and dec.generation in ('G2', 'G2.2')) else "T2L2"
 
         entry = {
             "offset": f"0x{pos:08X}",
-            "tag_id": f"0x{tag:04X}",
+            "tag_id": tag_id,
             "tag_name": tag_name,
             "data_type": dtype_str,
             "length": length,
@@ -582,19 +655,14 @@ class DeterministicParser:
             "is_spec_verified": dec is not None and dec.decoder_fn is not None,
             "annex_ref": dec.annex_ref if dec else "",
             "generation": dec.generation if dec else "Unknown",
-            "data_hex": payload.hex() if length <= 128 else f"{payload[:128].hex()}..."
+            "data_hex": _hex_preview(payload)
         }
-        self.results.setdefault("raw_tags", {}).setdefault(full_key, []).append(entry)
-
-        if self.parser:
-            if tag in (0xC108, 0x0104):
-                self.parser.msca_cert_raw = payload
-                if length == 194:  # keep the G1 copy for the G1 RSA chain
-                    self.parser.msca_cert_g1 = payload
-            elif tag in (0xC100, 0x0103, 0xC101, 0x7F21):
-                self.parser.card_cert_raw = payload
-                if length == 194:
-                    self.parser.card_cert_g1 = payload
+        occurrences = self._raw_lists.get((parent_path, raw_key))
+        if occurrences is None:
+            full_key = f"{parent_path} > {raw_key}" if parent_path else raw_key
+            occurrences = self.results.setdefault("raw_tags", {}).setdefault(full_key, [])
+            self._raw_lists[(parent_path, raw_key)] = occurrences
+        occurrences.append(entry)
 
     def _dispatch_decoder(
         self,
@@ -630,11 +698,7 @@ class DeterministicParser:
                 )
                 return
             try:
-                sig = inspect.signature(dec.decoder_fn)
-                n_params = len([p for p in sig.parameters.values()
-                                if p.default is inspect.Parameter.empty
-                                and p.kind not in (p.VAR_POSITIONAL, p.VAR_KEYWORD)])
-                if n_params == 3:
+                if _required_arity(dec.decoder_fn) == 3:
                     dec.decoder_fn(payload, self.results, tag)
                 else:
                     dec.decoder_fn(payload, self.results)
@@ -662,12 +726,17 @@ class DeterministicParser:
             expected = dec.max_length
         elif dec.record_size is not None:
             record_sizes = dec.record_size if isinstance(dec.record_size, tuple) else (dec.record_size,)
+            # RecordArray header fields (recordSize, noOfRecords), read once.
+            if length >= 5:
+                array_size = (payload[1] << 8) | payload[2]
+                array_count = (payload[3] << 8) | payload[4]
+            else:
+                array_size = array_count = -1
             valid = False
             for record_size in record_sizes:
                 is_record_array = (
-                    length >= 5
-                    and int.from_bytes(payload[1:3], "big") == record_size
-                    and 5 + record_size * int.from_bytes(payload[3:5], "big") == length
+                    array_size == record_size
+                    and 5 + record_size * array_count == length
                 )
                 is_bare_records = length >= record_size and length % record_size == 0
                 is_pointer_prefixed = length >= 2 + record_size and (length - 2) % record_size == 0
@@ -699,10 +768,11 @@ class DeterministicParser:
             "expected": expected,
         }
 
-    def _parse_container(self, tag: int, payload: bytes, container_offset: int, depth: int, parent_path: str):
-        """Recursively walk a container payload (STAP or BER per generation)."""
+    def _container_frame(self, tag: int, payload: bytes, container_offset: int, depth: int, parent_path: str) -> Optional[list]:
+        """Walk state ``[tag, payload, offset, depth, path, mode, pos]`` for a
+        container, or None past the nesting limit."""
         if depth > MAX_RECURSION_DEPTH:
-            return
+            return None
         dec = self.registry.get_decoder(tag, generation=self.generation, is_vu=self.is_vu)
         mode = 'ber' if dec and dec.generation in ('G2', 'G2.2') else 'stap'
         inner_start = 0
@@ -710,13 +780,28 @@ class DeterministicParser:
         if (tag & 0xFF00) == 0x7600 and len(payload) >= 2 and payload[0] == 0x00:
             inner_start = 2
 
-        pos = inner_start
-        end = len(payload)
+        return [tag, payload, container_offset, depth, parent_path, mode, inner_start]
 
-        while pos < end:
-            pos = self._skip_padding_inner(payload, pos, end, container_offset, depth, parent_path)
+    def _parse_container(self, tag: int, payload: bytes, container_offset: int, depth: int, parent_path: str):
+        """Walk a container payload and its nested containers (STAP or BER per generation).
+
+        Nested containers are entered depth-first from an explicit stack of
+        open frames: records are visited in the same order as a recursive walk,
+        without a Python call per nesting level.
+        """
+        frame = self._container_frame(tag, payload, container_offset, depth, parent_path)
+        stack = [frame] if frame is not None else []
+
+        while stack:
+            frame = stack[-1]
+            tag, payload, container_offset, depth, parent_path, mode, pos = frame
+            end = len(payload)
+
+            if pos < end:
+                pos = self._skip_padding_inner(payload, pos, end, container_offset, depth, parent_path)
             if pos >= end:
-                break
+                stack.pop()
+                continue
 
             if mode == 'stap':
                 result = self._try_read_stap(payload, pos, end)
@@ -724,12 +809,13 @@ class DeterministicParser:
                 result = self._try_read_ber_tlv(payload, pos, end)
 
             if result is None:
+                nxt = self._next_candidate(payload, pos, end, mode)
                 self.coverage.mark_unknown(
                     container_offset + pos,
-                    container_offset + min(pos + 1, end),
-                    payload[pos:pos + 1]
+                    container_offset + nxt,
+                    payload[pos:min(nxt, pos + 128)]
                 )
-                pos += 1
+                frame[6] = nxt
                 continue
 
             inner_tag, inner_length, hdr_size, inner_payload, inner_dtype = result
@@ -744,11 +830,13 @@ class DeterministicParser:
                              dtype=inner_dtype, parent_tag=tag)
             self._dispatch_decoder(inner_tag, inner_payload, dtype=inner_dtype,
                                    parent_tag=tag, offset=abs_start)
+            frame[6] = pos + hdr_size + inner_length
 
             if self.registry.is_container(inner_tag, generation=self.generation, is_vu=self.is_vu,
                                           dtype=inner_dtype, parent_tag=tag):
                 inner_path = self._get_tag_path(inner_tag, parent_path,
                                                 dtype=inner_dtype, parent_tag=tag)
-                self._parse_container(inner_tag, inner_payload, abs_start + hdr_size, depth + 1, inner_path)
-
-            pos += hdr_size + inner_length
+                child = self._container_frame(inner_tag, inner_payload, abs_start + hdr_size,
+                                              depth + 1, inner_path)
+                if child is not None:
+                    stack.append(child)
@@ -30,9 +30,10 @@ Body layouts (Annex 1B §2.2.6.1-2.2.6.6):
 Confirmed against real G1 VU downloads: the walk lands exactly on every
 subsequent ``0x76 TREP`` marker and on the end of file.
 """
-import struct
+import re
 
 from core.utils.logger import get_logger
+from core.decoders.common import _U16
 from core.decoders.vu_g1 import (
     parse_g1_vu_overview,
     _parse_trep_02_activities,
@@ -60,6 +61,11 @@ TREP_NAMES = {
     0x14: "SensorTrailer",
 }
 
+# SID + TREP pairs that can open a chain after a card download: every known
+# TREP except a nested 0x06 (see _next_valid_marker).
+_CHAIN_MARKER = re.compile(
+    b"\\x76[" + b"".join(b"\\x%02x" % t for t in TREP_NAMES if t != 0x06) + b"]")
+
 
 def _trep01_body_len(d, p, n):
     q = p + 433 + 58
@@ -76,16 +82,16 @@ def _trep02_body_len(d, p, n):
     q = p + 7                   # dateOfDay(4) + odometerMidnight(3)
     if q + 2 > n:
         return None
-    q += 2 + struct.unpack(">H", d[q:q + 2])[0] * 129   # VuCardIWData
+    q += 2 + _U16.unpack_from(d, q)[0] * 129            # VuCardIWData
     if q + 2 > n:
         return None
-    q += 2 + struct.unpack(">H", d[q:q + 2])[0] * 2     # VuActivityDailyData
+    q += 2 + _U16.unpack_from(d, q)[0] * 2              # VuActivityDailyData
     if q + 1 > n:
         return None
     q += 1 + d[q] * 28                                  # VuPlaceDailyWorkPeriodData
     if q + 2 > n:
         return None
-    q += 2 + struct.unpack(">H", d[q:q + 2])[0] * 5     # VuSpecificConditionData
+    q += 2 + _U16.unpack_from(d, q)[0] * 5              # VuSpecificConditionData
     return q - p if q <= n else None
 
 
@@ -110,7 +116,7 @@ def _trep03_body_len(d, p, n):
 def _trep04_body_len(d, p, n):
     if p + 2 > n:
         return None
-    q = p + 2 + struct.unpack(">H", d[p:p + 2])[0] * 64
+    q = p + 2 + _U16.unpack_from(d, p)[0] * 64
     return q - p if q <= n else None
 
 
@@ -134,12 +140,8 @@ def _trep11_body_len(d, p, n):
     # Returning None makes the chain validation reject the candidate boundary,
     # letting the unbounded CardDownload extend to its real end instead of
     # being split mid-record and fed to the sensor decoder as garbage.
-    pos = p
-    while pos < n - 1:
-        if d[pos] == 0x76 and d[pos + 1] == 0x14:
-            return pos - p
-        pos += 1
-    return None
+    pos = d.find(b"\x76\x14", p, n)
+    return pos - p if pos >= 0 else None
 
 
 def _trep14_body_len(d, p, n):
@@ -154,15 +156,17 @@ def _next_valid_marker(d, p, n, validation_depth=0):
     would split the card data in the middle. Accept a candidate boundary only
     when the remaining bytes form a valid Annex 1B TREP sequence.
     """
-    pos = p
     memo = {}
-    while pos < n - 1:
-        if d[pos] == 0x76 and d[pos + 1] in TREP_NAMES:
-            # A nested TREP 06 candidate cannot be disambiguated from card EF
-            # payload without a length field; keep it inside the card download.
-            if d[pos + 1] != 0x06 and _valid_chain_from(d, pos, n, memo, validation_depth + 1):
-                return pos
-        pos += 1
+    # Jump straight between SID + TREP pairs (the regex scans in C) rather
+    # than probing every offset of the card data. A nested TREP 06 candidate
+    # cannot be disambiguated from card EF payload without a length field, so
+    # the pattern leaves it inside the card download.
+    m = _CHAIN_MARKER.search(d, p, n)
+    while m is not None:
+        pos = m.start()
+        if _valid_chain_from(d, pos, n, memo, validation_depth + 1):
+            return pos
+        m = _CHAIN_MARKER.search(d, pos + 1, n)
     return n
 
 
@@ -43,15 +43,22 @@ VU_ONLY_TAGS = {
 
 
 def _observed_tags(results: Dict) -> set:
-    tags = set()
+    """Tag numbers seen anywhere in ``raw_tags``.
+
+    Occurrences of one tag share the same ``tag_id`` string, so the distinct
+    strings are collected first and each is parsed once.
+    """
+    tag_ids = set()
     for occs in (results.get("raw_tags") or {}).values():
         for occ in occs:
-            if not isinstance(occ, dict):
-                continue
-            try:
-                tags.add(int(occ.get("tag_id", "0x0"), 16))
-            except (TypeError, ValueError):
-                continue
+            if isinstance(occ, dict):
+                tag_ids.add(occ.get("tag_id", "0x0"))
+    tags = set()
+    for tag_id in tag_ids:
+        try:
+            tags.add(int(tag_id, 16))
+        except (TypeError, ValueError):
+            continue
     return tags
 
 
@@ -1,7 +1,13 @@
+import re
 import struct
 from typing import Optional
 
 from core.decoders import get_nation
+from core.decoders.common import _U16, _U32
+
+_RECORD_ARRAY_HDR = struct.Struct(">BHH")
+# Signed daily activity record markers (0x7622 / 0x7632).
+_DAILY_MARKER = re.compile(rb'\x76[\x22\x32]')
 
 
 class RecordArrayParser:
@@ -23,9 +29,7 @@ class RecordArrayParser:
     def parse_header(data: bytes, offset: int = 0):
         if offset + 5 > len(data):
             return None
-        record_type = data[offset]
-        record_size = struct.unpack(">H", data[offset + 1:offset + 3])[0]
-        no_of_records = struct.unpack(">H", data[offset + 3:offset + 5])[0]
+        record_type, record_size, no_of_records = _RECORD_ARRAY_HDR.unpack_from(data, offset)
         return {
             "record_type": record_type,
             "record_size": record_size,
@@ -93,16 +97,16 @@ def decode_g2_driver_record(data: bytes, offset: int = 0):
     if pos + 4 > len(data):
         return None
 
-    prefix = struct.unpack(">H", data[pos:pos + 2])[0]
+    prefix = _U16.unpack_from(data, pos)[0]
     if prefix != 0x6864:
         return None
 
-    meta = struct.unpack(">H", data[pos + 2:pos + 4])[0]
+    meta = _U16.unpack_from(data, pos + 2)[0]
     pos += 4
 
     card_expiry = None
     if pos + 4 <= len(data):
-        expiry_val = struct.unpack(">I", data[pos:pos + 4])[0]
+        expiry_val = _U32.unpack_from(data, pos)[0]
         if expiry_val == 0xFFFFFFFF or expiry_val == 0:
             pos += 4
         elif 946684800 <= expiry_val <= 4102444800:
@@ -179,10 +183,10 @@ def decode_g2_daily_record(data: bytes, offset: int = 0):
 
     rec_data = data[offset:]
 
-    tag = struct.unpack(">H", rec_data[0:2])[0]
-    daily_counter = struct.unpack(">I", rec_data[5:9])[0]
-    day_field = struct.unpack(">H", rec_data[17:19])[0]
-    changes_count = struct.unpack(">H", rec_data[20:22])[0]
+    tag = _U16.unpack_from(rec_data, 0)[0]
+    daily_counter = _U32.unpack_from(rec_data, 5)[0]
+    day_field = _U16.unpack_from(rec_data, 17)[0]
+    changes_count = _U16.unpack_from(rec_data, 20)[0]
 
     if changes_count == 0 or changes_count > 300:
         return None
@@ -193,7 +197,7 @@ def decode_g2_daily_record(data: bytes, offset: int = 0):
     counters = []
     for i in range(11):
         if i * 2 + 1 < len(counters_data):
-            c = struct.unpack(">H", counters_data[i * 2:i * 2 + 2])[0]
+            c = _U16.unpack_from(counters_data, i * 2)[0]
             counters.append(c)
 
     activity_map = {0: "REST", 1: "AVAILABLE", 2: "WORK", 3: "DRIVE"}
@@ -284,7 +288,7 @@ def parse_g2_trep02_activities(data: bytes, results: dict):
     def _valid_daily_at(p):
         if p + 22 > len(data):
             return False
-        if struct.unpack(">H", data[p:p + 2])[0] not in (0x7622, 0x7632):
+        if _U16.unpack_from(data, p)[0] not in (0x7622, 0x7632):
             return False
         daily = decode_g2_daily_record(data, p)
         if not daily or daily["changes_count"] <= 0:
@@ -294,16 +298,17 @@ def parse_g2_trep02_activities(data: bytes, results: dict):
     if _valid_daily_at(pos):
         first_daily_pos = pos
     else:
-        for scan in range(pos, min(pos + 300, len(data) - 22)):
-            if _valid_daily_at(scan):
-                first_daily_pos = scan
+        # Only offsets holding a marker can validate: let the regex find them.
+        for m in _DAILY_MARKER.finditer(data, pos, min(pos + 300, len(data) - 22) + 1):
+            if _valid_daily_at(m.start()):
+                first_daily_pos = m.start()
                 break
 
     if first_daily_pos is not None:
         pos = first_daily_pos
         last_counter = None
         while pos + 22 <= len(data):
-            tag_check = struct.unpack(">H", data[pos:pos + 2])[0]
+            tag_check = _U16.unpack_from(data, pos)[0]
             if tag_check not in (0x7622, 0x7632):
                 break
 
@@ -22,16 +22,27 @@ The walker also reconstructs daily activity records (date + odometer + activity
 changes) in the same shape the rest of the app consumes via ``results['activities']``,
 which the legacy heuristic TREP parser failed to produce for Gen2/2.2 VU files.
 """
+import re
 import struct
-from datetime import datetime, timezone
+from datetime import datetime
 
 from core.utils.logger import get_logger
 from core import decoders
+from core.decoders.common import _CODEPAGE_ENCODINGS, _iso_utc, _U16, _U32
 from core.utils.constants import RECORD_ARRAY_MAX_RECORDS, RECORD_ARRAY_MAX_SIZE
 from core.utils.event_codes import describe_event, describe_fault, describe_calibration_purpose, describe_control_type, describe_record_purpose
 
 _log = get_logger(__name__)
 
+_U64 = struct.Struct(">Q")
+
+# Runs of bytes that are not 0x00/0xFF fill (sensor fault payload regions).
+_NON_FILL_RUN = re.compile(rb'[^\x00\xff]+')
+
+# Bytes that can open a RecordArray header (recordType 0x01..0x60) or a
+# 0x76 section marker; iter_vu_sections resyncs from one to the next.
+_HEADER_START = re.compile(rb'[\x01-\x60\x76]')
+
 # recordType → (human name, confidence). Names are AUTHORITATIVE: they were
 # obtained by matching the observed recordType order in real files against the
 # RecordArray order the regulation mandates per TREP (Appendix 7, DDP_029..033),
@@ -160,7 +171,7 @@ def _s24(b):
 def _iso(ts):
     if ts == 0:
         return "\u2014"
-    return (datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+    return (_iso_utc(ts)
             if 946684800 <= ts <= 4102444800 else None)
 
 
@@ -182,8 +193,8 @@ def decode_company_lock(rec):
         return None
     return {
         "confidence": "medium",
-        "lock_in_time": _iso(struct.unpack(">I", rec[0:4])[0]),
-        "lock_out_time": _iso(struct.unpack(">I", rec[4:8])[0]),
+        "lock_in_time": _iso(_U32.unpack_from(rec, 0)[0]),
+        "lock_out_time": _iso(_U32.unpack_from(rec, 4)[0]),
         "company_name": decode_name(rec, 8),
         "company_address": decode_name(rec, 44),
         "company_card": decode_full_card_number_gen(rec, 80),
@@ -199,10 +210,10 @@ def decode_control_activity(rec):
         "confidence": "medium",
         "control_type": rec[0],
         "control_type_label": describe_control_type(rec[0]),
-        "control_time": _iso(struct.unpack(">I", rec[1:5])[0]),
+        "control_time": _iso(_U32.unpack_from(rec, 1)[0]),
         "control_card": decode_full_card_number_gen(rec, 5),
-        "download_period_begin": _iso(struct.unpack(">I", rec[24:28])[0]),
-        "download_period_end": _iso(struct.unpack(">I", rec[28:32])[0]),
+        "download_period_begin": _iso(_U32.unpack_from(rec, 24)[0]),
+        "download_period_end": _iso(_U32.unpack_from(rec, 28)[0]),
     }
 
 
@@ -221,8 +232,8 @@ def decode_vu_identification(rec):
     if len(rec) >= 108:
         out.update({
             "software_version": _ascii(rec, 96, 4),
-            "software_installation_date": _iso(struct.unpack(">I", rec[100:104])[0]),
-            "manufacturing_date": _iso(struct.unpack(">I", rec[104:108])[0]),
+            "software_installation_date": _iso(_U32.unpack_from(rec, 100)[0]),
+            "manufacturing_date": _iso(_U32.unpack_from(rec, 104)[0]),
         })
     if len(rec) >= 124:
         out["approval_number"] = _ascii(rec, 108, 16)
@@ -267,7 +278,7 @@ def _decode_calibration_extension(rec):
             "by_default_load_type": rec[246],
             "by_default_load_type_label": _load_type_label(rec[246]),
             "calibration_country": decoders.get_nation(rec[247]),
-            "calibration_country_timestamp": _iso(struct.unpack(">I", rec[248:252])[0]),
+            "calibration_country_timestamp": _iso(_U32.unpack_from(rec, 248)[0]),
         }
     if len(rec) >= 222:
         return {"seal_data_vu": _decode_seal_data(rec[167:222])}
@@ -299,22 +310,22 @@ def decode_calibration(rec):
             "nation": decoders.get_nation(rec[74]),
             "card_number": _ascii(rec, 75, 16),
         },
-        "workshop_card_expiry": _iso(struct.unpack(">I", rec[91:95])[0]),
+        "workshop_card_expiry": _iso(_U32.unpack_from(rec, 91)[0]),
         "vin": _ascii(rec, 95, 17),
         "vehicle_registration": {
             "nation": decoders.get_nation(rec[112]),
             "plate": _ascii(rec, 114, 13),
         },
-        "w_vehicle_constant": struct.unpack(">H", rec[127:129])[0],
-        "k_constant": struct.unpack(">H", rec[129:131])[0],
-        "l_tyre_circumference": struct.unpack(">H", rec[131:133])[0],
+        "w_vehicle_constant": _U16.unpack_from(rec, 127)[0],
+        "k_constant": _U16.unpack_from(rec, 129)[0],
+        "l_tyre_circumference": _U16.unpack_from(rec, 131)[0],
         "tyre_size": _ascii(rec, 133, 15),
         "authorised_speed_kmh": rec[148],
         "old_odometer_km": _u24(rec[149:152]),
         "new_odometer_km": _u24(rec[152:155]),
-        "old_time": _iso(struct.unpack(">I", rec[155:159])[0]),
-        "new_time": _iso(struct.unpack(">I", rec[159:163])[0]),
-        "next_calibration_date": _iso(struct.unpack(">I", rec[163:167])[0]),
+        "old_time": _iso(_U32.unpack_from(rec, 155)[0]),
+        "new_time": _iso(_U32.unpack_from(rec, 159)[0]),
+        "next_calibration_date": _iso(_U32.unpack_from(rec, 163)[0]),
     }
     out.update(_decode_calibration_extension(rec))
     return out
@@ -331,11 +342,11 @@ def decode_card_iw(rec):
         "holder_surname": decode_name(rec, 0),
         "holder_first_names": decode_name(rec, 36),
         "card": decode_full_card_number_gen(rec, 72),
-        "card_expiry": _iso(struct.unpack(">I", rec[91:95])[0]),
-        "insertion_time": _iso(struct.unpack(">I", rec[95:99])[0]),
+        "card_expiry": _iso(_U32.unpack_from(rec, 91)[0]),
+        "insertion_time": _iso(_U32.unpack_from(rec, 95)[0]),
         "odometer_insertion_km": _u24(rec[99:102]),
         "card_slot": rec[102],
-        "withdrawal_time": _iso(struct.unpack(">I", rec[103:107])[0]),
+        "withdrawal_time": _iso(_U32.unpack_from(rec, 103)[0]),
         "odometer_withdrawal_km": _u24(rec[107:110]),
     }
 
@@ -347,7 +358,7 @@ def decode_download_activity(rec):
         return None
     return {
         "confidence": "medium",
-        "downloading_time": _iso(struct.unpack(">I", rec[0:4])[0]),
+        "downloading_time": _iso(_U32.unpack_from(rec, 0)[0]),
         "card": decode_full_card_number_gen(rec, 4),
         "company_or_workshop_name": decode_name(rec, 23),
     }
@@ -370,7 +381,7 @@ def decode_sensor_paired(rec):
         "confidence": "medium" if full else "low",
         "sensor_serial": rec[0:8].hex(),
         "sensor_approval": _ascii(rec, 8, approval_end - 8),
-        "pairing_date": _iso(struct.unpack(">I", rec[date_off:date_off + 4])[0]),
+        "pairing_date": _iso(_U32.unpack_from(rec, date_off)[0]),
     }
 
 
@@ -389,7 +400,7 @@ def decode_sensor_gnss_coupled(rec):
         "confidence": "medium" if full else "low",
         "sensor_serial": rec[0:8].hex(),
         "sensor_approval": _ascii(rec, 8, approval_end - 8),
-        "coupling_date": _iso(struct.unpack(">I", rec[date_off:date_off + 4])[0]),
+        "coupling_date": _iso(_U32.unpack_from(rec, date_off)[0]),
     }
 
 
@@ -471,7 +482,7 @@ def decode_gnss_place_auth(data, off):
     if off + 12 > len(data):
         return None
     rec = data[off:off + 12]
-    ts = struct.unpack(">I", rec[0:4])[0]
+    ts = _U32.unpack_from(rec, 0)[0]
     return {
         "timestamp": _iso(ts),
         "gnss_accuracy": rec[4],
@@ -487,7 +498,7 @@ def decode_gnss_place(data, off, with_auth):
         return None
     rec = data[off:off + size]
     out = {
-        "timestamp": _iso(struct.unpack(">I", rec[0:4])[0]),
+        "timestamp": _iso(_U32.unpack_from(rec, 0)[0]),
         "gnss_accuracy": rec[4],
         "geo": decode_geo_coordinates(rec, 5),
     }
@@ -509,7 +520,7 @@ def decode_place_daily(rec):
     return {
         "confidence": "high",
         "card_driver": decode_full_card_number_gen(rec, 0),
-        "timestamp": _iso(struct.unpack(">I", rec[19:23])[0]),
+        "timestamp": _iso(_U32.unpack_from(rec, 19)[0]),
         "entry_type": entry_names.get(entry_type, f"0x{entry_type:02X}"),
         "type_code": entry_type,
         "nation": decoders.get_nation(rec[24]),
@@ -531,7 +542,7 @@ def decode_specific_condition(rec):
     code = rec[4]
     return {
         "confidence": "high",
-        "timestamp": _iso(struct.unpack(">I", rec[0:4])[0]),
+        "timestamp": _iso(_U32.unpack_from(rec, 0)[0]),
         "condition": specific_condition_label(code),
         "type_code": code,
     }
@@ -547,7 +558,7 @@ def decode_gnss_ad(rec):
     odo_off = 42 + (12 if with_auth else 11)
     return {
         "confidence": "high",
-        "timestamp": _iso(struct.unpack(">I", rec[0:4])[0]),
+        "timestamp": _iso(_U32.unpack_from(rec, 0)[0]),
         "card_driver": decode_full_card_number_gen(rec, 4),
         "card_codriver": decode_full_card_number_gen(rec, 23),
         "gnss_place": decode_gnss_place(rec, 42, with_auth),
@@ -562,8 +573,8 @@ def decode_overspeeding_control(rec):
         return None
     return {
         "confidence": "high",
-        "last_control_time": _iso(struct.unpack(">I", rec[0:4])[0]),
-        "first_overspeed_since": _iso(struct.unpack(">I", rec[4:8])[0]),
+        "last_control_time": _iso(_U32.unpack_from(rec, 0)[0]),
+        "first_overspeed_since": _iso(_U32.unpack_from(rec, 4)[0]),
         "number_of_overspeed": rec[8],
     }
 
@@ -580,8 +591,8 @@ def decode_overspeeding_event(rec):
         "event_type_label": describe_event(rec[0]),
         "record_purpose": rec[1],
         "record_purpose_label": describe_record_purpose(rec[1]),
-        "begin": _iso(struct.unpack(">I", rec[2:6])[0]),
-        "end": _iso(struct.unpack(">I", rec[6:10])[0]),
+        "begin": _iso(_U32.unpack_from(rec, 2)[0]),
+        "end": _iso(_U32.unpack_from(rec, 6)[0]),
         "max_speed_kmh": rec[10],
         "average_speed_kmh": rec[11],
         "card_driver": decode_full_card_number_gen(rec, 12),
@@ -600,8 +611,8 @@ def decode_power_interruption(rec):
         "event_type_label": describe_event(rec[0]),
         "record_purpose": rec[1],
         "record_purpose_label": describe_record_purpose(rec[1]),
-        "begin": _iso(struct.unpack(">I", rec[2:6])[0]),
-        "end": _iso(struct.unpack(">I", rec[6:10])[0]),
+        "begin": _iso(_U32.unpack_from(rec, 2)[0]),
+        "end": _iso(_U32.unpack_from(rec, 6)[0]),
         "card_driver_begin": decode_full_card_number_gen(rec, 10),
         "card_driver_end": decode_full_card_number_gen(rec, 29),
         "card_codriver_begin": decode_full_card_number_gen(rec, 48),
@@ -630,8 +641,8 @@ def decode_time_adjustment(rec):
         return None
     out = {
         "confidence": "medium",
-        "old_time": _iso(struct.unpack(">I", rec[0:4])[0]),
-        "new_time": _iso(struct.unpack(">I", rec[4:8])[0]),
+        "old_time": _iso(_U32.unpack_from(rec, 0)[0]),
+        "new_time": _iso(_U32.unpack_from(rec, 4)[0]),
     }
     if len(rec) >= 99:
         out["confidence"] = "high"
@@ -663,7 +674,7 @@ def decode_load_unload(rec):
     cardDriver(19) + cardCodriver(19) + gnssPlaceAuth(12) + odometer(3)."""
     if len(rec) < 58:
         return None
-    ts = struct.unpack(">I", rec[0:4])[0]
+    ts = _U32.unpack_from(rec, 0)[0]
     op = rec[4]
     op_names = {0x01: "load", 0x02: "unload", 0x03: "simultaneous"}
     return {
@@ -684,8 +695,8 @@ def _decode_event_fault_prefix(rec):
     are surfaced raw — their exact layout is not verified here."""
     if len(rec) < 10:
         return None
-    begin = struct.unpack(">I", rec[2:6])[0]
-    end = struct.unpack(">I", rec[6:10])[0]
+    begin = _U32.unpack_from(rec, 2)[0]
+    end = _U32.unpack_from(rec, 6)[0]
     return {
         "type_code": rec[0],
         "record_purpose": rec[1],
@@ -724,22 +735,23 @@ def _decode_record(record_type, rec):
     out = {"record_type": f"0x{record_type:02X}", "name": name,
            "size": len(rec), "confidence": confidence}
 
-    if record_type in _RECORD_DECODERS:
-        decoded = _RECORD_DECODERS[record_type](rec)
+    decode = _RECORD_DECODERS.get(record_type)
+    if decode is not None:
+        decoded = decode(rec)
         if decoded:
             out.update(decoded)
         else:
             out["raw_hex"] = rec[:48].hex()
         return out
     if record_type == 0x01 and len(rec) >= 2:
-        activity = decoders.decode_activity_val(struct.unpack(">H", rec[0:2])[0])
+        activity = decoders.decode_activity_val(_U16.unpack_from(rec, 0)[0])
         if activity is not None:
             out["activity"] = activity
         else:
             out["raw_hex"] = rec[:2].hex()
         return out
     if record_type == 0x29 and len(rec) >= 2:
-        val = struct.unpack(">H", rec[0:2])[0]
+        val = _U16.unpack_from(rec, 0)[0]
         activity = decoders.decode_activity_val(val)
         # 0x29 is strongly suspected to be the co-driver slot's
         # ActivityChangeInfo on VU models that partition by slot (observed on
@@ -752,7 +764,7 @@ def _decode_record(record_type, rec):
         out["raw_hex"] = rec[:2].hex()
         return out
     if record_type in (0x03, 0x06) and len(rec) >= 4:
-        out["time"] = _iso(struct.unpack(">I", rec[0:4])[0])
+        out["time"] = _iso(_U32.unpack_from(rec, 0)[0])
         return out
     if record_type == 0x05 and len(rec) >= 3:
         out["odometer_km"] = _u24(rec[0:3])
@@ -785,8 +797,8 @@ def _decode_record(record_type, rec):
         return out
     if record_type == 0x13 and len(rec) >= 8:
         out["confidence"] = "high"
-        out["min_downloadable_time"] = _iso(struct.unpack(">I", rec[0:4])[0])
-        out["max_downloadable_time"] = _iso(struct.unpack(">I", rec[4:8])[0])
+        out["min_downloadable_time"] = _iso(_U32.unpack_from(rec, 0)[0])
+        out["max_downloadable_time"] = _iso(_U32.unpack_from(rec, 4)[0])
         return out
     if record_type == 0x12 and len(rec) >= 5:
         # VuDetailedSpeedBlock: speedBlockBeginDate(4) + 60×speed(1/sec).
@@ -794,7 +806,7 @@ def _decode_record(record_type, rec):
         raw_speeds = [None if s == 0xFF else s for s in rec[4:64]]
         samples = [s for s in raw_speeds if s is not None]
         out["confidence"] = "high"
-        out["begin"] = _iso(struct.unpack(">I", rec[0:4])[0])
+        out["begin"] = _iso(_U32.unpack_from(rec, 0)[0])
         # Internal chart data: excluded from GUI tables and exports.
         out["_chart_speeds_kmh"] = raw_speeds
         if samples:
@@ -848,12 +860,20 @@ def iter_vu_sections(data):
             pos += 2
             continue
         rt = data[pos]
-        rs = struct.unpack(">H", data[pos + 1:pos + 3])[0]
-        nr = struct.unpack(">H", data[pos + 3:pos + 5])[0]
-        if rt < 0x01 or rt > 0x60 or rs > RECORD_ARRAY_MAX_SIZE or nr > RECORD_ARRAY_MAX_RECORDS or (rs == 0 and nr > 0 and rt != 0x60):
-            # Resync one byte at a time: skipping a whole header width here
-            # could jump over the start of a valid RecordArray after junk.
-            pos += 1
+        if rt < 0x01 or rt > 0x60:
+            # No recordType or section marker here: jump straight to the next
+            # byte that could open either, without reading a header.
+            m = _HEADER_START.search(data, pos + 1)
+            pos = m.start() if m else n
+            continue
+        rs = _U16.unpack_from(data, pos + 1)[0]
+        nr = _U16.unpack_from(data, pos + 3)[0]
+        if rs > RECORD_ARRAY_MAX_SIZE or nr > RECORD_ARRAY_MAX_RECORDS or (rs == 0 and nr > 0 and rt != 0x60):
+            # Resync at the next byte that could open a header or a section:
+            # skipping a whole header width here could jump over the start of
+            # a valid RecordArray after junk.
+            m = _HEADER_START.search(data, pos + 1)
+            pos = m.start() if m else n
             continue
         if pos + 5 + rs * nr > n:
             break
@@ -990,8 +1010,8 @@ def decode_downloadable_period(rec):
     """VuDownloadablePeriod (8 bytes): minDownloadableTime(4) + maxDownloadableTime(4)."""
     if len(rec) < 8:
         return None
-    min_ts = struct.unpack(">I", rec[0:4])[0]
-    max_ts = struct.unpack(">I", rec[4:8])[0]
+    min_ts = _U32.unpack_from(rec, 0)[0]
+    max_ts = _U32.unpack_from(rec, 4)[0]
     return {
         "min_downloadable": _iso(min_ts) or "N/A",
         "max_downloadable": _iso(max_ts) or "N/A",
@@ -1002,8 +1022,8 @@ def decode_time_adj_gnss(rec):
     """VuTimeAdjustmentGNSSRecord (8 bytes): oldTimeValue(4) + newTimeValue(4)."""
     if len(rec) < 8:
         return None
-    old_ts = struct.unpack(">I", rec[0:4])[0]
-    new_ts = struct.unpack(">I", rec[4:8])[0]
+    old_ts = _U32.unpack_from(rec, 0)[0]
+    new_ts = _U32.unpack_from(rec, 4)[0]
     return {
         "old_time": _iso(old_ts) or "N/A",
         "new_time": _iso(new_ts) or "N/A",
@@ -1016,8 +1036,8 @@ def decode_sensor_fault(rec):
         return None
     evt_type = rec[0]
     evt_purpose = rec[1]
-    begin_ts = struct.unpack(">I", rec[2:6])[0]
-    end_ts = struct.unpack(">I", rec[6:10])[0]
+    begin_ts = _U32.unpack_from(rec, 2)[0]
+    end_ts = _U32.unpack_from(rec, 6)[0]
     fault_hint = {
         0x01: "communication_error", 0x02: "data_integrity",
         0x03: "sensor_timeout", 0x04: "power_supply",
@@ -1025,17 +1045,7 @@ def decode_sensor_fault(rec):
         0x0C: "internal_vu_fault",
     }.get(evt_type, "unknown")
     payload = rec[10:]
-    non_zero = []
-    run_start = None
-    for i, b in enumerate(payload):
-        if b not in (0x00, 0xFF):
-            if run_start is None:
-                run_start = i
-        elif run_start is not None:
-            non_zero.append((run_start, i))
-            run_start = None
-    if run_start is not None:
-        non_zero.append((run_start, len(payload)))
+    non_zero = [m.span() for m in _NON_FILL_RUN.finditer(payload)]
     return {
         "description": describe_fault(evt_type),
         "event_type": evt_type,
@@ -1058,7 +1068,7 @@ def decode_detailed_speed(rec):
     """VuDetailedSpeedData (64 bytes): timestamp(4) + 60 x speed UInt8 km/h."""
     if len(rec) < 64:
         return None
-    timestamp = struct.unpack(">I", rec[0:4])[0]
+    timestamp = _U32.unpack_from(rec, 0)[0]
     speeds = list(rec[4:64])
     valid = [s for s in speeds if s != 0xFF]
     return {
@@ -1080,12 +1090,7 @@ def _read_coded_string(data, off):
     off += 2
     if off + size > len(data):
         return "", min(off, len(data))
-    enc = {0x01: "iso-8859-1", 0x02: "iso-8859-2", 0x03: "iso-8859-3",
-           0x04: "iso-8859-4", 0x05: "iso-8859-5", 0x06: "iso-8859-6",
-           0x07: "iso-8859-7", 0x08: "iso-8859-8", 0x09: "iso-8859-9",
-           0x0A: "iso-8859-10", 0x0B: "iso-8859-11",
-           0x0D: "iso-8859-13", 0x0E: "iso-8859-14",
-           0x0F: "iso-8859-15", 0x10: "iso-8859-16"}.get(code_page, "latin-1")
+    enc = _CODEPAGE_ENCODINGS.get(code_page, "latin-1")
     text = data[off:off + size].decode(enc, errors="replace").strip()
     return text, off + size
 
@@ -1103,9 +1108,9 @@ def decode_controller_identification(rec):
         sw_ver, pos = _read_coded_string(rec, pos)
         if pos + 18 > len(rec):
             return None
-        approval = struct.unpack(">Q", rec[pos:pos + 8])[0]
+        approval = _U64.unpack_from(rec, pos)[0]
         pos += 8
-        serial = struct.unpack(">Q", rec[pos:pos + 8])[0]
+        serial = _U64.unpack_from(rec, pos)[0]
         pos += 8
         mfg_year = rec[pos] if pos < len(rec) else 0
         return {
@@ -40,32 +40,46 @@ def _occurrence_generation(generation: Any) -> Optional[str]:
     return labels.get(" ".join(generation.casefold().split()))
 
 
+# Placeholder sections cloned per result: a shallow dict.copy() of a shared
+# template is cheaper than rebuilding the literal, and every value is immutable.
+_METADATA_TEMPLATE: Dict[str, Any] = {
+    "filename": "N/A",
+    "generation": "Unknown",
+    "parsed_at": "",
+    "integrity_check": "Pending",
+    "file_size_bytes": 0,
+    "coverage_pct": 0.0
+}
+_DRIVER_TEMPLATE: Dict[str, Any] = {
+    "card_number": "N/A",
+    "surname": "N/A",
+    "firstname": "N/A",
+    "birth_date": "N/A",
+    "expiry_date": "N/A",
+    "issuing_nation": "N/A",
+    "preferred_language": "N/A",
+    "licence_number": "N/A",
+    "licence_issuing_nation": "N/A"
+}
+_VEHICLE_TEMPLATE: Dict[str, Any] = {
+    "vin": "N/A",
+    "plate": "N/A",
+    "registration_nation": "N/A"
+}
+
+
+def _new_metadata() -> Dict[str, Any]:
+    """Fresh metadata section stamped with the current parse time."""
+    metadata = _METADATA_TEMPLATE.copy()
+    metadata["parsed_at"] = datetime.now().isoformat()
+    return metadata
+
+
 @dataclass
 class TachoResult:
-    metadata: Dict[str, Any] = field(default_factory=lambda: {
-        "filename": "N/A",
-        "generation": "Unknown",
-        "parsed_at": datetime.now().isoformat(),
-        "integrity_check": "Pending",
-        "file_size_bytes": 0,
-        "coverage_pct": 0.0
-    })
-    driver: Dict[str, Any] = field(default_factory=lambda: {
-        "card_number": "N/A",
-        "surname": "N/A",
-        "firstname": "N/A",
-        "birth_date": "N/A",
-        "expiry_date": "N/A",
-        "issuing_nation": "N/A",
-        "preferred_language": "N/A",
-        "licence_number": "N/A",
-        "licence_issuing_nation": "N/A"
-    })
-    vehicle: Dict[str, Any] = field(default_factory=lambda: {
-        "vin": "N/A", 
-        "plate": "N/A",
-        "registration_nation": "N/A"
-    })
+    metadata: Dict[str, Any] = field(default_factory=_new_metadata)
+    driver: Dict[str, Any] = field(default_factory=_DRIVER_TEMPLATE.copy)
+    vehicle: Dict[str, Any] = field(default_factory=_VEHICLE_TEMPLATE.copy)
     activities: List[Dict[str, Any]] = field(default_factory=list)
     vehicle_sessions: List[Dict[str, Any]] = field(default_factory=list)
     events: List[Dict[str, Any]] = field(default_factory=list)
@@ -133,73 +147,9 @@ class TachoResult:
 
     def to_dict(self, tags: Optional[Dict[int, str]] = None) -> Dict[str, Any]:
         """Convert the result to a dictionary, with optional hierarchical generations tree."""
-        result = {
-            "metadata": self.metadata,
-            "driver": self.driver,
-            "vehicle": self.vehicle,
-            "activities": self.activities,
-            "vehicle_sessions": self.vehicle_sessions,
-            "events": self.events,
-            "faults": self.faults,
-            "locations": self.locations,
-            "places": self.places,
-            "calibrations": self.calibrations,
-            "raw_tags": self.raw_tags,
-            "gnss_ad_records": self.gnss_ad_records,
-            "load_unload_records": self.load_unload_records,
-            "trailer_registrations": self.trailer_registrations,
-            "gnss_places": self.gnss_places,
-            "load_sensor_data": self.load_sensor_data,
-            "border_crossings": self.border_crossings,
-            "signed_daily_records": self.signed_daily_records,
-            "card_application": self.card_application,
-            "control_activities": self.control_activities,
-            "card_downloads": self.card_downloads,
-            "card_chip": self.card_chip,
-            "company_info": self.company_info,
-            "vu_overview": self.vu_overview,
-            "vu_info": self.vu_info,
-            "card_numbers": self.card_numbers,
-            "card_iw_records": self.card_iw_records,
-            "company_locks": self.company_locks,
-            "overspeeding_events": self.overspeeding_events,
-            "overspeeding_control": self.overspeeding_control,
-            "specific_conditions": self.specific_conditions,
-            "time_adjustments": self.time_adjustments,
-            "sensor_daily_records": self.sensor_daily_records,
-            "sensor_info": self.sensor_info,
-            "previous_vehicle": self.previous_vehicle,
-            "inserted_drivers": self.inserted_drivers,
-            "workshops": self.workshops,
-            "calibration_vins": self.calibration_vins,
-            "speed_blocks": self.speed_blocks,
-            "certificates": self.certificates,
-            "card_issuer": self.card_issuer,
-            "card_icc": self.card_icc,
-            "company_holders": self.company_holders,
-            "vehicle_units": self.vehicle_units,
-            "vu_certificates": self.vu_certificates,
-            "vu_identifications": self.vu_identifications,
-            "card_records": self.card_records,
-            "download_activities": self.download_activities,
-            "downloadable_periods": self.downloadable_periods,
-            "its_consents": self.its_consents,
-            "power_interruptions": self.power_interruptions,
-            "signature_verification": self.signature_verification,
-            "sensor_pairings": self.sensor_pairings,
-            "sensor_gnss_couplings": self.sensor_gnss_couplings,
-            "vu_record_arrays": self.vu_record_arrays,
-            "gnss_auth": self.gnss_auth,
-            "load_unload_auth": self.load_unload_auth,
-            "sensor_faults": self.sensor_faults,
-            "vu_controller": self.vu_controller,
-            "time_adj_gnss": self.time_adj_gnss,
-            "certificate_temporal_validity": self.certificate_temporal_validity,
-            "ef_signature_verification": self.ef_signature_verification,
-            "coverage": self.coverage,
-            "sections": self.sections,
-            "generations": self.generations,
-        }
+        # Shallow copy of the field dict: same key order and shared section
+        # objects as the fields, without re-listing every one of them here.
+        result = dict(self.__dict__)
         if tags:
             result["generations"] = build_generations_tree(result, tags)
         return result
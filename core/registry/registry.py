@@ -9,7 +9,7 @@ from typing import Optional, Callable, Dict, List, Tuple, Union
 import threading
 
 
-@dataclass
+@dataclass(slots=True)
 class TagDecoder:
     tag: int
     name: str
@@ -40,6 +40,8 @@ class DecoderRegistry:
         self._by_tag: Dict[int, List[TagDecoder]] = {}
         self._container_tags: set = set()
         self._signature_tags: set = set()
+        # (tag, generation, is_vu, dtype, parent_tag) -> get_decoder result.
+        self._lookup_cache: Dict[tuple, Optional[TagDecoder]] = {}
         self._build()
 
     @classmethod
@@ -507,6 +509,7 @@ class DecoderRegistry:
         context-aware lookup can distinguish card/VU, generation, dtype and
         parent-container collisions.
         """
+        self._lookup_cache.clear()
         self._by_tag.setdefault(decoder.tag, []).append(decoder)
         current = self._registry.get(decoder.tag)
         if current is None or decoder.priority > current.priority:
@@ -532,7 +535,32 @@ class DecoderRegistry:
         allowed. Legacy callers that omit generation retain tag-only selection.
         Scope, dtype and parent constraints are also hard filters when a decoder
         declares them because those dimensions identify different payload layouts.
+
+        The structural walk asks about the same tag in the same context several
+        times per occurrence, so results are memoised until the next
+        registration.
         """
+        key = (tag, generation, is_vu, dtype, parent_tag)
+        try:
+            return self._lookup_cache[key]
+        except KeyError:
+            pass
+        decoder = self._select_decoder(tag, generation, is_vu, dtype, parent_tag)
+        if len(self._lookup_cache) >= 65536:
+            # Corrupt BER data can yield arbitrary multi-byte tags; keep the
+            # shared registry's memory bounded.
+            self._lookup_cache.clear()
+        self._lookup_cache[key] = decoder
+        return decoder
+
+    def _select_decoder(
+        self,
+        tag: int,
+        generation: Optional[str],
+        is_vu: Optional[bool],
+        dtype: Optional[int],
+        parent_tag: Optional[int],
+    ) -> Optional[TagDecoder]:
         candidates = list(self._by_tag.get(tag, ()))
         if not candidates:
             return None
@@ -595,13 +623,15 @@ class DecoderRegistry:
         dtype: Optional[int] = None,
         parent_tag: Optional[int] = None,
     ) -> bool:
-        dec = self.get_decoder(tag, generation=generation, is_vu=is_vu,
-                               dtype=dtype, parent_tag=parent_tag)
-        if dec and dec.container:
-            return True
+        # Every container-capable tag was indexed at registration, so the
+        # context-aware lookup only runs for tags that have such a variant.
         if (tag & 0xFF00) == 0x7600:
             return True
-        return False
+        if tag not in self._container_tags:
+            return False
+        dec = self.get_decoder(tag, generation=generation, is_vu=is_vu,
+                               dtype=dtype, parent_tag=parent_tag)
+        return bool(dec and dec.container)
 
     def is_signature(
         self,
@@ -612,6 +642,8 @@ class DecoderRegistry:
         dtype: Optional[int] = None,
         parent_tag: Optional[int] = None,
     ) -> bool:
+        if tag not in self._signature_tags:
+            return False
         dec = self.get_decoder(tag, generation=generation, is_vu=is_vu,
                                dtype=dtype, parent_tag=parent_tag)
         return bool(dec and dec.signature_block)
@@ -32,8 +32,10 @@ from core.utils.coverage import (
     KNOWN_PADDING_BYTES,
     coverage_metrics,
     coverage_pct,
+    fill_run_end,
     is_padding_block,
     merge_intervals,
+    padding_run_end,
 )
 from core.utils.event_codes import (
     describe_event,
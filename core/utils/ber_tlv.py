@@ -4,9 +4,18 @@ BER-TLV encoding (ISO 7816-4, Annex 1C):
   Tag:   1+ bytes (multi-byte if bits 5-1 of first byte are all 1)
   Length: 1–4 bytes (short form: 0x00–0x7F; long form: 0x81–0x83 + N bytes)
 """
-import struct
 from core.utils.constants import MAX_BER_TAG_OCTETS, MAX_TLV_LENGTH
 
+_NO_HEADER = (None, None, 0)
+
+# Class of a tag's first octet, looked up once per probe: 0 = never a tag
+# (0x00/0xFF fill), 1 = single-octet tag, 2 = first octet of a multi-byte tag
+# (bits 5-1 all set).
+_FIRST_OCTET = bytes(
+    0 if b in (0x00, 0xFF) else 2 if (b & 0x1F) == 0x1F else 1
+    for b in range(256)
+)
+
 
 def read_ber_tlv_header(data, pos=0):
     """Read a BER-TLV tag and length from *data* starting at *pos*.
@@ -16,56 +25,62 @@ def read_ber_tlv_header(data, pos=0):
         (None, None, 0) on failure (invalid/corrupt data)
 
     Does NOT read the payload — callers slice data[pos+header_size : pos+header_size+length].
+
+    Every index is bounds-checked before it is read, so the scan (run at each
+    candidate offset of a card file) needs no exception handling.
     """
     n = len(data)
     if pos >= n:
-        return None, None, 0
-
-    try:
-        start = pos
-        b0 = data[pos]
-        pos += 1
-
-        if b0 in (0x00, 0xFF):
-            return None, None, 0
-
-        tag = b0
-        if (b0 & 0x1F) == 0x1F:   # multi-byte tag
-            tag_octets = 1
-            while pos < n:
-                if tag_octets >= MAX_BER_TAG_OCTETS:
-                    return None, None, 0
-                b = data[pos]
-                pos += 1
-                tag_octets += 1
-                tag = (tag << 8) | b
-                if not (b & 0x80):
-                    break
-            else:
-                return None, None, 0
-
-        if pos >= n:
-            return None, None, 0
-
-        lb = data[pos]
-        pos += 1
+        return _NO_HEADER
 
+    b0 = data[pos]
+    kind = _FIRST_OCTET[b0]
+    if not kind:
+        return _NO_HEADER
+
+    # Fast path: single-octet tag with a short-form length, the common header.
+    if kind == 1 and pos + 1 < n:
+        lb = data[pos + 1]
         if lb < 0x80:
-            length = lb
+            return (b0, lb, 2) if pos + 2 + lb <= n else _NO_HEADER
+
+    i = pos + 1
+    tag = b0
+    if kind == 2:   # multi-byte tag
+        tag_octets = 1
+        while i < n:
+            if tag_octets >= MAX_BER_TAG_OCTETS:
+                return _NO_HEADER
+            b = data[i]
+            i += 1
+            tag_octets += 1
+            tag = (tag << 8) | b
+            if not (b & 0x80):
+                break
         else:
-            nb = lb & 0x7F
-            if nb == 0 or nb > 3 or pos + nb > n:
-                return None, None, 0
-            length = int.from_bytes(data[pos:pos + nb], 'big')
-            pos += nb
+            return _NO_HEADER
+
+    if i >= n:
+        return _NO_HEADER
 
-        if length > MAX_TLV_LENGTH:
-            return None, None, 0
+    lb = data[i]
+    i += 1
 
-        if start + (pos - start) + length > n:
-            return None, None, 0
+    if lb < 0x80:
+        length = lb
+    else:
+        nb = lb & 0x7F
+        if nb == 0 or nb > 3 or i + nb > n:
+            return _NO_HEADER
+        # Up to three length octets, combined in place without a slice.
+        length = data[i]
+        if nb > 1:
+            length = (length << 8) | data[i + 1]
+            if nb > 2:
+                length = (length << 8) | data[i + 2]
+        i += nb
 
-        return tag, length, pos - start
+    if length > MAX_TLV_LENGTH or i + length > n:
+        return _NO_HEADER
 
-    except (IndexError, ValueError, TypeError, struct.error):
-        return None, None, 0
+    return tag, length, i - pos
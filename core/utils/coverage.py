@@ -1,8 +1,11 @@
 """Shared coverage utilities: interval merging and coverage metrics."""
 
+import re
 from typing import Dict, List, Mapping, Optional, Tuple
 
 KNOWN_PADDING_BYTES = {0x00, 0xFF, 0x55}
+_PADDING_RUN = re.compile(rb'\x00+|\xff+|\x55+')
+_FILL_RUN = {b: re.compile(re.escape(bytes([b])) + b'*') for b in KNOWN_PADDING_BYTES}
 
 
 def merge_intervals(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
@@ -65,6 +68,32 @@ def is_padding_block(data: bytes) -> Optional[int]:
     first = data[0]
     if first not in KNOWN_PADDING_BYTES:
         return None
-    if all(b == first for b in data):
+    if data.count(first) == len(data):
         return first
     return None
+
+
+def padding_run_end(data: bytes, pos: int, end: int) -> int:
+    """End offset of the padding run starting at *pos*, or *pos* if none.
+
+    A run is two or more equal padding bytes, or a lone padding byte that is
+    the last byte before *end*. The run is measured by one regex match in C.
+    """
+    match = _PADDING_RUN.match(data, pos, end)
+    if match is None:
+        return pos
+    run_end = match.end()
+    if run_end - pos >= 2 or run_end == end:
+        return run_end
+    return pos
+
+
+def fill_run_end(data: bytes, pos: int, end: int, fill: int = 0xFF) -> int:
+    """End offset of the run of *fill* bytes starting at *pos*, or *pos* if none.
+
+    *fill* must be one of :data:`KNOWN_PADDING_BYTES`; the whole run is
+    skipped by one regex match in C instead of a byte-by-byte loop.
+    """
+    if pos >= end:
+        return pos
+    return _FILL_RUN[fill].match(data, pos, end).end()
@@ -152,19 +152,17 @@ CONTROL_TYPE_BITS: tuple[tuple[int, str], ...] = (
 
 # ── Helpers ─────────────────────────────────────────────────────────────────
 
-def describe_event(code) -> str:
-    """Return a human-readable description for an EventFaultType *code*
-    recorded as an event. Falls back to the normative range groups."""
-    if code is None:
-        return "Unknown event"
-    if code in EVENT_TYPES:
-        return EVENT_TYPES[code]
+def _event_description(code) -> str:
+    """Range-group fallback behind :func:`describe_event`."""
+    label = EVENT_TYPES.get(code)
+    if label is not None:
+        return label
     if 0x10 <= code <= 0x1F:
         return f"VU security breach attempt (0x{code:02X})"
     if 0x20 <= code <= 0x2F:
         return f"Sensor security breach attempt (0x{code:02X})"
     if 0x30 <= code <= 0x4F:
-        return describe_fault(code)
+        return _fault_description(code)
     if 0x50 <= code <= 0x7F:
         return f"Reserved event (0x{code:02X})"
     if code >= 0x80:
@@ -172,13 +170,11 @@ def describe_event(code) -> str:
     return f"Unknown event (0x{code:02X})"
 
 
-def describe_fault(code) -> str:
-    """Return a human-readable description for an EventFaultType *code*
-    recorded as a fault. Falls back to the normative range groups."""
-    if code is None:
-        return "Unknown fault"
-    if code in FAULT_TYPES:
-        return FAULT_TYPES[code]
+def _fault_description(code) -> str:
+    """Range-group fallback behind :func:`describe_fault`."""
+    label = FAULT_TYPES.get(code)
+    if label is not None:
+        return label
     if 0x30 <= code <= 0x3F:
         return f"Recording equipment fault (0x{code:02X})"
     if 0x40 <= code <= 0x4F:
@@ -189,10 +185,35 @@ def describe_fault(code) -> str:
         return f"Manufacturer specific fault (0x{code:02X})"
     if 0x00 <= code <= 0x2F:
         # An event code recorded in a fault slot — describe it as the event.
-        return describe_event(code)
+        return _event_description(code)
     return f"Unknown fault (0x{code:02X})"
 
 
+# EventFaultType is one byte: resolve every value once at import time.
+_EVENT_DESCRIPTIONS: tuple[str, ...] = tuple(_event_description(c) for c in range(0x100))
+_FAULT_DESCRIPTIONS: tuple[str, ...] = tuple(_fault_description(c) for c in range(0x100))
+
+
+def describe_event(code) -> str:
+    """Return a human-readable description for an EventFaultType *code*
+    recorded as an event. Falls back to the normative range groups."""
+    if code is None:
+        return "Unknown event"
+    if isinstance(code, int) and 0 <= code <= 0xFF:
+        return _EVENT_DESCRIPTIONS[code]
+    return _event_description(code)
+
+
+def describe_fault(code) -> str:
+    """Return a human-readable description for an EventFaultType *code*
+    recorded as a fault. Falls back to the normative range groups."""
+    if code is None:
+        return "Unknown fault"
+    if isinstance(code, int) and 0 <= code <= 0xFF:
+        return _FAULT_DESCRIPTIONS[code]
+    return _fault_description(code)
+
+
 def describe_specific_condition(code: int) -> str:
     """Return description for a specific condition type code."""
     return SPECIFIC_CONDITION_TYPES.get(code, f"Condition 0x{code:02X}")
@@ -228,8 +249,9 @@ def describe_record_purpose(code) -> str:
     """Human-readable EventFaultRecordPurpose (Annex 1B §2.72)."""
     if code is None:
         return "Unknown"
-    if code in EVENT_FAULT_RECORD_PURPOSE:
-        return EVENT_FAULT_RECORD_PURPOSE[code]
+    label = EVENT_FAULT_RECORD_PURPOSE.get(code)
+    if label is not None:
+        return label
     if 0x08 <= code <= 0x7F:
         return f"Reserved (0x{code:02X})"
     if code >= 0x80:
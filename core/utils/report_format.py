@@ -7,6 +7,8 @@ as compact text, internal bookkeeping keys are hidden, and column names are
 humanised (``vehicle_plate`` → ``Vehicle Plate``).
 """
 import re
+from functools import lru_cache
+from itertools import groupby
 
 # Tachograph "data not available" sentinels.
 _NOT_AVAILABLE_INTS = {0xFFFFFF, 0xFFFFFFFF}
@@ -271,8 +273,10 @@ def records_to_table(records):
     return headers, rows
 
 
+@lru_cache(maxsize=4096)
 def _time_to_minutes(time_str):
-    parts = str(time_str).split(":")
+    # Memoised: a file only ever holds a few hundred distinct "HH:MM" values.
+    parts = time_str.split(":")
     if len(parts) != 2:
         return None
     try:
@@ -294,54 +298,80 @@ ACTIVITY_COLS = ["Drive", "Work", "Rest", "Available", "Unknown"]
 ACTIVITY_COL_KEYS = ["drive", "work", "rest", "available", "unknown"]
 
 
+# Activity label → index into ACTIVITY_COL_KEYS (anything else is "unknown").
+_ACTIVITY_KIND = {"DRIVE": 0, "WORK": 1, "REST": 2, "AVAIL": 3, "AVAILABLE": 3}
+_UNKNOWN_KIND = 4
+
+
 def _compute_day_hours(day):
     changes = day.get("changes") or []
-    buckets = {"drive": 0, "work": 0, "rest": 0, "available": 0, "unknown": 0}
-    key_map = {"DRIVE": "drive", "WORK": "work", "REST": "rest",
-               "AVAIL": "available", "AVAILABLE": "available"}
+    totals = [0, 0, 0, 0, 0]
     if not isinstance(changes, list) or not changes:
-        return buckets, 0
+        return dict(zip(ACTIVITY_COL_KEYS, totals, strict=True)), 0
     if len(changes) == 1:
         ch = changes[0]
         if isinstance(ch, dict):
             act = str(ch.get("activity", "")).upper()
-            bucket = key_map.get(act, "unknown")
-            buckets[bucket] = 24 * 60
-        return buckets, 24 * 60
-    for i in range(len(changes)):
-        ch = changes[i]
-        if not isinstance(ch, dict):
-            continue
-        act = str(ch.get("activity", "")).upper()
-        bucket = key_map.get(act, "unknown")
-        t1 = _time_to_minutes(str(ch.get("time", "00:00")))
-        if i + 1 < len(changes):
-            t2 = _time_to_minutes(str(changes[i + 1].get("time", "00:00")))
+            totals[_ACTIVITY_KIND.get(act, _UNKNOWN_KIND)] = 24 * 60
+        return dict(zip(ACTIVITY_COL_KEYS, totals, strict=True)), 24 * 60
+    # Parallel start/kind columns: each time is parsed once and a change
+    # ends where the next one starts (the last one at midnight).
+    starts = []
+    kinds = []
+    for ch in changes:
+        if isinstance(ch, dict):
+            starts.append(_time_to_minutes(str(ch.get("time", "00:00"))))
+            kinds.append(_ACTIVITY_KIND.get(str(ch.get("activity", "")).upper(), _UNKNOWN_KIND))
         else:
-            t2 = 24 * 60
-        if t1 is None or t2 is None:
+            starts.append(None)
+            kinds.append(None)
+    starts.append(24 * 60)
+    for i, kind in enumerate(kinds):
+        t1 = starts[i]
+        t2 = starts[i + 1]
+        if kind is None or t1 is None or t2 is None:
             continue
         if t2 < t1:
             t2 += 24 * 60
-        buckets[bucket] += t2 - t1
-    total = sum(buckets.values())
-    return buckets, total
+        totals[kind] += t2 - t1
+    return dict(zip(ACTIVITY_COL_KEYS, totals, strict=True)), sum(totals)
+
+
+def _month_key(date_str):
+    """``mm/yyyy`` label of a ``dd/mm/yyyy`` date (the string itself if shorter)."""
+    return date_str[-7:] if len(date_str) >= 7 else date_str
+
+
+def _day_sort_key(date_str):
+    """Chronological key for a ``dd/mm/yyyy`` date, month label first.
+
+    Days sharing a ``mm/yyyy`` label always sort together, so each month forms
+    one group even when some of its dates do not parse; those follow the valid
+    days of their month, and unparseable labels sort after every month.
+    """
+    label = _month_key(date_str)
+    try:
+        month, year = label.split("/")
+        month_part = (0, int(year), int(month), label)
+    except ValueError:
+        month_part = (1, 0, 0, label)
+    try:
+        day, _, _ = date_str.split("/")
+        return month_part + (0, int(day), "")
+    except ValueError:
+        return month_part + (1, 0, date_str)
 
 
 def build_monthly_activity_report(activities):
-    months = {}
-    for day in activities:
-        if not isinstance(day, dict):
-            continue
-        date_str = str(day.get("date", ""))
-        month_key = date_str[-7:] if len(date_str) >= 7 else date_str
-        months.setdefault(month_key, []).append(day)
+    # One chronological sort, then consecutive days group into their month.
+    days_sorted = sorted((day for day in activities if isinstance(day, dict)),
+                         key=lambda d: _day_sort_key(str(d.get("date", ""))))
 
     headers = ["Date", "Odometer km", "Drive (h)", "Work (h)",
                "Rest (h)", "Available (h)", "Unknown (h)", "Total (h)"]
     rows = []
-    for month_key in sorted(months.keys()):
-        days = sorted(months[month_key], key=lambda d: str(d.get("date", "")))
+    for month_key, month_days in groupby(days_sorted, key=lambda d: _month_key(str(d.get("date", "")))):
+        days = list(month_days)
         month_totals = {"drive": 0, "work": 0, "rest": 0, "available": 0, "unknown": 0}
         month_total = 0
         for day in days:
@@ -4,6 +4,7 @@ import os
 import sys
 import json
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -32,6 +33,22 @@ def group_unparsed_by_pattern(unparsed_list):
     return groups
 
 
+def audit_file(filepath):
+    """Parse one file in a worker process; return only what the report needs."""
+    fsize = os.path.getsize(filepath)
+    try:
+        result = TachoParser(filepath).parse()
+    except Exception as e:
+        return fsize, None, str(e)
+    unparsed = [occ for key, occs in result.get("raw_tags", {}).items()
+                if "Unparsed Data" in key for occ in occs]
+    return fsize, {
+        "coverage": result["metadata"].get("coverage_pct", 0),
+        "generation": result["metadata"].get("generation", "Unknown"),
+        "unparsed": unparsed,
+    }, None
+
+
 def main():
     print("=" * 80)
     print("DDD FILE COVERAGE AUDIT")
@@ -50,33 +67,28 @@ def main():
     report = {}
     global_unparsed_patterns = defaultdict(list)
 
-    for filepath in ddd_files:
+    # Files are independent: parse them across processes, report in order.
+    with ProcessPoolExecutor() as pool:
+        audits = list(pool.map(audit_file, ddd_files))
+
+    for filepath, (fsize, audit, error) in zip(ddd_files, audits, strict=True):
         fname = os.path.basename(filepath)
-        fsize = os.path.getsize(filepath)
         print(f"\n{'─' * 80}")
         print(f"File: {fname}")
         print(f"Size: {fsize:,} bytes")
 
-        try:
-            parser = TachoParser(filepath)
-            result = parser.parse()
-        except Exception as e:
-            print(f"  ERROR parsing: {e}")
+        if error is not None:
+            print(f"  ERROR parsing: {error}")
             continue
 
-        coverage = result["metadata"].get("coverage_pct", 0)
-        gen = result["metadata"].get("generation", "Unknown")
+        coverage = audit["coverage"]
+        gen = audit["generation"]
         print(f"  Generation: {gen}")
         print(f"  Coverage:   {coverage}%")
 
-        unparsed = []
-        for key, occs in result.get("raw_tags", {}).items():
-            if "Unparsed Data" in key:
-                for occ in occs:
-                    unparsed.append(occ)
-                    global_unparsed_patterns[fname].append(occ)
-
+        unparsed = audit["unparsed"]
         if unparsed:
+            global_unparsed_patterns[fname].extend(unparsed)
             print(f"  Unparsed Blocks: {len(unparsed)}")
             total_unparsed = sum(o["length"] for o in unparsed)
             print(f"  Unparsed Bytes:  {total_unparsed:,} ({100*total_unparsed/fsize:.1f}% of file)")
@@ -72,7 +72,7 @@ def main() -> None:
                    if path.is_file() and path.suffix.lower() == ".ddd")
     plan = []
     for source in files:
-        result = TachoParser(str(source)).parse()
+        result = TachoParser(str(source), record_raw=False).parse()
         plan.append((source, source.with_name(_target_name(source, result)), _integrity_status(result)))
 
     targets = [target for _source, target, _status in plan]
@@ -53,6 +53,15 @@ class TestActivityTimelineChart:
         assert len(blocks["Slot 1"]) == 2
         assert len(blocks["Slot 2"]) == 3
 
+    def test_rows_by_activity_groups_blocks_in_time_order(self):
+        slot_blocks = [(0, 100, "REST"), (100, 200, "DRIVE"),
+                       (200, 300, "REST"), (300, 86400, "DRIVE")]
+        rows = ActivityTimelineChart._rows_by_activity(slot_blocks)
+        assert rows == {
+            "REST": ([(0, 100), (200, 300)], [0, 200]),
+            "DRIVE": ([(100, 200), (300, 86400)], [100, 300]),
+        }
+
     def test_unknown_activity_is_skipped(self):
         changes = [{"activity": "XYZ", "time": "03:00", "slot": "First"}]
         blocks = ActivityTimelineChart._build_blocks(changes, is_vu=False)
@@ -1,7 +1,8 @@
 import struct
 
 from app.engine import TachoParser
-from core.decoders.common import decode_activity_val, parse_cyclic_buffer_activities
+from core.decoders import common
+from core.decoders.common import decode_activity_val, decode_activity_words, parse_cyclic_buffer_activities
 from core.decoders.vu_g1 import _parse_trep_02_g1_structured
 from core.parser.vu_dispatcher import _decode_record
 
@@ -35,6 +36,24 @@ def test_activity_dedup_only_removes_structurally_identical_records():
     assert parser.results["activities"] == [original, distinct_change, distinct_counter]
 
 
+def test_activity_sort_puts_impossible_dates_last():
+    # Corrupt BCD-style dates: in range field by field, but not real days.
+    activities = [
+        {"date": "31/02/2024", "changes": []},
+        {"date": "01/03/2024", "changes": []},
+        {"date": "31/04/2024", "changes": []},
+        {"date": "29/02/2024", "changes": []},
+    ]
+    parser = TachoParser.__new__(TachoParser)
+    parser.results = {"activities": list(activities)}
+
+    parser._dedup_and_sort_activities()
+
+    assert [a["date"] for a in parser.results["activities"]] == [
+        "01/03/2024", "29/02/2024", "31/02/2024", "31/04/2024",
+    ]
+
+
 def test_decode_activity_val_rejects_invalid_minutes_and_retains_midnight():
     assert decode_activity_val(0)["time"] == "00:00"
     assert decode_activity_val(1439)["time"] == "23:59"
@@ -42,6 +61,12 @@ def test_decode_activity_val_rejects_invalid_minutes_and_retains_midnight():
     assert decode_activity_val(0x07FF) is None
 
 
+def test_decode_activity_words_matches_per_value_decode():
+    words = (0, 0x1B3C, 1440, 0xFFFF, 0x9F9F, 1439)
+    expected = [decode_activity_val(w) for w in words]
+    assert decode_activity_words(words) == [a for a in expected if a is not None]
+
+
 def test_invalid_activity_values_are_not_added_to_daily_activities():
     header = struct.pack(">HHI", 0, 14, 1_700_000_000)
     data = b"\x00\x00\x00\x00" + header + b"\x00\x00\x00\x00" + struct.pack(">H", 1440)
@@ -52,6 +77,31 @@ def test_invalid_activity_values_are_not_added_to_daily_activities():
     assert results["activities"] == []
 
 
+def test_cyclic_walk_stops_when_prev_len_loops_back_to_a_read_record(monkeypatch):
+    # The only record points back to itself (prev_len == buffer size).
+    header = struct.pack(">HHI", 14, 14, 1_700_000_000)
+    data = b"\x00\x00\x00\x00" + header + b"\x00\x00\x00\x00" + struct.pack(">H", 0x1000)
+    results = {"activities": []}
+
+    header_reads = []
+    cyc_hdr = common._CYC_HDR
+
+    class _CountingHeader:
+        def unpack_from(self, buffer, offset=0):
+            header_reads.append(offset)
+            return cyc_hdr.unpack_from(buffer, offset)
+
+    monkeypatch.setattr(common, "_CYC_HDR", _CountingHeader())
+
+    parse_cyclic_buffer_activities(data, results)
+
+    # The header is read once: revisiting it ends the walk instead of
+    # repeating it until the 366-record cap.
+    assert header_reads == [0]
+    assert [day["date"] for day in results["activities"]] == ["14/11/2023"]
+    assert len(results["activities"][0]["changes"]) == 1
+
+
 def test_invalid_activity_values_are_not_added_to_structured_vu_activities():
     data = (
         struct.pack(">I", 1_700_000_000)
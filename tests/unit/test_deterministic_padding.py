@@ -30,6 +30,13 @@ class TestPaddingSkip(unittest.TestCase):
         self.assertIn("0002_EF_ICC", results["raw_tags"])
         self.assertEqual(results["coverage"]["covered_pct"], 100.0)
 
+    def test_record_raw_false_keeps_padding_but_drops_tag_occurrences(self):
+        data = b"\xFF" * 4 + stap(0x0002, 0x00, b"\xAA" * 8)
+        results = DeterministicParser(record_raw=False).parse(data, is_vu=False)
+        self.assertNotIn("0002_EF_ICC", results["raw_tags"])
+        self.assertIn("Padding", results["raw_tags"])
+        self.assertEqual(results["coverage"]["covered_pct"], 100.0)
+
     def test_lone_padding_byte_before_record_does_not_eat_header(self):
         # A lone 0x00 gap byte right before a record: the record must survive.
         data = b"\x00" + stap(0x0520, 0x00, b"\xAA" * 8)
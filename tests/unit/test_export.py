@@ -285,6 +285,31 @@ class TestExportManager(unittest.TestCase):
         ExportManager.export_to_pdf(data, self.pdf_path)
         self.assertTrue(os.path.exists(self.pdf_path))
 
+    def test_monthly_activity_report_orders_months_chronologically(self):
+        activities = [
+            {"date": "02/01/2025", "changes": []},
+            {"date": "31/12/2024", "changes": []},
+            {"date": "01/01/2025", "changes": []},
+        ]
+        _, rows = build_monthly_activity_report(activities)
+        self.assertEqual([row[0] for row in rows], [
+            "31/12/2024", "12/2024 TOTAL", "01/01/2025", "02/01/2025", "01/2025 TOTAL",
+        ])
+
+    def test_monthly_activity_report_keeps_unparseable_days_in_their_month(self):
+        activities = [
+            {"date": "xx/01/2025", "changes": []},
+            {"date": "03/02/2025", "changes": []},
+            {"date": "21/01/2025", "changes": []},
+            {"date": "garbage", "changes": []},
+        ]
+        _, rows = build_monthly_activity_report(activities)
+        self.assertEqual([row[0] for row in rows], [
+            "21/01/2025", "xx/01/2025", "01/2025 TOTAL",
+            "03/02/2025", "02/2025 TOTAL",
+            "garbage", "garbage TOTAL",
+        ])
+
 
 if __name__ == "__main__":
     unittest.main()
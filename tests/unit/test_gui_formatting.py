@@ -3,7 +3,7 @@ import pytest
 
 pytest.importorskip("tkinter")
 
-from app.gui import _columns_for, fmt_val
+from app.gui import _columns_for, _nearest_insertion, fmt_val
 
 
 def test_gui_scalar_formatting_matches_existing_display_output():
@@ -26,3 +26,14 @@ def test_gui_column_order_and_filtering_are_unchanged():
 
     assert _columns_for(records, None) == ["purpose", "description", "value", "record_type"]
     assert _columns_for(["scalar"], None) == ["Value"]
+
+
+def test_nearest_insertion_tie_goes_to_the_change_listed_first():
+    # Slot-interleaved VU changes: the later minute is listed first.
+    insertions = sorted([(602, 0, "Slot 2"), (598, 1, "Slot 1")])
+    minutes = [ins[0] for ins in insertions]
+
+    assert _nearest_insertion(insertions, minutes, 600)[2] == "Slot 2"
+    assert _nearest_insertion(insertions, minutes, 599)[2] == "Slot 1"
+    assert _nearest_insertion(insertions, minutes, 700)[2] == "Slot 2"
+    assert _nearest_insertion([], [], 600) is None
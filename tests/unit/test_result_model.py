@@ -34,6 +34,17 @@ def test_tacho_result_to_dict_exposes_every_declared_public_section():
     assert set(TachoResult.__dataclass_fields__) == EXPECTED_RESULT_KEYS
 
 
+def test_tacho_result_to_dict_shares_sections_without_mutating_the_instance():
+    tacho = TachoResult()
+    tacho.driver["card_number"] = "DF000001"
+
+    result = tacho.to_dict(tags={0x0501: "G1_Identification"})
+
+    assert result["activities"] is tacho.activities
+    assert result["raw_tags"] is tacho.raw_tags
+    assert result["generations"] and tacho.generations == {}
+
+
 @pytest.mark.parametrize(("tag", "record_type", "canonical", "aliases", "record"), [
     (0x0510, 0x20, "sensor_pairings", ("sensor_paired", "sensor_paired_g22"),
      b"\x01" * 8 + b"APPROVAL        " + struct.pack(">I", 1700000000)),